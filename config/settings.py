@@ -2,7 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -24,10 +24,57 @@ class Settings(BaseSettings):
     api_prefix: str = "/api/v1"
     mongodb_uri: str = "mongodb://mongo:27017"
     mongodb_database: str = "finance_manager"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: Optional[int] = None
+    mongodb_server_selection_timeout_ms: int = 30_000
+    mongodb_wait_queue_timeout_ms: Optional[int] = None
+    mongodb_compressors: str = ""
+    mongodb_command_monitoring: bool = True
+    mongodb_command_reply_bytes: bool = False
+    mongodb_explain_slow_queries: bool = False
     log_level: str = "INFO"
+    log_levels: str = ""
+    log_json: bool = False
+    log_enqueue: bool = True
+    log_dir: str = "logs"
     export_dir: str = "reports"
+    export_chunk_size: int = 500
+    export_max_concurrency: int = 4
+    export_io_workers: int = 4
+    # Incremental exports re-read this many seconds before the watermark to catch late commits.
+    export_watermark_overlap_seconds: float = 5.0
+    report_cache_max_bytes: int = 512 * 1024 * 1024
+    batch_export_workers: int = 4
+    statement_cache_size: int = 256
+    report_jobs_enabled: bool = True
+    report_job_workers: int = 2
+    report_jobs_per_user: int = 1
+    report_jobs_max_pending_per_user: int = 5
+    report_job_poll_interval: float = 1.0
+    report_job_lease_seconds: float = 60.0
+    report_job_max_attempts: int = 3
     benchmark_threshold_ms: int = 500
+    request_metrics_enabled: bool = True
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_encodings: str = "br,zstd,gzip"
+    request_decompression_max_size: int = 32 * 1024 * 1024
+    etag_version_max_age_seconds: float = 2.0
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_ttl_seconds: float = 30.0
+    single_flight_enabled: bool = True
+    admission_control_enabled: bool = True
+    admission_read_limit: int = 64
+    admission_write_limit: int = 32
+    admission_export_limit: int = 4
+    admission_max_queue: int = 100
+    admission_max_wait_seconds: float = 2.0
+    batch_max_ids: int = 100
     enable_demo_data: bool = False
+    process_pool_workers: int = 2
+    forecast_process_pool_threshold: int = 50_000
+    forecast_cache_size: int = 1024
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,91 @@
+"""Export transactions of every user (or a filtered set) into one CSV per user."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Iterable
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from config.settings import get_settings  # noqa: E402
+from src.repositories import UserRepository  # noqa: E402
+from src.services.batch_exports import BatchExportService, export_user_batch  # noqa: E402
+from src.utils import FileManager, shutdown_executors  # noqa: E402
+
+
+def _print_progress(users_done: int, users_total: int, rows: int, rows_per_second: float) -> None:
+    print(f"{users_done}/{users_total} users, {rows} rows, {rows_per_second:,.0f} rows/s", flush=True)
+
+
+async def run_batch_export(
+    *,
+    user_ids: list[str] | None,
+    workers: int | None,
+    bundle: bool,
+    output_dir: str | None,
+    mongodb_uri: str | None,
+    mongodb_database: str | None,
+) -> None:
+    settings = get_settings()
+    uri = mongodb_uri or settings.mongodb_uri
+    database_name = mongodb_database or settings.mongodb_database
+
+    client = AsyncIOMotorClient(uri)
+    try:
+        service = BatchExportService(
+            user_repository=UserRepository(client[database_name]),
+            file_manager=FileManager(base_dir=Path(output_dir) if output_dir else None),
+            batch_runner=partial(export_user_batch, mongodb_uri=uri, mongodb_database=database_name),
+        )
+        report = await service.export_users(user_ids, workers=workers, bundle=bundle, on_progress=_print_progress)
+    finally:
+        client.close()
+        shutdown_executors()
+
+    print(
+        f"Exported {report.total_transactions} transactions for {report.total_users} users "
+        f"in {report.elapsed_seconds:.1f}s ({report.rows_per_second:,.0f} rows/s) into '{report.directory}'."
+    )
+    if report.archive_path:
+        print(f"Bundled files into '{report.archive_path}'.")
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export transactions of many users in parallel.")
+    parser.add_argument("--user-id", dest="user_ids", action="append", help="Export only this user (repeatable).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for this export (defaults to BATCH_EXPORT_WORKERS).",
+    )
+    parser.add_argument("--bundle", action="store_true", help="Zip the generated files into one archive.")
+    parser.add_argument("--output-dir", type=str, help="Override the export directory.")
+    parser.add_argument("--mongodb-uri", type=str, help="Override MongoDB URI.")
+    parser.add_argument("--mongodb-database", type=str, help="Override database name.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    asyncio.run(
+        run_batch_export(
+            user_ids=args.user_ids,
+            workers=args.workers,
+            bundle=args.bundle,
+            output_dir=args.output_dir,
+            mongodb_uri=args.mongodb_uri,
+            mongodb_database=args.mongodb_database,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
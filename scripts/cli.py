@@ -5,16 +5,21 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+from typing import TYPE_CHECKING
 
-import httpx
 import typer
 
+if TYPE_CHECKING:  # httpx is imported by the commands that talk to the API
+    import httpx
+
 DEFAULT_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000/api/v1")
 
 app = typer.Typer(add_completion=False, help="CLI para interagir com a Finance Manager API.")
 
 
 async def _request(method: str, path: str, **kwargs) -> httpx.Response:
+    import httpx
+
     base_url = os.getenv("API_BASE_URL", DEFAULT_BASE_URL)
     async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
         response = await client.request(method, path, **kwargs)
@@ -26,6 +31,8 @@ def _run(coro):
 
 
 def _print_response(response: httpx.Response) -> None:
+    import httpx
+
     try:
         response.raise_for_status()
     except httpx.HTTPStatusError as exc:
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import os
-from typing import Any, Callable, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
 
-import httpx
 import typer
 
+if TYPE_CHECKING:  # httpx is imported by the actions that talk to the API
+    import httpx
+
 DEFAULT_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000/api/v1")
 MenuAction = Callable[[], None]
 
@@ -18,11 +20,15 @@ def _get_base_url() -> str:
 
 
 async def _request(method: str, path: str, **kwargs) -> httpx.Response:
+    import httpx
+
     async with httpx.AsyncClient(base_url=_get_base_url(), timeout=15) as client:
         return await client.request(method, path, **kwargs)
 
 
 def _call_api(method: str, path: str, **kwargs) -> Optional[Any]:
+    import httpx
+
     try:
         response = asyncio.run(_request(method, path, **kwargs))
         response.raise_for_status()
@@ -3,6 +3,7 @@
 from fastapi import APIRouter
 
 from . import accounts, budgets, goals, reports, transactions, users
+from .metrics import router as metrics_router
 
 router = APIRouter()
 router.include_router(users.router)
@@ -12,4 +13,4 @@ router.include_router(budgets.router)
 router.include_router(goals.router)
 router.include_router(reports.router)
 
-__all__ = ["router"]
+__all__ = ["metrics_router", "router"]
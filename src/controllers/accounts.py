@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
-from src.models import AccountCreate, AccountModel, AccountUpdate
+from src.models import AccountCreate, AccountModel, AccountUpdate, EntityBatch
 from src.services import AccountService
 
+from .batch import batch_ids
+from .conditional import cache_headers, collection_etag, entity_etag, etag_matches, not_modified
 from .dependencies import get_account_service
+from .responses import PrevalidatedJSONResponse
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
@@ -24,22 +27,42 @@ async def create_account(
 
 @router.get("", response_model=list[AccountModel])
 async def list_accounts(
+    request: Request,
     user_id: str = Query(..., description="Filter accounts by owner"),
     service: AccountService = Depends(get_account_service),
-) -> list[AccountModel]:
+) -> Response:
     """List accounts for a given user."""
 
-    return await service.list_accounts(user_id)
+    etag = await collection_etag(request, service.data_version, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    accounts = await service.list_accounts(user_id)
+    return PrevalidatedJSONResponse(accounts, list[AccountModel], headers=cache_headers(etag))
+
+
+@router.get("/batch", response_model=EntityBatch[AccountModel])
+async def get_accounts(
+    ids: list[str] = Depends(batch_ids),
+    service: AccountService = Depends(get_account_service),
+) -> PrevalidatedJSONResponse:
+    """Return several accounts by id in one request; unknown ids are listed in ``missing_ids``."""
+
+    return PrevalidatedJSONResponse(await service.get_accounts(ids), EntityBatch[AccountModel])
 
 
 @router.get("/{account_id}", response_model=AccountModel)
 async def get_account(
     account_id: str,
+    request: Request,
     service: AccountService = Depends(get_account_service),
-) -> AccountModel:
+) -> Response:
     """Return account details."""
 
-    return await service.get_account(account_id)
+    account = await service.get_account(account_id)
+    etag = entity_etag(account)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return PrevalidatedJSONResponse(account, AccountModel, headers=cache_headers(etag))
 
 
 @router.put("/{account_id}", response_model=AccountModel)
@@ -0,0 +1,24 @@
+"""Shared ``?ids=`` parameter of the multi-get routes (``GET /accounts/batch?ids=a,b``)."""
+
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import Query
+
+from config.settings import get_settings
+from src.services.exceptions import ValidationError
+
+
+def batch_ids(
+    ids: List[str] = Query(..., description="Ids to fetch, comma separated or repeated (`ids=a,b` or `ids=a&ids=b`)"),
+) -> list[str]:
+    """Parse the requested ids, keeping their order, and enforce ``BATCH_MAX_IDS``."""
+
+    parsed = list(dict.fromkeys(item.strip() for value in ids for item in value.split(",") if item.strip()))
+    if not parsed:
+        raise ValidationError("At least one id is required")
+    limit = get_settings().batch_max_ids
+    if len(parsed) > limit:
+        raise ValidationError(f"At most {limit} ids can be fetched at once")
+    return parsed
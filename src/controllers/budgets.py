@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
-from src.models import BudgetCreate, BudgetModel, BudgetSummary, BudgetUpdate
-from src.services import BudgetService
+from src.models import BudgetCreate, BudgetModel, BudgetProjection, BudgetSummary, BudgetUpdate, EntityBatch
+from src.services import BudgetProjectionService, BudgetService
 
-from .dependencies import get_budget_service
+from .batch import batch_ids
+from .conditional import cache_headers, collection_etag, entity_etag, etag_matches, not_modified
+from .dependencies import get_budget_projection_service, get_budget_service
+from .responses import PrevalidatedJSONResponse
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
@@ -24,19 +27,62 @@ async def create_budget(
 
 @router.get("", response_model=list[BudgetModel])
 async def list_budgets(
+    request: Request,
     user_id: str = Query(...),
     service: BudgetService = Depends(get_budget_service),
-) -> list[BudgetModel]:
+) -> Response:
     """List budgets for user."""
 
-    return await service.list_budgets(user_id)
+    etag = await collection_etag(request, service.data_version, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    budgets = await service.list_budgets(user_id)
+    return PrevalidatedJSONResponse(budgets, list[BudgetModel], headers=cache_headers(etag))
+
+
+@router.get("/projection", response_model=list[BudgetProjection])
+async def project_budgets(
+    user_id: str = Query(...),
+    service: BudgetProjectionService = Depends(get_budget_projection_service),
+) -> PrevalidatedJSONResponse:
+    """Project end-of-period spend for all active budgets of a user."""
+
+    return PrevalidatedJSONResponse(await service.project_active_budgets(user_id), list[BudgetProjection])
+
+
+@router.get("/batch", response_model=EntityBatch[BudgetModel])
+async def get_budgets(
+    ids: list[str] = Depends(batch_ids),
+    service: BudgetService = Depends(get_budget_service),
+) -> PrevalidatedJSONResponse:
+    """Return several budgets by id in one request; unknown ids are listed in ``missing_ids``."""
+
+    return PrevalidatedJSONResponse(await service.get_budgets(ids), EntityBatch[BudgetModel])
 
 
 @router.get("/{budget_id}", response_model=BudgetModel)
-async def get_budget(budget_id: str, service: BudgetService = Depends(get_budget_service)) -> BudgetModel:
+async def get_budget(
+    budget_id: str,
+    request: Request,
+    service: BudgetService = Depends(get_budget_service),
+) -> Response:
     """Get budget by id."""
 
-    return await service.get_budget(budget_id)
+    budget = await service.get_budget(budget_id)
+    etag = entity_etag(budget)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return PrevalidatedJSONResponse(budget, BudgetModel, headers=cache_headers(etag))
+
+
+@router.get("/{budget_id}/projection", response_model=BudgetProjection)
+async def project_budget(
+    budget_id: str,
+    service: BudgetProjectionService = Depends(get_budget_projection_service),
+) -> BudgetProjection:
+    """Project end-of-period spend for a budget."""
+
+    return await service.project_budget(budget_id)
 
 
 @router.put("/{budget_id}", response_model=BudgetModel)
@@ -64,8 +110,13 @@ async def delete_budget(
 @router.get("/summary/{user_id}", response_model=list[BudgetSummary])
 async def summarize_budgets(
     user_id: str,
+    request: Request,
     service: BudgetService = Depends(get_budget_service),
-) -> list[BudgetSummary]:
+) -> Response:
     """Return aggregated summary for budgets."""
 
-    return await service.summarize(user_id)
+    etag = await collection_etag(request, service.data_version, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    summary = await service.summarize(user_id)
+    return PrevalidatedJSONResponse(summary, list[BudgetSummary], headers=cache_headers(etag))
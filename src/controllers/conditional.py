@@ -0,0 +1,69 @@
+"""Conditional GET support: ETags for entities and for per-user collections.
+
+Entity tags come from the document's ``version`` and ``updated_at``. Collection tags come from the
+user's data version, which every write path bumps, so a matching ``If-None-Match``
+is answered with ``304`` before the collection is queried. The version may be up to
+``ETAG_VERSION_MAX_AGE_SECONDS`` old when it was bumped by another API instance.
+Services built without a version store produce no collection tag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response, status
+
+from config.settings import get_settings
+from src.models import MongoBaseModel
+
+# Clients may store the response but must revalidate it before reuse.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(value: str) -> str:
+    # Weak tags: the same representation may be sent compressed or not.
+    return f'W/"{hashlib.blake2b(value.encode(), digest_size=12).hexdigest()}"'
+
+
+def entity_etag(entity: MongoBaseModel) -> str:
+    """Return the tag of a single document, which changes whenever it is written."""
+
+    stamp = entity.updated_at or entity.created_at
+    return _etag(f"{type(entity).__name__}:{entity.id}:{entity.version}:{stamp.isoformat() if stamp else ''}")
+
+
+async def collection_etag(
+    request: Request,
+    data_version: Callable[..., Awaitable[Optional[int]]],
+    user_id: str,
+) -> Optional[str]:
+    """Return the tag of a per-user listing: route, query string and data version.
+
+    ``data_version`` is the ``data_version`` method of the service serving the route.
+    """
+
+    version = await data_version(user_id, max_age=get_settings().etag_version_max_age_seconds)
+    if version is None:
+        return None
+    return _etag(f"{request.url.path}?{request.url.query}:{user_id}:{version}")
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Weak comparison of ``etag`` against the request's ``If-None-Match``."""
+
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def cache_headers(etag: Optional[str]) -> Optional[dict[str, str]]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
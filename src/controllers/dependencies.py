@@ -1,113 +1,321 @@
-"""FastAPI dependency providers for services and repositories."""
+"""FastAPI dependency providers for services and repositories.
+
+Repositories and services are stateless apart from their collaborators, so they are
+built once per application in a :class:`ServiceContainer` (see ``lifespan`` in
+``src.main``) and the ``get_*`` providers only look them up. The providers are
+coroutines so FastAPI calls them inline instead of dispatching each one to its
+threadpool. Tests keep overriding them through ``app.dependency_overrides``.
+"""
 
 from __future__ import annotations
 
-from fastapi import Depends
+from typing import Any, Optional
+
+from fastapi import Request
+
+from config.settings import get_settings
 
 from src.repositories import (
     AccountRepository,
     BudgetRepository,
+    DataVersionRepository,
+    ExportWatermarkRepository,
     GoalRepository,
+    ReportJobRepository,
     TransactionRepository,
     UserRepository,
 )
 from src.services import (
     AccountService,
+    BatchExportService,
+    BudgetProjectionService,
     BudgetService,
+    GoalForecastService,
     GoalService,
+    Invalidator,
+    ReportJobService,
     ReportService,
+    StatementService,
     TransactionService,
     UserService,
 )
-from src.utils import FileManager, get_database
+from src.utils import FileManager, ResultCache, SingleFlight, get_database
+
+
+def build_user_service(repo: UserRepository) -> UserService:
+    """Build user service."""
+
+    return UserService(repository=repo)
+
+
+def build_account_service(
+    repo: AccountRepository,
+    user_repo: UserRepository,
+    invalidator: Optional[Invalidator] = None,
+) -> AccountService:
+    """Build account service."""
+
+    return AccountService(repository=repo, user_repository=user_repo, invalidator=invalidator)
+
+
+def build_budget_service(
+    repo: BudgetRepository,
+    invalidator: Optional[Invalidator] = None,
+) -> BudgetService:
+    """Build budget service."""
+
+    return BudgetService(repository=repo, invalidator=invalidator)
+
+
+def build_budget_projection_service(
+    repo: BudgetRepository,
+    transaction_repo: TransactionRepository,
+) -> BudgetProjectionService:
+    """Build budget projection service."""
+
+    return BudgetProjectionService(repository=repo, transaction_repository=transaction_repo)
+
+
+def build_goal_service(
+    repo: GoalRepository,
+    account_repo: AccountRepository,
+    invalidator: Optional[Invalidator] = None,
+) -> GoalService:
+    """Build goal service."""
+
+    return GoalService(repository=repo, account_repository=account_repo, invalidator=invalidator)
+
+
+def build_goal_forecast_service(
+    repo: GoalRepository,
+    transaction_repo: TransactionRepository,
+    version_repo: Optional[DataVersionRepository] = None,
+) -> GoalForecastService:
+    """Build goal forecast service."""
+
+    return GoalForecastService(
+        repository=repo,
+        transaction_repository=transaction_repo,
+        version_repository=version_repo,
+    )
+
+
+def build_transaction_service(
+    repo: TransactionRepository,
+    account_repo: AccountRepository,
+    user_repo: UserRepository,
+    budget_service: BudgetService,
+    goal_service: GoalService,
+    invalidator: Optional[Invalidator] = None,
+) -> TransactionService:
+    """Build transaction service."""
+
+    return TransactionService(
+        repository=repo,
+        account_repository=account_repo,
+        user_repository=user_repo,
+        budget_service=budget_service,
+        goal_service=goal_service,
+        invalidator=invalidator,
+    )
+
+
+def build_report_service(
+    repo: TransactionRepository,
+    watermark_repo: ExportWatermarkRepository,
+    version_repo: DataVersionRepository,
+) -> ReportService:
+    """Build report service."""
+
+    return ReportService(
+        repository=repo,
+        file_manager=FileManager(),
+        watermark_repository=watermark_repo,
+        version_repository=version_repo,
+    )
+
+
+def build_statement_service(repo: TransactionRepository, version_repo: DataVersionRepository) -> StatementService:
+    """Build monthly statement service."""
+
+    return StatementService(transaction_repository=repo, version_repository=version_repo, file_manager=FileManager())
+
+
+def build_report_job_service(repo: ReportJobRepository) -> ReportJobService:
+    """Build report job service."""
 
+    return ReportJobService(repository=repo)
 
-def get_user_repository():
-    """Provide a user repository bound to the DB dependency."""
 
-    database = get_database()
-    return UserRepository(database)
+def build_batch_export_service(user_repo: UserRepository) -> BatchExportService:
+    """Build multi-user batch export service."""
 
+    return BatchExportService(user_repository=user_repo)
 
-def get_account_repository():
-    """Provide account repository instance."""
 
-    database = get_database()
-    return AccountRepository(database)
+class ServiceContainer:
+    """Application-scoped repositories and services sharing one database handle."""
 
+    def __init__(self, database: Any) -> None:
+        self.user_repository = UserRepository(database)
+        self.account_repository = AccountRepository(database)
+        self.transaction_repository = TransactionRepository(database)
+        self.budget_repository = BudgetRepository(database)
+        self.goal_repository = GoalRepository(database)
+        self.data_version_repository = DataVersionRepository(database)
+        self.export_watermark_repository = ExportWatermarkRepository(database)
+        self.report_job_repository = ReportJobRepository(database)
+        settings = get_settings()
+        self.result_cache = ResultCache("api", settings.result_cache_max_bytes, settings.result_cache_ttl_seconds)
+        self.single_flight = SingleFlight("api") if settings.single_flight_enabled else None
+        # Shared by every service that writes, so any write invalidates the user's cached and in-flight reads.
+        self.invalidator = Invalidator(self.data_version_repository, self.result_cache, self.single_flight)
 
-def get_transaction_repository():
-    """Provide transaction repository instance."""
+        self.user_service = build_user_service(self.user_repository)
+        self.account_service = build_account_service(self.account_repository, self.user_repository, self.invalidator)
+        self.budget_service = build_budget_service(self.budget_repository, self.invalidator)
+        self.budget_projection_service = build_budget_projection_service(
+            self.budget_repository, self.transaction_repository
+        )
+        self.goal_service = build_goal_service(self.goal_repository, self.account_repository, self.invalidator)
+        self.goal_forecast_service = build_goal_forecast_service(
+            self.goal_repository, self.transaction_repository, self.data_version_repository
+        )
+        self.transaction_service = build_transaction_service(
+            self.transaction_repository,
+            self.account_repository,
+            self.user_repository,
+            self.budget_service,
+            self.goal_service,
+            self.invalidator,
+        )
+        self.report_service = build_report_service(
+            self.transaction_repository, self.export_watermark_repository, self.data_version_repository
+        )
+        self.statement_service = build_statement_service(self.transaction_repository, self.data_version_repository)
+        self.report_job_service = build_report_job_service(self.report_job_repository)
+        self.batch_export_service = build_batch_export_service(self.user_repository)
 
-    database = get_database()
-    return TransactionRepository(database)
 
+def get_container(request: Request) -> ServiceContainer:
+    """Return the application's container, building it on first use when ``lifespan`` did not run."""
 
-def get_budget_repository():
-    """Provide budget repository instance."""
+    state = request.app.state
+    container = getattr(state, "container", None)
+    if container is None:
+        container = state.container = ServiceContainer(get_database())
+    return container
 
-    database = get_database()
-    return BudgetRepository(database)
 
+async def get_user_repository(request: Request) -> UserRepository:
+    """Provide the application user repository."""
 
-def get_goal_repository():
-    """Provide goal repository instance."""
+    return get_container(request).user_repository
 
-    database = get_database()
-    return GoalRepository(database)
 
+async def get_account_repository(request: Request) -> AccountRepository:
+    """Provide the application account repository."""
 
-def get_user_service(repo: UserRepository = Depends(get_user_repository)) -> UserService:
+    return get_container(request).account_repository
+
+
+async def get_transaction_repository(request: Request) -> TransactionRepository:
+    """Provide the application transaction repository."""
+
+    return get_container(request).transaction_repository
+
+
+async def get_budget_repository(request: Request) -> BudgetRepository:
+    """Provide the application budget repository."""
+
+    return get_container(request).budget_repository
+
+
+async def get_goal_repository(request: Request) -> GoalRepository:
+    """Provide the application goal repository."""
+
+    return get_container(request).goal_repository
+
+
+async def get_data_version_repository(request: Request) -> DataVersionRepository:
+    """Provide the application per-user data version repository."""
+
+    return get_container(request).data_version_repository
+
+
+async def get_export_watermark_repository(request: Request) -> ExportWatermarkRepository:
+    """Provide the application export watermark repository."""
+
+    return get_container(request).export_watermark_repository
+
+
+async def get_report_job_repository(request: Request) -> ReportJobRepository:
+    """Provide the application report job repository."""
+
+    return get_container(request).report_job_repository
+
+
+async def get_user_service(request: Request) -> UserService:
     """Provide user service."""
 
-    return UserService(repository=repo)
+    return get_container(request).user_service
 
 
-def get_account_service(
-    repo: AccountRepository = Depends(get_account_repository),
-    user_repo: UserRepository = Depends(get_user_repository),
-) -> AccountService:
+async def get_account_service(request: Request) -> AccountService:
     """Provide account service."""
 
-    return AccountService(repository=repo, user_repository=user_repo)
+    return get_container(request).account_service
 
 
-def get_budget_service(repo: BudgetRepository = Depends(get_budget_repository)) -> BudgetService:
+async def get_budget_service(request: Request) -> BudgetService:
     """Provide budget service."""
 
-    return BudgetService(repository=repo)
+    return get_container(request).budget_service
 
 
-def get_goal_service(
-    repo: GoalRepository = Depends(get_goal_repository),
-    account_repo: AccountRepository = Depends(get_account_repository),
-) -> GoalService:
+async def get_budget_projection_service(request: Request) -> BudgetProjectionService:
+    """Provide budget projection service."""
+
+    return get_container(request).budget_projection_service
+
+
+async def get_goal_service(request: Request) -> GoalService:
     """Provide goal service."""
 
-    return GoalService(repository=repo, account_repository=account_repo)
+    return get_container(request).goal_service
 
 
-def get_transaction_service(
-    repo: TransactionRepository = Depends(get_transaction_repository),
-    account_repo: AccountRepository = Depends(get_account_repository),
-    user_repo: UserRepository = Depends(get_user_repository),
-    budget_service: BudgetService = Depends(get_budget_service),
-    goal_service: GoalService = Depends(get_goal_service),
-) -> TransactionService:
+async def get_goal_forecast_service(request: Request) -> GoalForecastService:
+    """Provide goal forecast service."""
+
+    return get_container(request).goal_forecast_service
+
+
+async def get_transaction_service(request: Request) -> TransactionService:
     """Provide transaction service."""
 
-    return TransactionService(
-        repository=repo,
-        account_repository=account_repo,
-        user_repository=user_repo,
-        budget_service=budget_service,
-        goal_service=goal_service,
-    )
+    return get_container(request).transaction_service
 
 
-def get_report_service(
-    repo: TransactionRepository = Depends(get_transaction_repository),
-) -> ReportService:
+async def get_report_service(request: Request) -> ReportService:
     """Provide report service."""
 
-    return ReportService(repository=repo, file_manager=FileManager())
+    return get_container(request).report_service
+
+
+async def get_statement_service(request: Request) -> StatementService:
+    """Provide monthly statement service."""
+
+    return get_container(request).statement_service
+
+
+async def get_report_job_service(request: Request) -> ReportJobService:
+    """Provide report job service."""
+
+    return get_container(request).report_job_service
+
+
+async def get_batch_export_service(request: Request) -> BatchExportService:
+    """Provide multi-user batch export service."""
+
+    return get_container(request).batch_export_service
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from typing import Literal, Optional, Union
 
-from src.models import GoalCreate, GoalModel, GoalUpdate
-from src.services import GoalService
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
-from .dependencies import get_goal_service
+from src.models import EntityBatch, GoalCreate, GoalForecast, GoalModel, GoalUpdate, GoalWithAccount
+from src.services import GoalForecastService, GoalService
+
+from .batch import batch_ids
+from .conditional import cache_headers, collection_etag, entity_etag, etag_matches, not_modified
+from .dependencies import get_goal_forecast_service, get_goal_service
+from .responses import PrevalidatedJSONResponse
 
 router = APIRouter(prefix="/goals", tags=["Goals"])
 
+ExpandOption = Optional[Literal["account"]]
+
 
 @router.post("", response_model=GoalModel, status_code=status.HTTP_201_CREATED)
 async def create_goal(
@@ -22,21 +29,62 @@ async def create_goal(
     return await service.create_goal(payload)
 
 
-@router.get("", response_model=list[GoalModel])
+@router.get("", response_model=Union[list[GoalModel], list[GoalWithAccount]])
 async def list_goals(
+    request: Request,
     user_id: str = Query(...),
+    expand: ExpandOption = Query(None, description="Embed related data, e.g. `account`"),
     service: GoalService = Depends(get_goal_service),
-) -> list[GoalModel]:
+) -> Response:
     """List goals for user."""
 
-    return await service.list_goals(user_id)
+    # Account writes bump the same version, so the expanded listing is covered too.
+    etag = await collection_etag(request, service.data_version, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if expand == "account":
+        goals = await service.list_goals_with_account(user_id)
+        return PrevalidatedJSONResponse(goals, list[GoalWithAccount], headers=cache_headers(etag))
+    return PrevalidatedJSONResponse(await service.list_goals(user_id), list[GoalModel], headers=cache_headers(etag))
+
+
+@router.get("/forecast", response_model=list[GoalForecast])
+async def forecast_goals(
+    user_id: str = Query(...),
+    service: GoalForecastService = Depends(get_goal_forecast_service),
+) -> PrevalidatedJSONResponse:
+    """Project completion dates for the user's goals at the current pace."""
+
+    return PrevalidatedJSONResponse(await service.forecast_goals(user_id), list[GoalForecast])
 
 
-@router.get("/{goal_id}", response_model=GoalModel)
-async def get_goal(goal_id: str, service: GoalService = Depends(get_goal_service)) -> GoalModel:
+@router.get("/batch", response_model=EntityBatch[GoalModel])
+async def get_goals(
+    ids: list[str] = Depends(batch_ids),
+    service: GoalService = Depends(get_goal_service),
+) -> PrevalidatedJSONResponse:
+    """Return several goals by id in one request; unknown ids are listed in ``missing_ids``."""
+
+    return PrevalidatedJSONResponse(await service.get_goals(ids), EntityBatch[GoalModel])
+
+
+@router.get("/{goal_id}", response_model=Union[GoalModel, GoalWithAccount])
+async def get_goal(
+    goal_id: str,
+    request: Request,
+    expand: ExpandOption = Query(None, description="Embed related data, e.g. `account`"),
+    service: GoalService = Depends(get_goal_service),
+) -> Union[GoalModel, GoalWithAccount, Response]:
     """Get goal by id."""
 
-    return await service.get_goal(goal_id)
+    if expand == "account":
+        # The embedded account has its own updated_at, so this variant is not tagged.
+        return await service.get_goal_with_account(goal_id)
+    goal = await service.get_goal(goal_id)
+    etag = entity_etag(goal)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return PrevalidatedJSONResponse(goal, GoalModel, headers=cache_headers(etag))
 
 
 @router.put("/{goal_id}", response_model=GoalModel)
@@ -2,21 +2,128 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Literal, Optional
 
-from src.models import ReportPayload
-from src.services import ReportService
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 
-from .dependencies import get_report_service
+from src.middleware import export_route, skip_compression
+from src.models import (
+    BatchExportPayload,
+    BatchExportRequest,
+    ExportFormat,
+    IncrementalReportPayload,
+    MonthlyStatement,
+    ReportJobCreate,
+    ReportJobModel,
+    ReportPayload,
+)
+from src.services import BatchExportService, ReportJobService, ReportService, StatementService
+
+from .dependencies import (
+    get_batch_export_service,
+    get_report_job_service,
+    get_report_service,
+    get_statement_service,
+)
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
+@router.post("/batch", response_model=BatchExportPayload)
+@export_route
+async def export_batch(
+    payload: BatchExportRequest,
+    service: BatchExportService = Depends(get_batch_export_service),
+) -> BatchExportPayload:
+    """Export one CSV per user (all users by default) across worker processes."""
+
+    return await service.export_users(payload.user_ids, bundle=payload.bundle)
+
+
 @router.get("/transactions/{user_id}", response_model=ReportPayload)
+@export_route
 async def export_transactions(
     user_id: str,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
     service: ReportService = Depends(get_report_service),
 ) -> ReportPayload:
-    """Generate a CSV export for transactions."""
+    """Generate a transactions export as CSV, gzip CSV, NDJSON or Parquet."""
+
+    return await service.export_transactions(user_id, export_format=export_format)
+
+
+@router.get("/transactions/{user_id}/incremental", response_model=IncrementalReportPayload)
+@export_route
+async def export_incremental_transactions(
+    user_id: str,
+    append: bool = Query(True, description="Append to the previous export file when it exists"),
+    service: ReportService = Depends(get_report_service),
+) -> IncrementalReportPayload:
+    """Export only transactions changed since the last export of the user."""
+
+    return await service.export_incremental(user_id, append=append)
+
+
+@router.get(
+    "/transactions/{user_id}/download",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}}}},
+)
+@export_route
+async def download_transactions(
+    user_id: str,
+    service: ReportService = Depends(get_report_service),
+) -> StreamingResponse:
+    """Stream the transactions CSV directly to the client."""
+
+    return StreamingResponse(
+        service.stream_transactions(user_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="transactions_{user_id}.csv"'},
+    )
+
+
+@router.get("/statement/{user_id}", response_model=MonthlyStatement)
+async def monthly_statement(
+    user_id: str,
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Statement month as YYYY-MM"),
+    export_format: Optional[Literal["csv"]] = Query(None, alias="format"),
+    service: StatementService = Depends(get_statement_service),
+) -> MonthlyStatement:
+    """Return the category pivot, account balances and budget usage of a month."""
+
+    return await service.monthly_statement(user_id, month, render_csv=export_format == "csv")
+
+
+@router.post("/jobs", response_model=ReportJobModel, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_report_job(
+    payload: ReportJobCreate,
+    service: ReportJobService = Depends(get_report_job_service),
+) -> ReportJobModel:
+    """Queue a report to be generated in the background."""
+
+    return await service.enqueue(payload)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobModel)
+async def get_report_job(
+    job_id: str,
+    service: ReportJobService = Depends(get_report_job_service),
+) -> ReportJobModel:
+    """Return status and progress of a report job."""
+
+    return await service.get_job(job_id)
+
+
+@router.get("/jobs/{job_id}/download", response_class=FileResponse)
+@skip_compression
+@export_route
+async def download_report_job(
+    job_id: str,
+    service: ReportJobService = Depends(get_report_job_service),
+) -> FileResponse:
+    """Download the file produced by a completed report job."""
 
-    return await service.export_transactions(user_id)
+    path = await service.get_download_path(job_id)
+    return FileResponse(path, filename=path.name)
@@ -0,0 +1,53 @@
+"""JSON response classes that skip FastAPI's generic encoder."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON-compatible content with orjson."""
+
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: same payload as ``JSONResponse``, encoded by orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=128)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+class PrevalidatedJSONResponse(FastJSONResponse):
+    """Serializes models that were already validated, without FastAPI's response pass.
+
+    Returning a response object makes FastAPI skip ``response_model`` validation and
+    ``jsonable_encoder``; pydantic-core then writes the JSON straight from the models.
+    ``annotation`` should match the route's ``response_model`` so that fields outside
+    it (from subclasses) are left out exactly as FastAPI would.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        annotation: Any,
+        status_code: int = 200,
+        headers: Optional[dict[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        self.annotation = annotation
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        return _adapter(self.annotation).dump_json(content, by_alias=True)
@@ -8,6 +8,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, Response, status
 
 from src.models import (
+    EntityBatch,
     TransactionCreate,
     TransactionFilter,
     TransactionModel,
@@ -15,7 +16,9 @@ from src.models import (
 )
 from src.services import TransactionService
 
+from .batch import batch_ids
 from .dependencies import get_transaction_service
+from .responses import PrevalidatedJSONResponse
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
@@ -34,10 +37,10 @@ async def create_transaction(
 async def list_transactions(
     user_id: str = Query(..., description="Filter by user"),
     service: TransactionService = Depends(get_transaction_service),
-) -> list[TransactionModel]:
+) -> PrevalidatedJSONResponse:
     """List transactions for a user."""
 
-    return await service.list_transactions(user_id)
+    return PrevalidatedJSONResponse(await service.list_transactions(user_id), list[TransactionModel])
 
 
 @router.get("/search", response_model=List[TransactionModel])
@@ -52,7 +55,7 @@ async def search_transactions(
     sort_by: str = Query("event_date"),
     sort_order: int = Query(-1),
     service: TransactionService = Depends(get_transaction_service),
-) -> List[TransactionModel]:
+) -> PrevalidatedJSONResponse:
     """Search transactions with filters and ordering."""
 
     filters = TransactionFilter(
@@ -66,7 +69,17 @@ async def search_transactions(
         sort_by=sort_by,
         sort_order=sort_order,
     )
-    return await service.search_transactions(filters)
+    return PrevalidatedJSONResponse(await service.search_transactions(filters), list[TransactionModel])
+
+
+@router.get("/batch", response_model=EntityBatch[TransactionModel])
+async def get_transactions(
+    ids: list[str] = Depends(batch_ids),
+    service: TransactionService = Depends(get_transaction_service),
+) -> PrevalidatedJSONResponse:
+    """Return several transactions by id in one request; unknown ids are listed in ``missing_ids``."""
+
+    return PrevalidatedJSONResponse(await service.get_transactions(ids), EntityBatch[TransactionModel])
 
 
 @router.get("/{transaction_id}", response_model=TransactionModel)
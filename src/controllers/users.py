@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
-from src.models import UserCreate, UserModel, UserUpdate
+from src.models import EntityBatch, UserCreate, UserModel, UserUpdate
 from src.services import UserService
 
+from .batch import batch_ids
+from .conditional import cache_headers, entity_etag, etag_matches, not_modified
 from .dependencies import get_user_service
+from .responses import PrevalidatedJSONResponse
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -23,17 +26,31 @@ async def create_user(
 
 
 @router.get("", response_model=list[UserModel])
-async def list_users(service: UserService = Depends(get_user_service)) -> list[UserModel]:
+async def list_users(service: UserService = Depends(get_user_service)) -> PrevalidatedJSONResponse:
     """Return all users."""
 
-    return await service.list_users()
+    return PrevalidatedJSONResponse(await service.list_users(), list[UserModel])
+
+
+@router.get("/batch", response_model=EntityBatch[UserModel])
+async def get_users(
+    ids: list[str] = Depends(batch_ids),
+    service: UserService = Depends(get_user_service),
+) -> PrevalidatedJSONResponse:
+    """Return several users by id in one request; unknown ids are listed in ``missing_ids``."""
+
+    return PrevalidatedJSONResponse(await service.get_users(ids), EntityBatch[UserModel])
 
 
 @router.get("/{user_id}", response_model=UserModel)
-async def get_user(user_id: str, service: UserService = Depends(get_user_service)) -> UserModel:
+async def get_user(user_id: str, request: Request, service: UserService = Depends(get_user_service)) -> Response:
     """Return a user by id."""
 
-    return await service.get_user(user_id)
+    user = await service.get_user(user_id)
+    etag = entity_etag(user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return PrevalidatedJSONResponse(user, UserModel, headers=cache_headers(etag))
 
 
 @router.put("/{user_id}", response_model=UserModel)
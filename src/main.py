@@ -1,4 +1,9 @@
-"""FastAPI application entry point."""
+"""FastAPI application entry point.
+
+``app`` is built on first access rather than at import, so tools that only need
+``create_app`` (tests, benchmarks, the CLIs) do not wire every router twice.
+``uvicorn src.main:app`` keeps working, as does ``uvicorn --factory src.main:create_app``.
+"""
 
 from __future__ import annotations
 
@@ -8,9 +13,29 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from config.settings import get_settings
-from src.controllers import router as api_router
+from src.controllers import metrics_router, router as api_router
+from src.controllers.dependencies import ServiceContainer
+from src.controllers.responses import FastJSONResponse
+from src.middleware import (
+    EXPORTS,
+    READS,
+    WRITES,
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    RequestDecompressionMiddleware,
+    RequestMetricsMiddleware,
+    parse_encodings,
+)
+from src.services import ReportJobWorker
 from src.services.exceptions import BusinessRuleError, NotFoundError, ServiceError, ValidationError
-from src.utils import get_logger
+from src.utils import (
+    close_client,
+    flush_logs,
+    get_database,
+    get_logger,
+    shutdown_executors,
+    warm_up_client,
+)
 
 
 def create_app() -> FastAPI:
@@ -19,13 +44,71 @@ def create_app() -> FastAPI:
     settings = get_settings()
 
     @asynccontextmanager
-    async def lifespan(_: FastAPI):
+    async def lifespan(app: FastAPI):
         logger = get_logger("startup")
         logger.info("Starting Finance Manager API in {env}", env=settings.environment)
+        try:
+            await warm_up_client()
+        except Exception as exc:  # pragma: no cover - depends on the database being reachable
+            logger.warning("Could not warm up the MongoDB connection pool: {exc}", exc=exc)
+        container = app.state.container = ServiceContainer(get_database())
+        repositories = (
+            container.transaction_repository,
+            container.export_watermark_repository,
+            container.data_version_repository,
+            container.report_job_repository,
+        )
+        for repository in repositories:
+            try:
+                await repository.ensure_indexes()
+            except Exception as exc:  # pragma: no cover - depends on the database being reachable
+                logger.warning("Could not create indexes for {name}: {exc}", name=repository.collection_name, exc=exc)
+        worker = None
+        if settings.report_jobs_enabled:
+            worker = ReportJobWorker(
+                repository=container.report_job_repository,
+                report_service=container.report_service,
+                statement_service=container.statement_service,
+            )
+            await worker.start()
         yield
-
-    app = FastAPI(title=settings.app_name, version="1.0.0", lifespan=lifespan)
+        if worker is not None:
+            await worker.stop()
+        shutdown_executors()
+        close_client()
+        app.state.container = None
+        await flush_logs()
+
+    app = FastAPI(
+        title=settings.app_name,
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+    )
     app.include_router(api_router, prefix=settings.api_prefix)
+    app.include_router(metrics_router)
+    app.add_middleware(RequestDecompressionMiddleware, max_size=settings.request_decompression_max_size)
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            encodings=parse_encodings(settings.compression_encodings),
+        )
+    if settings.admission_control_enabled:
+        # Outside decompression so shed requests never have their bodies read.
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            limits={
+                READS: settings.admission_read_limit,
+                WRITES: settings.admission_write_limit,
+                EXPORTS: settings.admission_export_limit,
+            },
+            max_queue=settings.admission_max_queue,
+            max_wait=settings.admission_max_wait_seconds,
+        )
+    # Added last so it wraps the others and sees the bytes actually sent.
+    if settings.request_metrics_enabled:
+        app.add_middleware(RequestMetricsMiddleware)
     register_exception_handlers(app)
     return app
 
@@ -50,4 +133,10 @@ def register_exception_handlers(app: FastAPI) -> None:
         return JSONResponse(status_code=500, content={"detail": str(exc)})
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    """Build the module-level ``app`` the first time it is requested."""
+
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
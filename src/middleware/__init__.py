@@ -0,0 +1,18 @@
+"""ASGI middleware registered by the application factory."""
+
+from .admission import EXPORTS, READS, WRITES, AdmissionControlMiddleware, export_route
+from .compression import CompressionMiddleware, RequestDecompressionMiddleware, parse_encodings, skip_compression
+from .metrics import RequestMetricsMiddleware
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "CompressionMiddleware",
+    "EXPORTS",
+    "export_route",
+    "parse_encodings",
+    "READS",
+    "RequestDecompressionMiddleware",
+    "RequestMetricsMiddleware",
+    "skip_compression",
+    "WRITES",
+]
@@ -0,0 +1,216 @@
+"""Admission control: per-route-class concurrency limits with a bounded wait queue."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Mapping, Optional, TypeVar
+
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.utils import REGISTRY
+
+READS = "reads"
+WRITES = "writes"
+EXPORTS = "exports"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Weight of the latest request in the moving average of service time.
+SERVICE_TIME_SMOOTHING = 0.2
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+EXPORT_ROUTE_ATTRIBUTE = "__admission_export__"
+
+Endpoint = TypeVar("Endpoint", bound=Callable[..., Any])
+
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "admission_in_flight",
+    "Requests admitted and being handled, by route class.",
+    ("route_class",),
+)
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    "admission_queue_depth",
+    "Requests waiting for a slot, by route class.",
+    ("route_class",),
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    "admission_wait_seconds",
+    "Time admitted requests spent waiting for a slot.",
+    ("route_class",),
+    buckets=WAIT_BUCKETS,
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "admission_rejected_total",
+    "Requests shed with 503: queue full, expected wait past the deadline, or deadline reached in the queue.",
+    ("route_class", "reason"),
+)
+
+
+def export_route(endpoint: Endpoint) -> Endpoint:
+    """Mark a route endpoint as a long running export limited by the ``exports`` class.
+
+    Apply it below the router decorator::
+
+        @router.get("/transactions/{user_id}/download")
+        @export_route
+        async def download_transactions(user_id: str): ...
+    """
+
+    setattr(endpoint, EXPORT_ROUTE_ATTRIBUTE, True)
+    return endpoint
+
+
+def export_routes(routes: Iterable[BaseRoute]) -> list[BaseRoute]:
+    """Return the routes whose endpoint is marked with :func:`export_route`."""
+
+    return [route for route in routes if getattr(getattr(route, "endpoint", None), EXPORT_ROUTE_ATTRIBUTE, False)]
+
+
+def route_class(scope: Scope, export_routes: Iterable[BaseRoute] = ()) -> str:
+    """Classify a request as ``exports`` when it hits an export route, else ``reads`` or ``writes``."""
+
+    if any(route.matches(scope)[0] == Match.FULL for route in export_routes):
+        return EXPORTS
+    return READS if scope["method"] in READ_METHODS else WRITES
+
+
+class _Rejected(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _RouteClassLimiter:
+    """Concurrency limit of one route class; waiters are served first come, first served."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.service_time = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def expected_wait(self, ahead: int) -> float:
+        """Estimate how long a request behind ``ahead`` waiters would wait for a slot."""
+
+        return (ahead + 1) * self.service_time / self.limit
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting up to ``max_wait`` seconds; raise ``_Rejected`` otherwise."""
+
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._update_gauges()
+            return
+        ahead = len(self._waiters)
+        if ahead >= self.max_queue:
+            raise _Rejected("queue_full", self.expected_wait(ahead))
+        if self.expected_wait(ahead) > self.max_wait:
+            # Fail now rather than hold the client until the deadline it cannot meet.
+            raise _Rejected("deadline", self.expected_wait(ahead))
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return  # the slot was handed over as the deadline fired
+            raise _Rejected("timeout", self.expected_wait(len(self._waiters))) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)  # the slot was handed over as the client went away
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_gauges()
+
+    def release(self, service_time: float) -> None:
+        """Hand the slot to the oldest live waiter, or free it."""
+
+        if service_time:
+            self.service_time += SERVICE_TIME_SMOOTHING * (service_time - self.service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.active, route_class=self.name)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters), route_class=self.name)
+
+
+class AdmissionControlMiddleware:
+    """Caps concurrent requests per route class and sheds load with ``503``.
+
+    Each class in ``limits`` (``reads``, ``writes``, ``exports``) admits up to its limit
+    at once; further requests wait in a FIFO queue of at most ``max_queue`` entries for
+    up to ``max_wait`` seconds. A request is rejected immediately when the queue is full
+    or when the wait expected from the recent service time already exceeds ``max_wait``,
+    so clients get a fast ``503`` with ``Retry-After`` instead of a timeout. Classes
+    missing from ``limits`` are not limited.
+
+    Only the routes marked with :func:`export_route` count as ``exports``; they are
+    looked up on the application the first time a request comes in unless given as
+    ``export_routes``. Everything else is a read or a write depending on the method.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Mapping[str, int],
+        max_queue: int = 100,
+        max_wait: float = 2.0,
+        export_routes: Optional[Iterable[BaseRoute]] = None,
+        exclude_paths: Iterable[str] = ("/metrics",),
+    ) -> None:
+        self.app = app
+        self.export_routes = list(export_routes) if export_routes is not None else None
+        self.exclude_paths = frozenset(exclude_paths)
+        self.limiters = {
+            name: _RouteClassLimiter(name, limit, max_queue, max_wait) for name, limit in limits.items() if limit > 0
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self._limiter(scope)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        queued = time.perf_counter()
+        try:
+            await limiter.acquire()
+        except _Rejected as rejected:
+            ADMISSION_REJECTED.inc(route_class=limiter.name, reason=rejected.reason)
+            response = JSONResponse(
+                {"detail": "Server is busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(max(1, math.ceil(rejected.retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+        admitted = time.perf_counter()
+        ADMISSION_WAIT.observe(admitted - queued, route_class=limiter.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - admitted)
+
+    def _limiter(self, scope: Scope) -> Optional[_RouteClassLimiter]:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            return None
+        if self.export_routes is None:
+            application = scope.get("app", self.app)
+            self.export_routes = export_routes(getattr(application, "routes", ()))
+        return self.limiters.get(route_class(scope, self.export_routes))
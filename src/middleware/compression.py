@@ -0,0 +1,413 @@
+"""Negotiated response compression and decompression of encoded request bodies."""
+
+from __future__ import annotations
+
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # brotli is optional; it is only offered when installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:  # zstandard is optional; it is only offered when installed
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# ``output_buffer_limit`` arrived in brotli 1.2, together with ``can_accept_more_data``.
+BROTLI_BOUNDED_OUTPUT = hasattr(getattr(brotli, "Decompressor", None), "can_accept_more_data")
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+# zstd inflates at most ~32k-fold, so slices this small overshoot the body limit by a few MiB at most.
+ZSTD_INPUT_SLICE = 128
+# Content types worth compressing; images, archives and gzip/parquet exports already are.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/xml", "application/javascript")
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+SKIP_COMPRESSION_ATTRIBUTE = "__skip_compression__"
+
+Endpoint = TypeVar("Endpoint", bound=Callable[..., Any])
+
+
+class _BodyTooLarge(Exception):
+    """Raised when a request body inflates past the configured limit."""
+
+
+class _TruncatedBody(Exception):
+    """Raised when a request body ends before its compressed stream does."""
+
+
+class _BoundedDecompressor(ABC):
+    """Tracks the inflated size so one small chunk cannot expand without bound.
+
+    Subclasses must stop inflating shortly after ``remaining + 1`` bytes instead of
+    decompressing a whole chunk first and checking its size afterwards.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.remaining = max_size
+
+    def decompress(self, data: bytes) -> bytes:
+        chunk = self._decompress(data)
+        self.remaining -= len(chunk)
+        if self.remaining < 0:
+            raise _BodyTooLarge()
+        return chunk
+
+    def finish(self) -> None:
+        """Reject a body that ended before the end of its compressed stream."""
+
+        if not self.eof:
+            raise _TruncatedBody()
+
+    @abstractmethod
+    def _decompress(self, data: bytes) -> bytes:
+        """Inflate ``data``, producing little more than ``remaining`` bytes."""
+
+    @property
+    @abstractmethod
+    def eof(self) -> bool:
+        """Whether the end of the compressed stream was reached."""
+
+
+class _GzipDecompressor(_BoundedDecompressor):
+    def __init__(self, max_size: int) -> None:
+        super().__init__(max_size)
+        self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+    def _decompress(self, data: bytes) -> bytes:
+        # zlib can stop early, so a bomb is rejected before it is inflated.
+        chunk = self._decompressor.decompress(data, self.remaining + 1)
+        if self._decompressor.unconsumed_tail:
+            raise _BodyTooLarge()
+        return chunk
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+
+class _GzipCodec:
+    name = "gzip"
+    decompressor = _GzipDecompressor
+
+    @staticmethod
+    def compressor() -> Any:
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+class _BrotliCompressor:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _BrotliDecompressor(_BoundedDecompressor):
+    def __init__(self, max_size: int) -> None:
+        super().__init__(max_size)
+        self._decompressor = brotli.Decompressor()
+
+    def _decompress(self, data: bytes) -> bytes:
+        chunk = self._decompressor.process(data, output_buffer_limit=self.remaining + 1)
+        if not self._decompressor.can_accept_more_data():
+            raise _BodyTooLarge()  # output is still pending past the limit
+        return chunk
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.is_finished()
+
+
+class _BrotliCodec:
+    name = "br"
+    compressor = _BrotliCompressor
+    # brotli releases before 1.2 cannot cap the output, so their request bodies are refused.
+    decompressor = _BrotliDecompressor if BROTLI_BOUNDED_OUTPUT else None
+
+
+class _ZstdDecompressor(_BoundedDecompressor):
+    def __init__(self, max_size: int) -> None:
+        super().__init__(max_size)
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def _decompress(self, data: bytes) -> bytes:
+        chunks = []
+        budget = self.remaining
+        for start in range(0, len(data), ZSTD_INPUT_SLICE):
+            chunk = self._decompressor.decompress(data[start : start + ZSTD_INPUT_SLICE])
+            budget -= len(chunk)
+            if budget < 0:
+                raise _BodyTooLarge()
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+
+class _ZstdCodec:
+    name = "zstd"
+    decompressor = _ZstdDecompressor
+
+    @staticmethod
+    def compressor() -> Any:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+
+def available_codecs() -> dict[str, Any]:
+    """Return the codecs usable in this environment, keyed by content-coding name."""
+
+    codecs: dict[str, Any] = {}
+    if brotli is not None:
+        codecs["br"] = _BrotliCodec
+    if zstandard is not None:
+        codecs["zstd"] = _ZstdCodec
+    codecs["gzip"] = _GzipCodec
+    return codecs
+
+
+def parse_encodings(spec: str) -> list[str]:
+    """Parse ``br,zstd,gzip`` into the installed encodings, keeping the preference order."""
+
+    codecs = available_codecs()
+    names = [name.strip().lower() for name in spec.split(",") if name.strip()]
+    return [name for name in dict.fromkeys(names) if name in codecs]
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Pick the encoding with the highest client q-value; ties go to the server's order."""
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def skip_compression(endpoint: Endpoint) -> Endpoint:
+    """Mark a route endpoint whose responses must be sent as they are.
+
+    Apply it below the router decorator::
+
+        @router.get("/files/{name}")
+        @skip_compression
+        async def download(name: str): ...
+    """
+
+    setattr(endpoint, SKIP_COMPRESSION_ATTRIBUTE, True)
+    return endpoint
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding the client accepts.
+
+    Bodies sent in one message are compressed only from ``minimum_size`` bytes up;
+    streamed bodies are compressed chunk by chunk without a ``Content-Length``.
+    Responses that already carry a ``Content-Encoding``, have a non-compressible
+    content type or come from an endpoint marked with :func:`skip_compression` are
+    passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[str] = ("br", "zstd", "gzip"),
+        exclude_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        codecs = available_codecs()
+        self.codecs = {name: codecs[name] for name in encodings if name in codecs}
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), list(self.codecs))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self.codecs[encoding], self.minimum_size, scope, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, codec: Any, minimum_size: int, scope: Scope, send: Send) -> None:
+        self.codec = codec
+        self.minimum_size = minimum_size
+        self.scope = scope
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor: Any = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send_start(start, message)
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        body = self._compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if not more_body:
+            body += self._compressor.flush()
+        if body or not more_body:
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def _send_start(self, start: Message, first: Message) -> None:
+        headers = MutableHeaders(raw=list(start["headers"]))
+        candidate = (
+            start["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type", ""))
+            and not self._route_opted_out()
+        )
+        if candidate:
+            headers.add_vary_header("Accept-Encoding")
+        streaming = first.get("more_body", False)
+        if not candidate or (not streaming and len(first.get("body", b"")) < self.minimum_size):
+            self._passthrough = True
+            await self._send({**start, "headers": headers.raw})
+            return
+
+        self._compressor = self.codec.compressor()
+        headers["Content-Encoding"] = self.codec.name
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed representation is no longer byte-identical to the tagged one.
+            headers["ETag"] = f"W/{etag}"
+        if not streaming:
+            body = self._compressor.compress(first.get("body", b"")) + self._compressor.flush()
+            headers["Content-Length"] = str(len(body))
+            self._compressor = _Finished(body)
+        await self._send({**start, "headers": headers.raw})
+
+    def _route_opted_out(self) -> bool:
+        endpoint = getattr(self.scope.get("route"), "endpoint", None)
+        return bool(getattr(endpoint, SKIP_COMPRESSION_ATTRIBUTE, False))
+
+
+class _Finished:
+    """Hands out a body that was compressed up front to set its ``Content-Length``."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def compress(self, data: bytes) -> bytes:
+        body, self._body = self._body, b""
+        return body
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class RequestDecompressionMiddleware:
+    """Decodes ``Content-Encoding`` request bodies before they reach the routes.
+
+    The encoded body is read in full and inflated up to ``max_size`` bytes; larger
+    payloads get ``413``, undecodable or truncated ones ``400`` and unknown encodings
+    ``415``.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int = 32 * 1024 * 1024) -> None:
+        self.app = app
+        self.max_size = max_size
+        self.codecs = {name: codec for name, codec in available_codecs().items() if codec.decompressor is not None}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        headers = Headers(scope=scope) if scope["type"] == "http" else None
+        encoding = headers.get("content-encoding", "").strip().lower() if headers is not None else ""
+        if encoding in ("", "identity"):
+            await self.app(scope, receive, send)
+            return
+        codec = self.codecs.get(encoding)
+        if codec is None:
+            response = PlainTextResponse(f"Unsupported Content-Encoding: {encoding}", status_code=415)
+            await response(scope, receive, send)
+            return
+
+        try:
+            body = await self._read_body(codec.decompressor(self.max_size), receive)
+        except _BodyTooLarge:
+            response = PlainTextResponse("Decompressed request body is too large", status_code=413)
+            await response(scope, receive, send)
+            return
+        except Exception:  # noqa: BLE001 - every codec raises its own error type
+            response = PlainTextResponse(f"Request body is not valid {encoding}", status_code=400)
+            await response(scope, receive, send)
+            return
+        if body is None:  # the client went away while sending the body
+            return
+
+        request_headers = MutableHeaders(scope=scope)
+        del request_headers["Content-Encoding"]
+        request_headers["Content-Length"] = str(len(body))
+        delivered = False
+
+        async def replay() -> Message:
+            nonlocal delivered
+            if delivered:
+                return await receive()
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
+
+    @staticmethod
+    async def _read_body(decompressor: _BoundedDecompressor, receive: Receive) -> Optional[bytes]:
+        chunks: list[bytes] = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            more_body = message.get("more_body", False)
+            chunks.append(decompressor.decompress(message.get("body", b"")))
+        decompressor.finish()
+        return b"".join(chunks)
@@ -0,0 +1,77 @@
+"""Per-route request metrics collected by a pure ASGI middleware."""
+
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils import REGISTRY
+
+SIZE_BUCKETS = (256, 1024, 4096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ("method", "route", "status"),
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes",
+    "Size of response bodies.",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+    ("method",),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """Return the matched route path (``/api/v1/users/{user_id}``) to keep label cardinality bounded."""
+
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """Records latency, in-flight requests and response sizes per route template.
+
+    Labels use the route template rather than the raw path, and requests that match no
+    route share a single ``unmatched`` series.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec(method=method)
+            route = route_template(scope)
+            REQUEST_DURATION.observe(elapsed, method=method, route=route, status=str(status))
+            RESPONSE_SIZE.observe(size, method=method, route=route)
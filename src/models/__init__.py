@@ -2,23 +2,47 @@
 
 from .entities import (
     AccountModel,
+    BatchExportPayload,
     BudgetModel,
+    BudgetProjection,
     BudgetSummary,
+    DataVersion,
+    EntityBatch,
+    ExportWatermark,
+    GoalAccountSummary,
+    GoalForecast,
     GoalModel,
+    GoalWithAccount,
+    IncrementalReportPayload,
+    MonthlyStatement,
     MongoBaseModel,
+    ReportJobModel,
     ReportPayload,
+    StatementAccountLine,
+    StatementBudgetLine,
+    StatementCategoryLine,
     TransactionFilter,
     TransactionModel,
     UserModel,
 )
-from .enums import AccountType, BudgetStatus, GoalStatus, TransactionType
+from .enums import (
+    AccountType,
+    BudgetStatus,
+    ExportFormat,
+    GoalStatus,
+    ReportJobKind,
+    ReportJobStatus,
+    TransactionType,
+)
 from .schemas import (
     AccountCreate,
     AccountUpdate,
+    BatchExportRequest,
     BudgetCreate,
     BudgetUpdate,
     GoalCreate,
     GoalUpdate,
+    ReportJobCreate,
     TransactionCreate,
     TransactionUpdate,
     UserCreate,
@@ -27,17 +51,34 @@ from .schemas import (
 
 __all__ = [
     "AccountModel",
+    "BatchExportPayload",
     "BudgetModel",
+    "BudgetProjection",
     "BudgetSummary",
+    "DataVersion",
+    "EntityBatch",
+    "ExportWatermark",
+    "GoalAccountSummary",
+    "GoalForecast",
     "GoalModel",
+    "GoalWithAccount",
+    "IncrementalReportPayload",
+    "MonthlyStatement",
     "MongoBaseModel",
+    "ReportJobModel",
     "ReportPayload",
+    "StatementAccountLine",
+    "StatementBudgetLine",
+    "StatementCategoryLine",
     "TransactionFilter",
     "TransactionModel",
     "UserModel",
     "AccountType",
     "BudgetStatus",
+    "ExportFormat",
     "GoalStatus",
+    "ReportJobKind",
+    "ReportJobStatus",
     "TransactionType",
     "UserCreate",
     "UserUpdate",
@@ -49,4 +90,6 @@ __all__ = [
     "BudgetUpdate",
     "GoalCreate",
     "GoalUpdate",
+    "ReportJobCreate",
+    "BatchExportRequest",
 ]
@@ -3,11 +3,19 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, EmailStr, Field, PositiveFloat, conlist
 
-from .enums import AccountType, BudgetStatus, GoalStatus, TransactionType
+from .enums import (
+    AccountType,
+    BudgetStatus,
+    ExportFormat,
+    GoalStatus,
+    ReportJobKind,
+    ReportJobStatus,
+    TransactionType,
+)
 
 
 class MongoBaseModel(BaseModel):
@@ -16,6 +24,8 @@ class MongoBaseModel(BaseModel):
     id: Optional[str] = Field(default=None, alias="id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
+    # Incremented by every write, so two writes within the clock resolution still differ.
+    version: int = 0
 
     model_config = {
         "populate_by_name": True,
@@ -23,6 +33,16 @@ class MongoBaseModel(BaseModel):
     }
 
 
+EntityT = TypeVar("EntityT", bound=MongoBaseModel)
+
+
+class EntityBatch(BaseModel, Generic[EntityT]):
+    """Entities fetched by id in one request, in the order asked, and the ids not found."""
+
+    items: List[EntityT]
+    missing_ids: List[str] = Field(default_factory=list)
+
+
 class UserModel(MongoBaseModel):
     """Represents an application user owning accounts and goals."""
 
@@ -96,6 +116,22 @@ class GoalModel(MongoBaseModel):
     lock_funds: bool = False
 
 
+class GoalAccountSummary(BaseModel):
+    """Account balances embedded in expanded goal responses."""
+
+    id: str
+    name: str
+    balance: float
+    goal_locked_amount: float = 0
+    available_balance: float
+
+
+class GoalWithAccount(GoalModel):
+    """Goal joined with the balances of its funding account."""
+
+    account: Optional[GoalAccountSummary] = None
+
+
 class TransactionFilter(BaseModel):
     """Filtering options for transaction search endpoints."""
 
@@ -120,6 +156,85 @@ class BudgetSummary(BaseModel):
     remaining: float
 
 
+class BudgetProjection(BaseModel):
+    """End-of-period spend projected from the daily spend series of a budget."""
+
+    budget_id: str
+    category: str
+    limit_amount: float
+    period_start: date
+    period_end: date
+    elapsed_days: int
+    total_days: int
+    spent_to_date: float
+    daily_average: float
+    projected_spend: float
+    projected_remaining: float
+    projected_status: BudgetStatus
+    daily_spend: List[float] = Field(default_factory=list)
+
+
+class GoalForecast(BaseModel):
+    """Projected completion of a goal at the current contribution pace."""
+
+    goal_id: str
+    name: str
+    status: GoalStatus
+    target_amount: float
+    current_amount: float
+    remaining_amount: float
+    target_date: date
+    contributions: int
+    daily_rate: float
+    projected_completion_date: Optional[date] = None
+    on_track: Optional[bool] = None
+
+
+class StatementCategoryLine(BaseModel):
+    """Monthly total of one category and transaction type."""
+
+    category: str
+    type: TransactionType
+    total: float
+    count: int
+
+
+class StatementAccountLine(BaseModel):
+    """Opening and closing balance of an account over a month."""
+
+    account_id: str
+    name: str
+    opening_balance: float
+    inflow: float
+    outflow: float
+    closing_balance: float
+
+
+class StatementBudgetLine(BaseModel):
+    """Usage of a budget overlapping the statement month."""
+
+    budget_id: str
+    category: str
+    limit_amount: float
+    amount_spent: float
+    usage_percent: float
+    status: BudgetStatus
+
+
+class MonthlyStatement(BaseModel):
+    """Per-month statement combining transactions, accounts and budgets."""
+
+    user_id: str
+    month: str
+    generated_at: datetime
+    total_income: float
+    total_expenses: float
+    categories: List[StatementCategoryLine]
+    accounts: List[StatementAccountLine]
+    budgets: List[StatementBudgetLine]
+    file_path: Optional[str] = None
+
+
 class ReportPayload(BaseModel):
     """Payload describing data exported to files."""
 
@@ -128,3 +243,66 @@ class ReportPayload(BaseModel):
     total_transactions: int
     total_expenses: float
     total_income: float
+    format: ExportFormat = ExportFormat.CSV
+    bytes_written: int = 0
+    compression_ratio: float = 1.0
+
+
+class IncrementalReportPayload(ReportPayload):
+    """Report payload for exports containing only rows changed since a watermark."""
+
+    # ``None`` when nothing changed and no previous export file exists.
+    file_path: Optional[str] = None
+    since: Optional[datetime] = None
+    appended: bool = False
+
+
+class BatchExportPayload(BaseModel):
+    """Summary of a multi-user export written to one directory."""
+
+    generated_at: datetime
+    directory: str
+    archive_path: Optional[str] = None
+    total_users: int
+    total_transactions: int
+    elapsed_seconds: float
+    rows_per_second: float
+    # Users that could not be exported, by id, with the reason.
+    failures: Dict[str, str] = Field(default_factory=dict)
+
+
+class ExportWatermark(MongoBaseModel):
+    """Last exported position of a user's transactions."""
+
+    user_id: str
+    changed_at: datetime
+    last_id: str
+    file_path: Optional[str] = None
+    # Rows exported within the overlap window before ``changed_at``, by id, with the change time exported.
+    overlap_ids: Dict[str, datetime] = Field(default_factory=dict)
+
+
+class DataVersion(MongoBaseModel):
+    """Counter bumped whenever the data of a user changes."""
+
+    user_id: str
+    version: int = 0
+
+
+class ReportJobModel(MongoBaseModel):
+    """Report export processed asynchronously by the job workers."""
+
+    user_id: str
+    kind: ReportJobKind
+    month: Optional[str] = None
+    status: ReportJobStatus = ReportJobStatus.QUEUED
+    progress: int = 0
+    total: Optional[int] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    report: Optional[ReportPayload] = None
+    attempts: int = 0
+    lease_expires_at: Optional[datetime] = None
+    # Identifies the worker holding the lease; kept out of API responses.
+    claim_token: Optional[str] = Field(default=None, exclude=True)
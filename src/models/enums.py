@@ -34,3 +34,28 @@ class BudgetStatus(str, Enum):
     HEALTHY = "healthy"
     WARNING = "warning"
     EXCEEDED = "exceeded"
+
+
+class ReportJobKind(str, Enum):
+    """Reports that can be generated by the background job queue."""
+
+    TRANSACTIONS_CSV = "transactions_csv"
+    MONTHLY_STATEMENT = "monthly_statement"
+
+
+class ReportJobStatus(str, Enum):
+    """Life-cycle states for queued report jobs."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ExportFormat(str, Enum):
+    """File formats available for transaction exports."""
+
+    CSV = "csv"
+    CSV_GZIP = "csv.gz"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, PositiveFloat
 
-from .enums import AccountType, GoalStatus, TransactionType
+from .enums import AccountType, GoalStatus, ReportJobKind, TransactionType
 
 
 class UserCreate(BaseModel):
@@ -107,3 +107,22 @@ class GoalUpdate(BaseModel):
     target_date: Optional[date] = None
     status: Optional[GoalStatus] = None
     lock_funds: Optional[bool] = None
+
+
+class BatchExportRequest(BaseModel):
+    """Payload selecting the users included in a batch export."""
+
+    user_ids: Optional[List[str]] = None
+    bundle: bool = False
+
+
+class ReportJobCreate(BaseModel):
+    """Payload used to enqueue report jobs."""
+
+    user_id: str
+    kind: ReportJobKind = ReportJobKind.TRANSACTIONS_CSV
+    month: Optional[str] = Field(
+        default=None,
+        pattern=r"^\d{4}-(0[1-9]|1[0-2])$",
+        description="Statement month as YYYY-MM, required for monthly statements",
+    )
@@ -3,9 +3,12 @@
 from .accounts import AccountRepository
 from .base import AbstractRepository
 from .budgets import BudgetRepository
+from .data_versions import DataVersionRepository
 from .goals import GoalRepository
+from .report_jobs import ReportJobRepository
 from .transactions import TransactionRepository
 from .users import UserRepository
+from .watermarks import ExportWatermarkRepository
 
 __all__ = [
     "AbstractRepository",
@@ -14,4 +17,7 @@ __all__ = [
     "TransactionRepository",
     "BudgetRepository",
     "GoalRepository",
+    "ReportJobRepository",
+    "ExportWatermarkRepository",
+    "DataVersionRepository",
 ]
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
 from src.models import AccountModel
-from src.utils import serialize_document
+from src.utils import decode_document
 
 from .base import AbstractRepository
 
@@ -26,17 +27,17 @@ class AccountRepository(AbstractRepository[AccountModel]):
 
         await self.collection.update_one(
             {"_id": self._to_object_id(account_id)},
-            {"$inc": {"balance": delta}},
+            {"$inc": {"balance": delta, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
         )
         document = await self.collection.find_one({"_id": self._to_object_id(account_id)})
-        return AccountModel(**serialize_document(document)) if document else None
+        return AccountModel(**decode_document(document)) if document else None
 
     async def update_goal_lock(self, account_id: str, delta: float) -> Optional[AccountModel]:
         """Increment the reserved goal amount."""
 
         await self.collection.update_one(
             {"_id": self._to_object_id(account_id)},
-            {"$inc": {"goal_locked_amount": delta}},
+            {"$inc": {"goal_locked_amount": delta, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
         )
         document = await self.collection.find_one({"_id": self._to_object_id(account_id)})
-        return AccountModel(**serialize_document(document)) if document else None
+        return AccountModel(**decode_document(document)) if document else None
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 from abc import ABC
 from datetime import datetime
-from typing import Any, ClassVar, Generic, Optional, TypeVar
+from typing import Any, AsyncIterator, ClassVar, Generic, Iterable, Optional, TypeVar
 
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 from src.models import MongoBaseModel
-from src.utils import serialize_document
+from src.utils import API_CODEC_OPTIONS, decode_document
 
 ModelType = TypeVar("ModelType", bound=MongoBaseModel)
 
@@ -19,10 +19,32 @@ class AbstractRepository(Generic[ModelType], ABC):
 
     collection_name: ClassVar[str]
     model: ClassVar[type[ModelType]]
+    indexes: ClassVar[list[list[tuple[str, int]]]] = []
+    unique_indexes: ClassVar[list[list[tuple[str, int]]]] = []
 
     def __init__(self, database: AsyncIOMotorDatabase) -> None:
         self.database = database
-        self.collection: AsyncIOMotorCollection = database[self.collection_name]
+        # ObjectIds are decoded straight to strings, so documents only need the _id rename.
+        self.collection: AsyncIOMotorCollection = database[self.collection_name].with_options(
+            codec_options=API_CODEC_OPTIONS
+        )
+
+    async def ensure_indexes(self) -> None:
+        """Create the compound and unique indexes declared by the repository."""
+
+        from pymongo.errors import OperationFailure
+
+        for keys in self.indexes:
+            await self.collection.create_index(keys)
+        for keys in self.unique_indexes:
+            try:
+                await self.collection.create_index(keys, unique=True)
+            except OperationFailure as exc:
+                # IndexOptionsConflict / IndexKeySpecsConflict: the keys were indexed before without ``unique``.
+                if exc.code not in (85, 86):
+                    raise
+                await self.collection.drop_index(keys)
+                await self.collection.create_index(keys, unique=True)
 
     async def create(self, payload: dict[str, Any]) -> ModelType:
         """Insert a new document and return the corresponding model."""
@@ -31,32 +53,75 @@ class AbstractRepository(Generic[ModelType], ABC):
         sanitized.setdefault("created_at", datetime.utcnow())
         result = await self.collection.insert_one(sanitized)
         persisted = await self.collection.find_one({"_id": result.inserted_id})
-        return self.model(**serialize_document(persisted))
+        return self.model(**decode_document(persisted))
 
     async def get_by_id(self, entity_id: str) -> Optional[ModelType]:
         """Fetch a document by identifier."""
 
         document = await self.collection.find_one({"_id": self._to_object_id(entity_id)})
-        return self.model(**serialize_document(document)) if document else None
+        return self.model(**decode_document(document)) if document else None
+
+    async def get_many(self, entity_ids: Iterable[str]) -> tuple[list[ModelType], list[str]]:
+        """Fetch several documents with a single ``$in`` query.
+
+        Returns the models in the order of ``entity_ids`` (repeated ids once) and the
+        ids that matched no document, malformed ids included.
+        """
+
+        from bson.errors import InvalidId
+
+        wanted = list(dict.fromkeys(entity_ids))
+        object_ids: dict[str, Any] = {}
+        for entity_id in wanted:
+            try:
+                object_ids[entity_id] = self._to_object_id(entity_id)
+            except InvalidId:
+                continue
+        found: dict[str, ModelType] = {}
+        if object_ids:
+            cursor = self.collection.find({"_id": {"$in": list(object_ids.values())}})
+            async for document in cursor:
+                model = self.model(**decode_document(document))
+                found[model.id] = model
+        items: list[ModelType] = []
+        missing: list[str] = []
+        for entity_id in wanted:
+            model = found.get(str(object_ids[entity_id])) if entity_id in object_ids else None
+            if model is None:
+                missing.append(entity_id)
+            else:
+                items.append(model)
+        return items, missing
 
     async def list(self, filters: Optional[dict[str, Any]] = None) -> list[ModelType]:
         """Return all documents matching the provided filters."""
 
         cursor = self.collection.find(filters or {})
-        documents = [self.model(**serialize_document(doc)) async for doc in cursor]
+        documents = [self.model(**decode_document(doc)) async for doc in cursor]
         return documents
 
+    async def iterate(
+        self,
+        filters: Optional[dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[ModelType]:
+        """Yield documents matching the filters one by one straight from the cursor."""
+
+        cursor = self.collection.find(filters or {}).batch_size(batch_size)
+        async for doc in cursor:
+            yield self.model(**decode_document(doc))
+
     async def update(self, entity_id: str, payload: dict[str, Any]) -> Optional[ModelType]:
         """Update a document partially."""
 
-        sanitized = {k: v for k, v in payload.items() if k != "id"}
+        sanitized = {k: v for k, v in payload.items() if k not in ("id", "version")}
         sanitized["updated_at"] = datetime.utcnow()
         await self.collection.update_one(
             {"_id": self._to_object_id(entity_id)},
-            {"$set": sanitized},
+            {"$set": sanitized, "$inc": {"version": 1}},
         )
         document = await self.collection.find_one({"_id": self._to_object_id(entity_id)})
-        return self.model(**serialize_document(document)) if document else None
+        return self.model(**decode_document(document)) if document else None
 
     async def delete(self, entity_id: str) -> bool:
         """Remove a document by identifier."""
@@ -72,6 +137,11 @@ class AbstractRepository(Generic[ModelType], ABC):
 
         return ObjectId(entity_id)
 
+    async def count(self, filters: Optional[dict[str, Any]] = None) -> int:
+        """Return how many documents match the filters."""
+
+        return await self.collection.count_documents(filters or {})
+
     async def exists(self, filters: dict[str, Any]) -> bool:
         """Return whether the filter matches any document."""
 
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 
 from src.models import BudgetModel, BudgetSummary
-from src.utils import serialize_document
+from src.utils import decode_document
 
 from .base import AbstractRepository
 
@@ -27,23 +27,35 @@ class BudgetRepository(AbstractRepository[BudgetModel]):
                 "period_end": {"$gte": period},
             }
         )
-        return BudgetModel(**serialize_document(document)) if document else None
+        return BudgetModel(**decode_document(document)) if document else None
+
+    async def list_active(self, user_id: str, day: date) -> list[BudgetModel]:
+        """Return budgets whose period contains the provided day."""
+
+        cursor = self.collection.find(
+            {
+                "user_id": user_id,
+                "period_start": {"$lte": day},
+                "period_end": {"$gte": day},
+            }
+        )
+        return [BudgetModel(**decode_document(doc)) async for doc in cursor]
 
     async def increment_spent(self, budget_id: str, amount: float) -> BudgetModel | None:
         """Increase the spent value and return the updated budget."""
 
         await self.collection.update_one(
             {"_id": self._to_object_id(budget_id)},
-            {"$inc": {"amount_spent": amount}},
+            {"$inc": {"amount_spent": amount, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
         )
         document = await self.collection.find_one({"_id": self._to_object_id(budget_id)})
-        return BudgetModel(**serialize_document(document)) if document else None
+        return BudgetModel(**decode_document(document)) if document else None
 
     async def summary(self, user_id: str) -> list[BudgetSummary]:
         """Aggregate budgets with derived state."""
 
         cursor = self.collection.find({"user_id": user_id})
-        budgets = [BudgetModel(**serialize_document(doc)) async for doc in cursor]
+        budgets = [BudgetModel(**decode_document(doc)) async for doc in cursor]
         return [
             BudgetSummary(
                 category=budget.category,
@@ -0,0 +1,74 @@
+"""Per-user data version repository implementation."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.models import DataVersion
+
+from .base import AbstractRepository
+
+
+class DataVersionRepository(AbstractRepository[DataVersion]):
+    """Keeps a monotonically increasing version of each user's data.
+
+    The last version read or written for each user is remembered, so callers that
+    can tolerate a slightly stale answer (conditional GETs) skip the round trip.
+    """
+
+    collection_name = "data_versions"
+    model = DataVersion
+    # Concurrent first bumps both upsert; the unique index keeps a single document per user.
+    unique_indexes = [[("user_id", 1)]]
+
+    def __init__(self, database: AsyncIOMotorDatabase, cache_size: int = 10_000) -> None:
+        super().__init__(database)
+        self.cache_size = cache_size
+        self._recent: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    async def get_version(self, user_id: str, max_age: float = 0.0) -> int:
+        """Return the current version for a user, ``0`` when never written.
+
+        With ``max_age`` the version seen by this process in the last ``max_age``
+        seconds is returned without querying Mongo.
+        """
+
+        if max_age > 0:
+            recent = self._recent.get(user_id)
+            if recent is not None and time.monotonic() - recent[1] <= max_age:
+                return recent[0]
+        document = await self.collection.find_one({"user_id": user_id}, {"version": 1})
+        version = int(document["version"]) if document else 0
+        self._remember(user_id, version)
+        return version
+
+    async def bump(self, user_id: str) -> int:
+        """Increment the version of a user and return the new value."""
+
+        now = datetime.utcnow()
+        update = {"$inc": {"version": 1}, "$set": {"updated_at": now}, "$setOnInsert": {"created_at": now}}
+        try:
+            document = await self.collection.find_one_and_update(
+                {"user_id": user_id}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost the race to insert the first version; the document exists now.
+            document = await self.collection.find_one_and_update(
+                {"user_id": user_id}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        version = int(document["version"])
+        self._remember(user_id, version)
+        return version
+
+    def _remember(self, user_id: str, version: int) -> None:
+        recent = self._recent.pop(user_id, None)
+        # A read that raced with a bump must not move the remembered version backwards.
+        self._recent[user_id] = (max(version, recent[0]) if recent else version, time.monotonic())
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Optional
 
-from src.models import GoalModel, GoalStatus
-from src.utils import serialize_document
+from src.models import GoalModel, GoalStatus, GoalWithAccount
+from src.utils import decode_document
 
 from .base import AbstractRepository
 
@@ -22,29 +22,79 @@ class GoalRepository(AbstractRepository[GoalModel]):
 
         await self.collection.update_one(
             {"_id": self._to_object_id(goal_id)},
-            {"$inc": {"current_amount": delta}},
+            {"$inc": {"current_amount": delta, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
         )
         document = await self.collection.find_one({"_id": self._to_object_id(goal_id)})
-        return GoalModel(**serialize_document(document)) if document else None
+        return GoalModel(**decode_document(document)) if document else None
 
     async def adjust_reserved(self, goal_id: str, delta: float) -> Optional[GoalModel]:
         """Increment reserved amount and return goal."""
 
         await self.collection.update_one(
             {"_id": self._to_object_id(goal_id)},
-            {"$inc": {"reserved_amount": delta}},
+            {"$inc": {"reserved_amount": delta, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
         )
         document = await self.collection.find_one({"_id": self._to_object_id(goal_id)})
-        return GoalModel(**serialize_document(document)) if document else None
+        return GoalModel(**decode_document(document)) if document else None
 
     async def list_active(self, user_id: str):
         """Return active goals for the user."""
 
         cursor = self.collection.find({"user_id": user_id, "status": GoalStatus.ACTIVE.value})
-        return [GoalModel(**serialize_document(doc)) async for doc in cursor]
+        return [GoalModel(**decode_document(doc)) async for doc in cursor]
 
     async def get_due_goals(self, target_date: date):
         """Return goals that should be completed by the provided date."""
 
         cursor = self.collection.find({"target_date": {"$lte": target_date}})
-        return [GoalModel(**serialize_document(doc)) async for doc in cursor]
+        return [GoalModel(**decode_document(doc)) async for doc in cursor]
+
+    async def list_with_account(self, filters: dict[str, Any]) -> list[GoalWithAccount]:
+        """Return goals matching the filters joined with their account in one aggregation."""
+
+        pipeline = [
+            {"$match": filters},
+            {
+                "$lookup": {
+                    "from": "accounts",
+                    "let": {
+                        "account_oid": {
+                            "$convert": {
+                                "input": "$account_id",
+                                "to": "objectId",
+                                "onError": None,
+                                "onNull": None,
+                            }
+                        }
+                    },
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$_id", "$$account_oid"]}}},
+                        {
+                            "$project": {
+                                "name": 1,
+                                "balance": 1,
+                                "goal_locked_amount": {"$ifNull": ["$goal_locked_amount", 0]},
+                                "available_balance": {
+                                    "$subtract": ["$balance", {"$ifNull": ["$goal_locked_amount", 0]}]
+                                },
+                            }
+                        },
+                    ],
+                    "as": "account",
+                }
+            },
+            {"$unwind": {"path": "$account", "preserveNullAndEmptyArrays": True}},
+        ]
+        goals = []
+        async for doc in self.collection.aggregate(pipeline):
+            payload = decode_document(doc)
+            if payload.get("account"):
+                payload["account"] = decode_document(payload["account"])
+            goals.append(GoalWithAccount(**payload))
+        return goals
+
+    async def get_with_account(self, goal_id: str) -> Optional[GoalWithAccount]:
+        """Fetch a goal by identifier joined with its account."""
+
+        goals = await self.list_with_account({"_id": self._to_object_id(goal_id)})
+        return goals[0] if goals else None
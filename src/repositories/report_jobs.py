@@ -0,0 +1,160 @@
+"""Report job repository implementation."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+from uuid import uuid4
+
+from pymongo import ASCENDING, ReturnDocument
+
+from src.models import ReportJobModel, ReportJobStatus, ReportPayload
+from src.utils import decode_document
+
+from .base import AbstractRepository
+
+
+class ReportJobRepository(AbstractRepository[ReportJobModel]):
+    """Persistence operations for queued report jobs shared by every worker process."""
+
+    collection_name = "report_jobs"
+    model = ReportJobModel
+    # Claims (oldest queued, expired leases), per-user running counts and backlog limits.
+    indexes = [
+        [("status", 1), ("created_at", 1)],
+        [("status", 1), ("lease_expires_at", 1)],
+        [("user_id", 1), ("status", 1)],
+    ]
+
+    async def count_by_status(self, user_id: str, statuses: Iterable[ReportJobStatus]) -> int:
+        """Return how many jobs of the user are in one of the statuses."""
+
+        return await self.collection.count_documents(
+            {"user_id": user_id, "status": {"$in": [status.value for status in statuses]}}
+        )
+
+    async def running_by_user(self) -> dict[str, int]:
+        """Return the number of running jobs with a live lease grouped by user."""
+
+        pipeline = [
+            {"$match": {"status": ReportJobStatus.RUNNING.value, "lease_expires_at": {"$gt": datetime.utcnow()}}},
+            {"$group": {"_id": "$user_id", "running": {"$sum": 1}}},
+        ]
+        rows = await self.collection.aggregate(pipeline).to_list(length=None)
+        return {row["_id"]: row["running"] for row in rows}
+
+    async def count_running(self, user_id: str) -> int:
+        """Return how many jobs of the user run under a live lease."""
+
+        return await self.collection.count_documents(
+            {
+                "user_id": user_id,
+                "status": ReportJobStatus.RUNNING.value,
+                "lease_expires_at": {"$gt": datetime.utcnow()},
+            }
+        )
+
+    async def claim_next(self, lease_seconds: float, exclude_users: Iterable[str] = ()) -> Optional[ReportJobModel]:
+        """Atomically move the oldest claimable job to running under a fresh lease.
+
+        Queued jobs are claimable, and so are running jobs whose lease expired: their
+        worker crashed or lost the database, so the job is taken back and retried.
+        """
+
+        now = datetime.utcnow()
+        query: dict[str, Any] = {
+            "$or": [
+                {"status": ReportJobStatus.QUEUED.value},
+                {"status": ReportJobStatus.RUNNING.value, "lease_expires_at": {"$not": {"$gt": now}}},
+            ]
+        }
+        excluded = list(exclude_users)
+        if excluded:
+            query["user_id"] = {"$nin": excluded}
+        document = await self.collection.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": ReportJobStatus.RUNNING.value,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "claim_token": uuid4().hex,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return ReportJobModel(**decode_document(document)) if document else None
+
+    async def renew_lease(self, job_id: str, claim_token: str, lease_seconds: float) -> bool:
+        """Extend the lease of a running job; ``False`` when another worker took it over."""
+
+        result = await self.collection.update_one(
+            self._claimed(job_id, claim_token),
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+        )
+        return result.matched_count == 1
+
+    async def requeue(self, job_id: str, claim_token: str, count_attempt: bool = True) -> None:
+        """Hand a running job back to the queue, e.g. when its worker is shutting down.
+
+        ``count_attempt=False`` undoes the claim entirely, for jobs given back unstarted.
+        """
+
+        update: dict[str, Any] = {
+            "$set": {"status": ReportJobStatus.QUEUED.value, "progress": 0},
+            "$unset": {"started_at": "", "lease_expires_at": "", "claim_token": ""},
+        }
+        if not count_attempt:
+            update["$inc"] = {"attempts": -1}
+        await self.collection.update_one(self._claimed(job_id, claim_token), update)
+
+    async def set_progress(
+        self, job_id: str, progress: int, total: Optional[int] = None, claim_token: Optional[str] = None
+    ) -> None:
+        """Record how many rows a running job has processed."""
+
+        changes: dict = {"progress": progress, "updated_at": datetime.utcnow()}
+        if total is not None:
+            changes["total"] = total
+        await self.collection.update_one(self._claimed(job_id, claim_token), {"$set": changes})
+
+    async def complete(self, job_id: str, report: ReportPayload, claim_token: Optional[str] = None) -> None:
+        """Mark a job as completed with the generated report."""
+
+        await self.collection.update_one(
+            self._claimed(job_id, claim_token),
+            {
+                "$set": {
+                    "status": ReportJobStatus.COMPLETED.value,
+                    "progress": report.total_transactions,
+                    "report": report.model_dump(),
+                    "finished_at": datetime.utcnow(),
+                },
+                "$unset": {"lease_expires_at": ""},
+            },
+        )
+
+    async def fail(self, job_id: str, error: str, claim_token: Optional[str] = None) -> None:
+        """Mark a job as failed keeping the error message."""
+
+        await self.collection.update_one(
+            self._claimed(job_id, claim_token),
+            {
+                "$set": {
+                    "status": ReportJobStatus.FAILED.value,
+                    "error": error,
+                    "finished_at": datetime.utcnow(),
+                },
+                "$unset": {"lease_expires_at": ""},
+            },
+        )
+
+    def _claimed(self, job_id: str, claim_token: Optional[str]) -> dict[str, Any]:
+        """Match the job only while the worker holding ``claim_token`` still owns it."""
+
+        query: dict[str, Any] = {"_id": self._to_object_id(job_id)}
+        if claim_token is not None:
+            query["claim_token"] = claim_token
+        return query
@@ -2,21 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Any
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterable, Optional
 
 from pymongo import ASCENDING, DESCENDING
 
-from src.models import TransactionFilter, TransactionModel
-from src.utils import serialize_document
+from src.models import TransactionFilter, TransactionModel, TransactionType
+from src.utils import decode_document
 
 from .base import AbstractRepository
 
+_STATEMENT_BUDGET_FIELDS = ("budget_id", "category", "limit_amount", "amount_spent", "period_start", "period_end")
+
 
 class TransactionRepository(AbstractRepository[TransactionModel]):
     """Persistence operations for transactions."""
 
     collection_name = "transactions"
     model = TransactionModel
+    indexes = [
+        [("user_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+        [("user_id", ASCENDING), ("updated_at", ASCENDING)],
+    ]
 
     async def search(self, filters: TransactionFilter) -> list[TransactionModel]:
         """Return transactions applying filters and ordering."""
@@ -42,7 +49,7 @@ class TransactionRepository(AbstractRepository[TransactionModel]):
         cursor = (
             self.collection.find(query).sort(filters.sort_by, sort_direction)
         )
-        documents = [self.model(**serialize_document(doc)) async for doc in cursor]
+        documents = [self.model(**decode_document(doc)) async for doc in cursor]
         return documents
 
     async def total_by_type(self, user_id: str) -> dict[str, float]:
@@ -63,3 +70,218 @@ class TransactionRepository(AbstractRepository[TransactionModel]):
             key = row["_id"].lower()
             response[key] = row["total"]
         return response
+
+    async def goal_contributions(self, user_id: str) -> dict[str, list[Any]]:
+        """Return the goal contribution history of a user as parallel columns."""
+
+        cursor = self.collection.find(
+            {"user_id": user_id, "goal_id": {"$ne": None}},
+            projection={"_id": 0, "goal_id": 1, "event_date": 1, "amount": 1},
+        )
+        columns: dict[str, list[Any]] = {"goal_id": [], "event_date": [], "amount": []}
+        async for doc in cursor:
+            columns["goal_id"].append(str(doc["goal_id"]))
+            columns["event_date"].append(doc["event_date"])
+            columns["amount"].append(float(doc["amount"]))
+        return columns
+
+    async def daily_spend(
+        self,
+        user_id: str,
+        categories: Iterable[str],
+        start: datetime,
+        end: datetime,
+    ) -> dict[str, dict[date, float]]:
+        """Return expense totals grouped by category and day within ``[start, end)``."""
+
+        pipeline = [
+            {
+                "$match": {
+                    "user_id": user_id,
+                    "type": TransactionType.EXPENSE.value,
+                    "goal_id": None,
+                    "category": {"$in": sorted(set(categories))},
+                    "event_date": {"$gte": start, "$lt": end},
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        "category": "$category",
+                        "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$event_date"}},
+                    },
+                    "total": {"$sum": "$amount"},
+                }
+            },
+        ]
+        series: dict[str, dict[date, float]] = {}
+        async for row in self.collection.aggregate(pipeline):
+            day = date.fromisoformat(row["_id"]["day"])
+            series.setdefault(row["_id"]["category"], {})[day] = float(row["total"])
+        return series
+
+    async def iterate_changed_since(
+        self,
+        user_id: str,
+        since: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[TransactionModel]:
+        """Yield transactions created or updated after the ``(since, after_id)`` watermark.
+
+        Each ``$or`` branch is an indexed range on ``created_at``/``updated_at`` so the
+        cost follows the number of changed rows rather than the user's history. Rows
+        changed exactly at ``since`` are told apart by ``_id`` for both timestamps.
+        """
+
+        query: dict[str, Any] = {"user_id": user_id}
+        if since is not None:
+            branches: list[dict[str, Any]] = [
+                {"created_at": {"$gt": since}},
+                {"updated_at": {"$gt": since}},
+            ]
+            if after_id is not None:
+                after = {"$gt": self._to_object_id(after_id)}
+                branches.append({"created_at": since, "_id": after})
+                branches.append({"updated_at": since, "_id": after})
+            query["$or"] = branches
+        cursor = self.collection.find(query).sort("_id", ASCENDING).batch_size(batch_size)
+        async for doc in cursor:
+            yield self.model(**decode_document(doc))
+
+    async def monthly_statement(
+        self,
+        user_id: str,
+        start: datetime,
+        end: datetime,
+        first_day: date,
+        last_day: date,
+    ) -> dict[str, Any]:
+        """Aggregate the inputs of a monthly statement in a single round trip.
+
+        Transactions from ``start`` onwards are unioned with the user's accounts and the
+        budgets overlapping ``[first_day, last_day]`` and split by one ``$facet`` into the
+        category/type pivot, per-account flows (in the month and after ``end``, used to
+        roll balances back), the accounts and the budgets.
+        """
+
+        # Goal contributions keep the money on the account, so they do not move balances.
+        signed_amount = {
+            "$switch": {
+                "branches": [
+                    {"case": {"$eq": ["$type", TransactionType.INCOME.value]}, "then": "$amount"},
+                    {
+                        "case": {"$eq": [{"$ifNull": ["$goal_id", None]}, None]},
+                        "then": {"$multiply": ["$amount", -1]},
+                    },
+                ],
+                "default": 0,
+            }
+        }
+        in_month = {"$lt": ["$event_date", end]}
+        is_transaction = {"$match": {"_source": {"$exists": False}}}
+        pipeline = [
+            {"$match": {"user_id": user_id, "event_date": {"$gte": start}}},
+            {
+                "$unionWith": {
+                    "coll": "accounts",
+                    "pipeline": [
+                        {"$match": {"user_id": user_id}},
+                        {
+                            "$project": {
+                                "_source": "account",
+                                "account_id": {"$toString": "$_id"},
+                                "name": 1,
+                                "balance": 1,
+                            }
+                        },
+                    ],
+                }
+            },
+            {
+                "$unionWith": {
+                    "coll": "budgets",
+                    "pipeline": [
+                        {
+                            "$match": {
+                                "user_id": user_id,
+                                "period_start": {"$lte": last_day},
+                                "period_end": {"$gte": first_day},
+                            }
+                        },
+                        {
+                            "$project": {
+                                "_source": "budget",
+                                "budget_id": {"$toString": "$_id"},
+                                "category": 1,
+                                "limit_amount": 1,
+                                "amount_spent": 1,
+                                "period_start": 1,
+                                "period_end": 1,
+                            }
+                        },
+                    ],
+                }
+            },
+            {
+                "$facet": {
+                    "pivot": [
+                        is_transaction,
+                        {"$match": {"event_date": {"$lt": end}}},
+                        {
+                            "$group": {
+                                "_id": {"category": "$category", "type": "$type"},
+                                "total": {"$sum": "$amount"},
+                                "count": {"$sum": 1},
+                            }
+                        },
+                    ],
+                    "flows": [
+                        is_transaction,
+                        {
+                            "$group": {
+                                "_id": "$account_id",
+                                "inflow": {
+                                    "$sum": {
+                                        "$cond": [{"$and": [in_month, {"$gt": [signed_amount, 0]}]}, signed_amount, 0]
+                                    }
+                                },
+                                "outflow": {
+                                    "$sum": {
+                                        "$cond": [
+                                            {"$and": [in_month, {"$lt": [signed_amount, 0]}]},
+                                            {"$multiply": [signed_amount, -1]},
+                                            0,
+                                        ]
+                                    }
+                                },
+                                "after": {"$sum": {"$cond": [in_month, 0, signed_amount]}},
+                            }
+                        },
+                    ],
+                    "accounts": [{"$match": {"_source": "account"}}],
+                    "budgets": [{"$match": {"_source": "budget"}}],
+                }
+            },
+        ]
+        facets = (await self.collection.aggregate(pipeline).to_list(length=1) or [{}])[0]
+        return {
+            "pivot": [
+                {
+                    "category": row["_id"]["category"],
+                    "type": row["_id"]["type"],
+                    "total": float(row["total"]),
+                    "count": int(row["count"]),
+                }
+                for row in facets.get("pivot", [])
+            ],
+            "flows": {
+                str(row["_id"]): {key: float(row[key]) for key in ("inflow", "outflow", "after")}
+                for row in facets.get("flows", [])
+            },
+            "accounts": [
+                {"account_id": doc["account_id"], "name": doc["name"], "balance": float(doc["balance"])}
+                for doc in facets.get("accounts", [])
+            ],
+            "budgets": [{key: doc[key] for key in _STATEMENT_BUDGET_FIELDS} for doc in facets.get("budgets", [])],
+        }
@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Optional
 
 from src.models import UserModel
-from src.utils import serialize_document
+from src.utils import decode_document
 
 from .base import AbstractRepository
 
@@ -20,4 +20,4 @@ class UserRepository(AbstractRepository[UserModel]):
         """Return a user matching the provided e-mail."""
 
         document = await self.collection.find_one({"email": email})
-        return UserModel(**serialize_document(document)) if document else None
+        return UserModel(**decode_document(document)) if document else None
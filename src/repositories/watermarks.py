@@ -0,0 +1,61 @@
+"""Export watermark repository implementation."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.models import ExportWatermark
+from src.utils import decode_document
+
+from .base import AbstractRepository
+
+
+class ExportWatermarkRepository(AbstractRepository[ExportWatermark]):
+    """Stores the last exported position of each user's transactions."""
+
+    collection_name = "export_watermarks"
+    model = ExportWatermark
+    # save() upserts, so concurrent first exports of a user must not insert two watermarks.
+    unique_indexes = [[("user_id", 1)]]
+
+    async def get_for_user(self, user_id: str) -> Optional[ExportWatermark]:
+        """Return the watermark recorded for a user."""
+
+        document = await self.collection.find_one({"user_id": user_id})
+        return ExportWatermark(**decode_document(document)) if document else None
+
+    async def save(
+        self,
+        user_id: str,
+        changed_at: datetime,
+        last_id: str,
+        file_path: str,
+        overlap_ids: Optional[dict[str, datetime]] = None,
+    ) -> ExportWatermark:
+        """Upsert the watermark of a user after a successful export."""
+
+        now = datetime.utcnow()
+        update = {
+            "$set": {
+                "changed_at": changed_at,
+                "last_id": last_id,
+                "file_path": file_path,
+                "overlap_ids": overlap_ids or {},
+                "updated_at": now,
+            },
+            "$setOnInsert": {"created_at": now},
+        }
+        try:
+            document = await self.collection.find_one_and_update(
+                {"user_id": user_id}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost the race to insert the first watermark; the document exists now.
+            document = await self.collection.find_one_and_update(
+                {"user_id": user_id}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        return ExportWatermark(**decode_document(document))
@@ -1,18 +1,30 @@
 """Service layer that encapsulates business rules."""
 
 from .accounts import AccountService
+from .batch_exports import BatchExportService
 from .budgets import BudgetService
 from .exceptions import BusinessRuleError, NotFoundError, ValidationError
+from .forecasts import BudgetProjectionService, GoalForecastService
 from .goals import GoalService
+from .invalidation import Invalidator
+from .report_jobs import ReportJobService, ReportJobWorker
 from .reports import ReportService
+from .statements import StatementService
 from .transactions import TransactionService
 from .users import UserService
 
 __all__ = [
     "AccountService",
+    "BatchExportService",
     "BudgetService",
+    "BudgetProjectionService",
     "GoalService",
+    "GoalForecastService",
+    "Invalidator",
+    "ReportJobService",
+    "ReportJobWorker",
     "ReportService",
+    "StatementService",
     "TransactionService",
     "UserService",
     "BusinessRuleError",
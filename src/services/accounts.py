@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence
 
-from src.models import AccountCreate, AccountModel, AccountUpdate
+from src.models import AccountCreate, AccountModel, AccountUpdate, EntityBatch
 from src.repositories import AccountRepository, UserRepository
+from src.utils import coalesced
 
 from .exceptions import NotFoundError
+from .invalidation import Invalidator
 
 
 class AccountService:
     """Operations for managing accounts."""
 
-    def __init__(self, repository: AccountRepository, user_repository: UserRepository) -> None:
+    def __init__(
+        self,
+        repository: AccountRepository,
+        user_repository: UserRepository,
+        invalidator: Optional[Invalidator] = None,
+    ) -> None:
         self.repository = repository
         self.user_repository = user_repository
+        self.invalidator = invalidator or Invalidator()
 
     async def create_account(self, payload: AccountCreate) -> AccountModel:
         """Create a new account ensuring the user exists."""
@@ -23,12 +31,20 @@ class AccountService:
         user = await self.user_repository.get_by_id(payload.user_id)
         if not user:
             raise NotFoundError("User not found for account creation")
-        return await self.repository.create(payload.model_dump())
+        account = await self.repository.create(payload.model_dump())
+        await self.invalidator.invalidate(payload.user_id)
+        return account
 
     async def list_accounts(self, user_id: str) -> List[AccountModel]:
         """Return all accounts for a user."""
 
-        return await self.repository.find_by_user(user_id)
+        return await coalesced(
+            self.invalidator.single_flight,
+            user_id,
+            "accounts.list",
+            None,
+            lambda: self.repository.find_by_user(user_id),
+        )
 
     async def get_account(self, account_id: str) -> AccountModel:
         """Return account by id or raise."""
@@ -38,6 +54,12 @@ class AccountService:
             raise NotFoundError("Account not found")
         return account
 
+    async def get_accounts(self, account_ids: Sequence[str]) -> EntityBatch[AccountModel]:
+        """Return the accounts with the given ids in that order, listing the ids not found."""
+
+        items, missing_ids = await self.repository.get_many(account_ids)
+        return EntityBatch[AccountModel](items=items, missing_ids=missing_ids)
+
     async def update_account(self, account_id: str, payload: AccountUpdate) -> AccountModel:
         """Update account fields."""
 
@@ -45,12 +67,21 @@ class AccountService:
         updated = await self.repository.update(account_id, data)
         if not updated:
             raise NotFoundError("Account not found")
+        await self.invalidator.invalidate(updated.user_id)
         return updated
 
     async def delete_account(self, account_id: str) -> bool:
         """Delete an account."""
 
+        owner = await self.invalidator.owner_of(self.repository, account_id)
         deleted = await self.repository.delete(account_id)
         if not deleted:
             raise NotFoundError("Account not found")
+        if owner is not None:
+            await self.invalidator.invalidate(owner)
         return deleted
+
+    async def data_version(self, user_id: str, max_age: float = 0.0) -> Optional[int]:
+        """Return the user's data version for conditional GETs, ``None`` without a version store."""
+
+        return await self.invalidator.data_version(user_id, max_age=max_age)
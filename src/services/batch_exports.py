@@ -0,0 +1,196 @@
+"""Multi-user transaction exports fanned out across worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import zipfile
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config.settings import get_settings
+from src.models import BatchExportPayload
+from src.repositories import TransactionRepository, UserRepository
+from src.utils import FileManager, get_batch_export_pool, run_in_export_pool, spawn_process_pool
+
+# ``(user_id, file_path, rows, error)``; ``file_path`` is ``None`` and ``error`` set when the user failed.
+BatchResult = List[tuple[str, Optional[str], int, Optional[str]]]
+BatchRunner = Callable[[Sequence[str], str, int], BatchResult]
+ProgressCallback = Callable[[int, int, int, float], None]
+
+
+def export_user_batch(
+    user_ids: Sequence[str],
+    output_dir: str,
+    chunk_size: int,
+    mongodb_uri: str,
+    mongodb_database: str,
+) -> BatchResult:
+    """Export one CSV per user from a worker process with its own Motor client.
+
+    Returns ``(user_id, file_path, rows, error)`` for every user; a user that fails
+    does not abort the others of the batch.
+    """
+
+    return asyncio.run(_export_user_batch(user_ids, Path(output_dir), chunk_size, mongodb_uri, mongodb_database))
+
+
+async def _export_user_batch(
+    user_ids: Sequence[str],
+    output_dir: Path,
+    chunk_size: int,
+    mongodb_uri: str,
+    mongodb_database: str,
+) -> BatchResult:
+    client = AsyncIOMotorClient(mongodb_uri)
+    try:
+        repository = TransactionRepository(client[mongodb_database])
+        file_manager = FileManager(base_dir=output_dir)
+
+        async def export(user_id: str) -> tuple[str, Optional[str], int, Optional[str]]:
+            try:
+                # Round-tripping through ObjectId keeps anything but a hex id out of the file name.
+                file_path = output_dir / f"transactions_{ObjectId(user_id)}.csv"
+                report = await file_manager.export_transactions_async(
+                    repository.iterate({"user_id": user_id}, batch_size=chunk_size),
+                    chunk_size=chunk_size,
+                    file_path=file_path,
+                )
+            except Exception as exc:  # noqa: BLE001 - reported per user in the batch payload
+                return user_id, None, 0, f"{type(exc).__name__}: {exc}"
+            return user_id, report.file_path, report.total_transactions, None
+
+        # Concurrency inside the worker is bounded by the export slots of its loop.
+        return list(await asyncio.gather(*(export(user_id) for user_id in user_ids)))
+    finally:
+        client.close()
+
+
+def _bundle(directory: Path, files: Sequence[str]) -> str:
+    archive_path = directory.with_suffix(".zip")
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for file_path in files:
+            archive.write(file_path, arcname=Path(file_path).name)
+    return str(archive_path)
+
+
+class BatchExportService:
+    """Exports the transactions of many users in parallel worker processes.
+
+    Batches run on the process pool shared by every request unless ``executor`` is given
+    or a call asks for its own number of ``workers``.
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        file_manager: FileManager | None = None,
+        batch_runner: Optional[BatchRunner] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        settings = get_settings()
+        self.user_repository = user_repository
+        self.file_manager = file_manager or FileManager()
+        self.batch_runner = batch_runner or partial(
+            export_user_batch,
+            mongodb_uri=settings.mongodb_uri,
+            mongodb_database=settings.mongodb_database,
+        )
+        self.executor = executor
+
+    async def export_users(
+        self,
+        user_ids: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+        bundle: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> BatchExportPayload:
+        """Write one CSV per user, optionally zipped into a single archive.
+
+        Users default to every registered user. Ids that are malformed or match no user,
+        and users whose export fails, are listed in ``failures`` instead of failing the
+        whole batch. ``on_progress`` receives the number of users done, the total number
+        of users, the rows written and the rows per second.
+
+        ``workers`` runs the export on its own pool of that many processes; by default
+        it shares the pool sized by ``batch_export_workers``. With an injected
+        ``executor`` it only sets how many batches the users are split into.
+        """
+
+        settings = get_settings()
+        owned_pool = workers is not None and self.executor is None
+        workers = max(workers or settings.batch_export_workers, 1)
+        failures: dict[str, str] = {}
+        if user_ids is None:
+            user_ids = [user.id async for user in self.user_repository.iterate({}, batch_size=1000)]
+        else:
+            users, missing_ids = await self.user_repository.get_many(user_ids)
+            failures.update((user_id, "User not found") for user_id in missing_ids)
+            # Only ids read back from the users collection reach the workers and the file names.
+            user_ids = [user.id for user in users]
+        directory = self.file_manager.base_dir / f"batch_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}"
+        await run_in_export_pool(directory.mkdir, parents=True, exist_ok=True)
+
+        # Several small batches per worker keep the pool busy when user sizes are skewed.
+        batch_count = min(len(user_ids), workers * 4)
+        batches = [list(user_ids[index::batch_count]) for index in range(batch_count)]
+        started = time.perf_counter()
+        files: list[str] = []
+        users_done = processed = rows = 0
+        if batches:
+            if owned_pool:
+                executor: Executor = spawn_process_pool(workers)
+            else:
+                executor = self.executor or get_batch_export_pool()
+            pending = [
+                asyncio.ensure_future(self._run_batch(executor, batch, str(directory), settings.export_chunk_size))
+                for batch in batches
+            ]
+            try:
+                for completed in asyncio.as_completed(pending):
+                    results = await completed
+                    processed += len(results)
+                    for user_id, file_path, count, error in results:
+                        if error is not None:
+                            failures[user_id] = error
+                            continue
+                        users_done += 1
+                        rows += count
+                        files.append(file_path)
+                    if on_progress is not None:
+                        on_progress(processed, len(user_ids), rows, rows / max(time.perf_counter() - started, 1e-9))
+            finally:
+                # A shared pool keeps running other exports, so only this export's batches are cancelled.
+                for future in pending:
+                    future.cancel()
+                if owned_pool:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+        archive_path = await run_in_export_pool(_bundle, directory, sorted(files)) if bundle else None
+        elapsed = time.perf_counter() - started
+        return BatchExportPayload(
+            generated_at=datetime.utcnow(),
+            directory=str(directory),
+            archive_path=archive_path,
+            total_users=users_done,
+            total_transactions=rows,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(rows / max(elapsed, 1e-9), 1),
+            failures=failures,
+        )
+
+    async def _run_batch(self, executor: Executor, batch: List[str], directory: str, chunk_size: int) -> BatchResult:
+        """Run one batch, turning a crashed batch into a failure for each of its users."""
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, self.batch_runner, batch, directory, chunk_size)
+        except Exception as exc:  # noqa: BLE001 - a lost worker must not fail the other batches
+            error = f"{type(exc).__name__}: {exc}"
+            return [(user_id, None, 0, error) for user_id in batch]
@@ -3,19 +3,26 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List
+from typing import List, Optional, Sequence
 
-from src.models import BudgetCreate, BudgetModel, BudgetSummary, BudgetUpdate
+from src.models import BudgetCreate, BudgetModel, BudgetSummary, BudgetUpdate, EntityBatch
 from src.repositories import BudgetRepository
+from src.utils import cached_or_compute, coalesced
 
 from .exceptions import BusinessRuleError, NotFoundError
+from .invalidation import Invalidator
 
 
 class BudgetService:
     """Operations that manage category budgets."""
 
-    def __init__(self, repository: BudgetRepository) -> None:
+    def __init__(
+        self,
+        repository: BudgetRepository,
+        invalidator: Optional[Invalidator] = None,
+    ) -> None:
         self.repository = repository
+        self.invalidator = invalidator or Invalidator()
 
     async def create_budget(self, payload: BudgetCreate) -> BudgetModel:
         """Create a budget making sure there are no overlapping periods."""
@@ -26,7 +33,9 @@ class BudgetService:
         )
         if overlap:
             raise BusinessRuleError("Budget period overlaps an existing one")
-        return await self.repository.create(payload.model_dump())
+        budget = await self.repository.create(payload.model_dump())
+        await self.invalidator.invalidate(payload.user_id)
+        return budget
 
     async def list_budgets(self, user_id: str) -> List[BudgetModel]:
         """List budgets filtered by user."""
@@ -41,6 +50,12 @@ class BudgetService:
             raise NotFoundError("Budget not found")
         return budget
 
+    async def get_budgets(self, budget_ids: Sequence[str]) -> EntityBatch[BudgetModel]:
+        """Return the budgets with the given ids in that order, listing the ids not found."""
+
+        items, missing_ids = await self.repository.get_many(budget_ids)
+        return EntityBatch[BudgetModel](items=items, missing_ids=missing_ids)
+
     async def update_budget(self, budget_id: str, payload: BudgetUpdate) -> BudgetModel:
         """Update budget parameters."""
 
@@ -48,20 +63,36 @@ class BudgetService:
         updated = await self.repository.update(budget_id, data)
         if not updated:
             raise NotFoundError("Budget not found")
+        await self.invalidator.invalidate(updated.user_id)
         return updated
 
     async def delete_budget(self, budget_id: str) -> bool:
         """Delete budget."""
 
+        owner = await self.invalidator.owner_of(self.repository, budget_id)
         deleted = await self.repository.delete(budget_id)
         if not deleted:
             raise NotFoundError("Budget not found")
+        if owner is not None:
+            await self.invalidator.invalidate(owner)
         return deleted
 
     async def summarize(self, user_id: str) -> List[BudgetSummary]:
         """Return summary for all budgets of the user."""
 
-        return await self.repository.summary(user_id)
+        return await cached_or_compute(
+            self.invalidator.result_cache,
+            user_id,
+            "budgets.summary",
+            None,
+            lambda: coalesced(
+                self.invalidator.single_flight,
+                user_id,
+                "budgets.summary",
+                None,
+                lambda: self.repository.summary(user_id),
+            ),
+        )
 
     async def get_budget_for(self, user_id: str, category: str, day: date) -> BudgetModel | None:
         """Fetch budget by category for provided day."""
@@ -77,6 +108,11 @@ class BudgetService:
             )
         return await self.repository.increment_spent(budget.id, amount)
 
+    async def data_version(self, user_id: str, max_age: float = 0.0) -> Optional[int]:
+        """Return the user's data version for conditional GETs, ``None`` without a version store."""
+
+        return await self.invalidator.data_version(user_id, max_age=max_age)
+
     def _validate_period(self, start: date, end: date) -> None:
         """Ensure the period boundaries make sense."""
 
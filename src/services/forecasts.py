@@ -0,0 +1,271 @@
+"""Forecasting helpers projecting goals and budgets from transaction history."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, List, Optional
+
+from config.settings import get_settings
+from src.models import BudgetModel, BudgetProjection, GoalForecast, GoalModel, GoalStatus
+from src.repositories import BudgetRepository, DataVersionRepository, GoalRepository, TransactionRepository
+from src.utils import run_in_process_pool
+
+from .exceptions import NotFoundError
+
+if TYPE_CHECKING:  # numpy is imported where it is used to keep API start-up light
+    import numpy as np
+
+_SECONDS_PER_DAY = 86_400.0
+
+
+def fit_contribution_trends(
+    goal_codes: np.ndarray,
+    days: np.ndarray,
+    amounts: np.ndarray,
+    goal_count: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fit cumulative contributions over time for every goal in one vectorized pass.
+
+    ``goal_codes`` maps each contribution to a goal index in ``range(goal_count)`` and
+    ``days`` is expressed relative to today (non-positive values). Returns the daily
+    contribution rate and the number of contributions for each goal.
+    """
+
+    import numpy as np
+
+    order = np.lexsort((days, goal_codes))
+    codes = goal_codes[order]
+    days = days[order]
+    amounts = amounts[order]
+
+    counts = np.bincount(codes, minlength=goal_count).astype(float)
+    starts = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)[:-1]))
+    running = np.cumsum(amounts)
+    previous_totals = np.concatenate(([0.0], running))[starts]
+    cumulative = running - previous_totals[codes]
+
+    sum_t = np.bincount(codes, weights=days, minlength=goal_count)
+    sum_y = np.bincount(codes, weights=cumulative, minlength=goal_count)
+    sum_tt = np.bincount(codes, weights=days * days, minlength=goal_count)
+    sum_ty = np.bincount(codes, weights=days * cumulative, minlength=goal_count)
+    denominator = counts * sum_tt - sum_t * sum_t
+    numerator = counts * sum_ty - sum_t * sum_y
+    slopes = np.divide(numerator, denominator, out=np.zeros(goal_count), where=denominator > 1e-9)
+
+    # Goals with a single contribution day have no trend: spread the total since it started.
+    first_day = np.zeros(goal_count)
+    has_rows = counts > 0
+    first_day[has_rows] = days[starts[has_rows]]
+    totals = np.bincount(codes, weights=amounts, minlength=goal_count)
+    fallback = totals / np.maximum(-first_day, 1.0)
+    rates = np.where(slopes > 0, slopes, fallback)
+    return rates, counts.astype(np.int64)
+
+
+class GoalForecastService:
+    """Projects when each goal will be reached at the current contribution pace.
+
+    Fitted rates are cached until the user's data version changes, so edited and
+    deleted contributions are refitted too. Without a version store nothing is cached.
+    """
+
+    def __init__(
+        self,
+        repository: GoalRepository,
+        transaction_repository: TransactionRepository,
+        version_repository: Optional[DataVersionRepository] = None,
+    ) -> None:
+        self.repository = repository
+        self.transaction_repository = transaction_repository
+        self.version_repository = version_repository
+        self.settings = get_settings()
+        # Keyed by user and day: the fallback rate spreads totals over the days up to ``today``.
+        self._rate_cache: OrderedDict[tuple[str, date], tuple[int, dict[str, tuple[float, int]]]] = OrderedDict()
+
+    async def forecast_goals(self, user_id: str, today: date | None = None) -> List[GoalForecast]:
+        """Return the completion forecast for every goal of the user."""
+
+        today = today or datetime.utcnow().date()
+        goals = await self.repository.list({"user_id": user_id})
+        if not goals:
+            return []
+        trends = await self._contribution_trends(user_id, today)
+        return self._project(goals, trends, today)
+
+    async def _contribution_trends(self, user_id: str, today: date) -> dict[str, tuple[float, int]]:
+        """Return cached per-goal rates, refitting after the user writes or on a new day."""
+
+        version = await self.version_repository.get_version(user_id) if self.version_repository else None
+        key = (user_id, today)
+        cached = self._rate_cache.get(key)
+        if version is not None and cached is not None and cached[0] == version:
+            self._rate_cache.move_to_end(key)
+            return cached[1]
+
+        columns = await self.transaction_repository.goal_contributions(user_id)
+        trends: dict[str, tuple[float, int]] = {}
+        if columns["amount"]:
+            import numpy as np
+
+            goal_ids, goal_codes = np.unique(np.asarray(columns["goal_id"]), return_inverse=True)
+            reference = datetime.combine(today, datetime.min.time())
+            days = np.fromiter(
+                ((event - reference).total_seconds() / _SECONDS_PER_DAY for event in columns["event_date"]),
+                dtype=float,
+                count=len(columns["event_date"]),
+            )
+            amounts = np.asarray(columns["amount"], dtype=float)
+            arguments = (goal_codes.astype(np.int64), days, amounts, len(goal_ids))
+            if amounts.size >= self.settings.forecast_process_pool_threshold:
+                rates, counts = await run_in_process_pool(fit_contribution_trends, *arguments)
+            else:
+                rates, counts = fit_contribution_trends(*arguments)
+            trends = {
+                str(goal_id): (float(rate), int(count))
+                for goal_id, rate, count in zip(goal_ids, rates, counts)
+            }
+
+        if version is not None:
+            self._rate_cache[key] = (version, trends)
+            self._rate_cache.move_to_end(key)
+            while len(self._rate_cache) > self.settings.forecast_cache_size:
+                self._rate_cache.popitem(last=False)
+        return trends
+
+    @staticmethod
+    def _project(
+        goals: List[GoalModel],
+        trends: dict[str, tuple[float, int]],
+        today: date,
+    ) -> List[GoalForecast]:
+        """Combine live goal balances with fitted rates into forecasts."""
+
+        import numpy as np
+
+        remaining = np.maximum(
+            np.array([goal.target_amount - goal.current_amount for goal in goals], dtype=float),
+            0.0,
+        )
+        rates = np.array([trends.get(goal.id, (0.0, 0))[0] for goal in goals], dtype=float)
+        days_needed = np.full(len(goals), -1.0)
+        np.divide(remaining, rates, out=days_needed, where=rates > 0)
+        days_needed = np.ceil(days_needed)
+
+        forecasts = []
+        for index, goal in enumerate(goals):
+            completed = goal.status == GoalStatus.COMPLETED or remaining[index] == 0
+            projected: Optional[date] = None
+            on_track: Optional[bool] = True if completed else None
+            if not completed and days_needed[index] >= 0:
+                projected = today + timedelta(days=int(days_needed[index]))
+                on_track = projected <= goal.target_date
+            forecasts.append(
+                GoalForecast(
+                    goal_id=goal.id,
+                    name=goal.name,
+                    status=goal.status,
+                    target_amount=goal.target_amount,
+                    current_amount=goal.current_amount,
+                    remaining_amount=round(float(remaining[index]), 2),
+                    target_date=goal.target_date,
+                    contributions=trends.get(goal.id, (0.0, 0))[1],
+                    daily_rate=round(float(rates[index]), 2),
+                    projected_completion_date=projected,
+                    on_track=on_track,
+                )
+            )
+        return forecasts
+
+
+def project_period_spend(
+    daily_spend: np.ndarray,
+    elapsed_days: np.ndarray,
+    total_days: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Project end-of-period spend for a batch of budgets.
+
+    ``daily_spend`` holds one zero-padded row per budget. Returns the spend to date,
+    the daily average over the elapsed days and the projected total for the period.
+    """
+
+    import numpy as np
+
+    cumulative = np.cumsum(daily_spend, axis=1)
+    padded = np.concatenate((np.zeros((cumulative.shape[0], 1)), cumulative), axis=1)
+    spent = padded[np.arange(cumulative.shape[0]), elapsed_days]
+    average = np.divide(spent, elapsed_days, out=np.zeros_like(spent), where=elapsed_days > 0)
+    projected = spent + average * (total_days - elapsed_days)
+    return spent, average, projected
+
+
+class BudgetProjectionService:
+    """Projects budget burn rate from the daily spend series of each period."""
+
+    def __init__(self, repository: BudgetRepository, transaction_repository: TransactionRepository) -> None:
+        self.repository = repository
+        self.transaction_repository = transaction_repository
+
+    async def project_budget(self, budget_id: str, today: date | None = None) -> BudgetProjection:
+        """Return the projection for a single budget."""
+
+        budget = await self.repository.get_by_id(budget_id)
+        if not budget:
+            raise NotFoundError("Budget not found")
+        return (await self._project([budget], today or datetime.utcnow().date()))[0]
+
+    async def project_active_budgets(self, user_id: str, today: date | None = None) -> List[BudgetProjection]:
+        """Return projections for every budget active today, sharing one aggregation."""
+
+        today = today or datetime.utcnow().date()
+        budgets = await self.repository.list_active(user_id, today)
+        if not budgets:
+            return []
+        return await self._project(budgets, today)
+
+    async def _project(self, budgets: List[BudgetModel], today: date) -> List[BudgetProjection]:
+        """Build the spend matrix for the budgets and project it vectorized."""
+
+        import numpy as np
+
+        start = min(budget.period_start for budget in budgets)
+        end = max(budget.period_end for budget in budgets) + timedelta(days=1)
+        series = await self.transaction_repository.daily_spend(
+            budgets[0].user_id,
+            {budget.category for budget in budgets},
+            datetime.combine(start, datetime.min.time()),
+            datetime.combine(end, datetime.min.time()),
+        )
+
+        total_days = np.array([(b.period_end - b.period_start).days + 1 for b in budgets], dtype=np.int64)
+        elapsed_days = np.clip(
+            np.array([(today - b.period_start).days + 1 for b in budgets], dtype=np.int64),
+            0,
+            total_days,
+        )
+        matrix = np.zeros((len(budgets), int(total_days.max())))
+        for row, budget in enumerate(budgets):
+            for day, amount in series.get(budget.category, {}).items():
+                offset = (day - budget.period_start).days
+                if 0 <= offset < total_days[row]:
+                    matrix[row, offset] += amount
+        spent, average, projected = project_period_spend(matrix, elapsed_days, total_days)
+
+        return [
+            BudgetProjection(
+                budget_id=budget.id,
+                category=budget.category,
+                limit_amount=budget.limit_amount,
+                period_start=budget.period_start,
+                period_end=budget.period_end,
+                elapsed_days=int(elapsed_days[row]),
+                total_days=int(total_days[row]),
+                spent_to_date=round(float(spent[row]), 2),
+                daily_average=round(float(average[row]), 2),
+                projected_spend=round(float(projected[row]), 2),
+                projected_remaining=round(max(budget.limit_amount - float(projected[row]), 0.0), 2),
+                projected_status=budget.model_copy(update={"amount_spent": float(projected[row])}).status,
+                daily_spend=[round(float(value), 2) for value in matrix[row, : elapsed_days[row]]],
+            )
+            for row, budget in enumerate(budgets)
+        ]
@@ -2,20 +2,27 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence
 
-from src.models import GoalCreate, GoalModel, GoalStatus, GoalUpdate
+from src.models import EntityBatch, GoalCreate, GoalModel, GoalStatus, GoalUpdate, GoalWithAccount
 from src.repositories import AccountRepository, GoalRepository
 
 from .exceptions import BusinessRuleError, NotFoundError
+from .invalidation import Invalidator
 
 
 class GoalService:
     """Service coordinating goal operations with accounts."""
 
-    def __init__(self, repository: GoalRepository, account_repository: AccountRepository) -> None:
+    def __init__(
+        self,
+        repository: GoalRepository,
+        account_repository: AccountRepository,
+        invalidator: Optional[Invalidator] = None,
+    ) -> None:
         self.repository = repository
         self.account_repository = account_repository
+        self.invalidator = invalidator or Invalidator()
 
     async def create_goal(self, payload: GoalCreate) -> GoalModel:
         """Create a new goal ensuring the account exists."""
@@ -25,7 +32,9 @@ class GoalService:
             raise NotFoundError("Account not found for goal")
         if account.user_id != payload.user_id:
             raise BusinessRuleError("Goal account mismatch")
-        return await self.repository.create(payload.model_dump())
+        goal = await self.repository.create(payload.model_dump())
+        await self.invalidator.invalidate(payload.user_id)
+        return goal
 
     async def list_goals(self, user_id: str) -> List[GoalModel]:
         """Return all goals for a user."""
@@ -40,6 +49,25 @@ class GoalService:
             raise NotFoundError("Goal not found")
         return goal
 
+    async def get_goals(self, goal_ids: Sequence[str]) -> EntityBatch[GoalModel]:
+        """Return the goals with the given ids in that order, listing the ids not found."""
+
+        items, missing_ids = await self.repository.get_many(goal_ids)
+        return EntityBatch[GoalModel](items=items, missing_ids=missing_ids)
+
+    async def list_goals_with_account(self, user_id: str) -> List[GoalWithAccount]:
+        """Return all goals for a user joined with their account balances."""
+
+        return await self.repository.list_with_account({"user_id": user_id})
+
+    async def get_goal_with_account(self, goal_id: str) -> GoalWithAccount:
+        """Fetch goal joined with its account or raise."""
+
+        goal = await self.repository.get_with_account(goal_id)
+        if not goal:
+            raise NotFoundError("Goal not found")
+        return goal
+
     async def update_goal(self, goal_id: str, payload: GoalUpdate) -> GoalModel:
         """Update goal fields."""
 
@@ -47,6 +75,7 @@ class GoalService:
         updated = await self.repository.update(goal_id, data)
         if not updated:
             raise NotFoundError("Goal not found")
+        await self.invalidator.invalidate(updated.user_id)
         return updated
 
     async def delete_goal(self, goal_id: str) -> bool:
@@ -58,6 +87,8 @@ class GoalService:
         deleted = await self.repository.delete(goal_id)
         if deleted and goal.lock_funds and goal.reserved_amount:
             await self.account_repository.update_goal_lock(goal.account_id, -goal.reserved_amount)
+        if deleted:
+            await self.invalidator.invalidate(goal.user_id)
         return deleted
 
     async def apply_contribution(self, goal_id: str, amount: float) -> GoalModel:
@@ -80,4 +111,10 @@ class GoalService:
                 release_amount = updated_goal.reserved_amount
                 await self.repository.adjust_reserved(goal_id, -release_amount)
                 await self.account_repository.update_goal_lock(goal.account_id, -release_amount)
+        await self.invalidator.invalidate(goal.user_id)
         return await self.get_goal(goal_id)
+
+    async def data_version(self, user_id: str, max_age: float = 0.0) -> Optional[int]:
+        """Return the user's data version for conditional GETs, ``None`` without a version store."""
+
+        return await self.invalidator.data_version(user_id, max_age=max_age)
@@ -0,0 +1,59 @@
+"""Invalidation of the per-user artifacts derived from a user's data."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from src.repositories import AbstractRepository, DataVersionRepository
+from src.utils import ResultCache, SingleFlight
+
+
+class Invalidator:
+    """Invalidates everything derived from a user's data once the user writes.
+
+    One instance is shared by every service that writes, so a write through any of
+    them bumps the persisted data version (conditional GETs, statement and report
+    caches), makes the user's cached results unreachable and detaches the user's
+    queries in flight. Reads go through the same ``result_cache`` and
+    ``single_flight``. Every collaborator is optional; without any, invalidating is
+    a no-op.
+    """
+
+    def __init__(
+        self,
+        version_repository: Optional[DataVersionRepository] = None,
+        result_cache: Optional[ResultCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ) -> None:
+        self.version_repository = version_repository
+        self.result_cache = result_cache
+        self.single_flight = single_flight
+
+    @property
+    def enabled(self) -> bool:
+        return self.version_repository is not None or self.result_cache is not None or self.single_flight is not None
+
+    async def owner_of(self, repository: AbstractRepository, entity_id: str) -> Optional[str]:
+        """Return the owner of a document about to be deleted, when there is anything to invalidate."""
+
+        if not self.enabled:
+            return None
+        existing = await repository.get_by_id(entity_id)
+        return existing.user_id if existing is not None else None
+
+    async def invalidate(self, user_id: str) -> None:
+        """Invalidate the user's cached results, queries in flight and data version."""
+
+        if self.result_cache is not None:
+            self.result_cache.invalidate(user_id)
+        if self.single_flight is not None:
+            self.single_flight.invalidate(user_id)
+        if self.version_repository is not None:
+            await self.version_repository.bump(user_id)
+
+    async def data_version(self, user_id: str, max_age: float = 0.0) -> Optional[int]:
+        """Return the user's data version for conditional GETs, ``None`` without a version store."""
+
+        if self.version_repository is None:
+            return None
+        return await self.version_repository.get_version(user_id, max_age=max_age)
@@ -0,0 +1,217 @@
+"""Asynchronous report jobs: enqueueing, status tracking and background workers."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from config.settings import get_settings
+from src.models import ReportJobCreate, ReportJobKind, ReportJobModel, ReportJobStatus, ReportPayload
+from src.repositories import ReportJobRepository
+from src.utils import get_logger, get_throttled_logger
+
+from .exceptions import BusinessRuleError, NotFoundError, ValidationError
+from .reports import ReportService
+from .statements import StatementService
+
+ProgressCallback = Callable[[int], Awaitable[None]]
+
+
+class ReportJobService:
+    """Enqueues report jobs and exposes their state to the API."""
+
+    def __init__(self, repository: ReportJobRepository) -> None:
+        self.repository = repository
+
+    async def enqueue(self, payload: ReportJobCreate) -> ReportJobModel:
+        """Queue a new report job respecting the per-user backlog limit."""
+
+        if payload.kind == ReportJobKind.MONTHLY_STATEMENT and payload.month is None:
+            raise ValidationError("Monthly statement jobs require a month")
+        pending = await self.repository.count_by_status(
+            payload.user_id, (ReportJobStatus.QUEUED, ReportJobStatus.RUNNING)
+        )
+        if pending >= get_settings().report_jobs_max_pending_per_user:
+            raise BusinessRuleError("Too many pending report jobs for user")
+        return await self.repository.create(
+            {**payload.model_dump(), "status": ReportJobStatus.QUEUED.value, "progress": 0}
+        )
+
+    async def get_job(self, job_id: str) -> ReportJobModel:
+        """Return job by id or raise."""
+
+        job = await self.repository.get_by_id(job_id)
+        if not job:
+            raise NotFoundError("Report job not found")
+        return job
+
+    async def get_download_path(self, job_id: str) -> Path:
+        """Return the generated file of a completed job."""
+
+        job = await self.get_job(job_id)
+        if job.status != ReportJobStatus.COMPLETED or job.report is None:
+            raise BusinessRuleError(f"Report job is {job.status.value}")
+        path = Path(job.report.file_path)
+        if not path.exists():
+            raise NotFoundError("Report file no longer available")
+        return path
+
+
+class ReportJobWorker:
+    """Pool of asyncio workers claiming jobs from the shared Mongo queue.
+
+    The number of workers bounds concurrency for this process and
+    ``report_jobs_per_user`` bounds how many jobs of a single user run at once.
+    A claimed job carries a lease that the worker renews while it runs. Jobs of a
+    worker that is stopped go back to the queue; jobs of a worker that crashed are
+    claimed again once their lease expires, up to ``report_job_max_attempts`` times.
+    """
+
+    def __init__(
+        self,
+        repository: ReportJobRepository,
+        report_service: ReportService,
+        statement_service: Optional[StatementService] = None,
+    ) -> None:
+        self.repository = repository
+        self.report_service = report_service
+        self.statement_service = statement_service
+        self.settings = get_settings()
+        self.logger = get_logger("report_jobs")
+        # Every idle worker polls once per interval, so an unreachable database would flood the log.
+        self.poll_logger = get_throttled_logger("report_jobs", per_second=0.1)
+        self._runners: dict[ReportJobKind, Callable[[ReportJobModel, ProgressCallback], Awaitable[ReportPayload]]] = {
+            ReportJobKind.TRANSACTIONS_CSV: self._export_transactions,
+        }
+        if statement_service is not None:
+            self._runners[ReportJobKind.MONTHLY_STATEMENT] = self._monthly_statement
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        """Spawn the worker tasks."""
+
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"report-job-worker-{index}")
+            for index in range(max(self.settings.report_job_workers, 1))
+        ]
+
+    async def stop(self) -> None:
+        """Ask workers to finish and wait for them."""
+
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def claim_next(self) -> Optional[ReportJobModel]:
+        """Claim the oldest queued job whose user is below the per-user limit.
+
+        The running counts read up front only skip users that are already saturated.
+        Other workers may claim concurrently, so the user's count is checked again
+        once the claim is written. When it is over the limit, the claim is given back
+        and another user's job is tried. Racing workers can both give theirs back, but
+        never both keep them.
+        """
+
+        limit = self.settings.report_jobs_per_user
+        running = await self.repository.running_by_user()
+        saturated = {user for user, count in running.items() if count >= limit}
+        while True:
+            job = await self.repository.claim_next(self.settings.report_job_lease_seconds, exclude_users=saturated)
+            if job is None:
+                return None
+            if job.attempts > self.settings.report_job_max_attempts:
+                # Its worker died every time it ran; stop retrying it.
+                await self.repository.fail(
+                    job.id, f"Abandoned after {job.attempts - 1} attempts", claim_token=job.claim_token
+                )
+                continue
+            if await self.repository.count_running(job.user_id) <= limit:
+                return job
+            await self.repository.requeue(job.id, job.claim_token, count_attempt=False)
+            saturated.add(job.user_id)
+
+    async def process(self, job: ReportJobModel) -> None:
+        """Run a claimed job and persist its outcome."""
+
+        async def report_progress(rows: int) -> None:
+            await self.repository.set_progress(job.id, rows, claim_token=job.claim_token)
+
+        runner = self._runners.get(job.kind)
+        if runner is None:
+            error = f"No worker handles {job.kind.value} reports"
+            await self.repository.fail(job.id, error, claim_token=job.claim_token)
+            return
+        heartbeat = asyncio.create_task(self._keep_lease(job))
+        try:
+            payload = await runner(job, report_progress)
+        except asyncio.CancelledError:
+            # The worker is stopping: hand the job to the next worker instead of leaving it running.
+            await self.repository.requeue(job.id, job.claim_token)
+            raise
+        except Exception as exc:  # noqa: BLE001 - failures are recorded on the job
+            self.logger.exception("Report job {job_id} failed", job_id=job.id)
+            await self.repository.fail(job.id, str(exc), claim_token=job.claim_token)
+            return
+        finally:
+            heartbeat.cancel()
+        await self.repository.complete(job.id, payload, claim_token=job.claim_token)
+
+    async def run_pending(self) -> int:
+        """Process queued jobs until none can be claimed; returns how many ran."""
+
+        processed = 0
+        while (job := await self.claim_next()) is not None:
+            await self.process(job)
+            processed += 1
+        return processed
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self.claim_next()
+            except Exception:  # noqa: BLE001 - keep the worker alive on transient errors
+                self.poll_logger.exception("Failed to claim report job")
+                job = None
+            if job is not None:
+                await self.process(job)
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.settings.report_job_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _keep_lease(self, job: ReportJobModel) -> None:
+        lease_seconds = self.settings.report_job_lease_seconds
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                renewed = await self.repository.renew_lease(job.id, job.claim_token, lease_seconds)
+            except Exception:  # noqa: BLE001 - the next beat retries before the lease runs out
+                self.poll_logger.exception("Failed to renew the lease of report job {job_id}", job_id=job.id)
+                continue
+            if not renewed:
+                self.logger.warning("Report job {job_id} was taken over by another worker", job_id=job.id)
+                return
+
+    async def _export_transactions(self, job: ReportJobModel, on_progress: ProgressCallback) -> ReportPayload:
+        total = await self.report_service.repository.count({"user_id": job.user_id})
+        await self.repository.set_progress(job.id, 0, total=total, claim_token=job.claim_token)
+        return await self.report_service.export_transactions(job.user_id, on_progress=on_progress)
+
+    async def _monthly_statement(self, job: ReportJobModel, on_progress: ProgressCallback) -> ReportPayload:
+        statement = await self.statement_service.monthly_statement(job.user_id, job.month, render_csv=True)
+        rows = sum(line.count for line in statement.categories)
+        await on_progress(rows)
+        return ReportPayload(
+            generated_at=statement.generated_at,
+            file_path=statement.file_path,
+            total_transactions=rows,
+            total_expenses=statement.total_expenses,
+            total_income=statement.total_income,
+            bytes_written=Path(statement.file_path).stat().st_size,
+        )
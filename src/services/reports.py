@@ -2,20 +2,181 @@
 
 from __future__ import annotations
 
-from src.models import ReportPayload, TransactionModel
-from src.repositories import TransactionRepository
-from src.utils import FileManager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Optional
+
+from config.settings import get_settings
+from src.models import ExportFormat, ExportWatermark, IncrementalReportPayload, ReportPayload, TransactionModel
+from src.repositories import DataVersionRepository, ExportWatermarkRepository, TransactionRepository
+from src.utils import FileManager, run_in_export_pool
+
+from .exceptions import ServiceError
+
+
+class _WatermarkTracker:
+    """Tracks the newest ``(changed_at, id)`` position among exported rows.
+
+    Rows re-read from the overlap window are skipped when the previous export already
+    wrote them at the same change time, so only late commits come through again. Rows
+    exported by this run are only remembered while they are inside the trailing overlap
+    window, so memory follows the window rather than the size of the export.
+    """
+
+    # Rows remembered before the first pass dropping those behind the window.
+    PRUNE_AFTER = 1024
+
+    def __init__(self, previous: Optional[ExportWatermark], overlap: timedelta) -> None:
+        self.changed_at: Optional[datetime] = previous.changed_at if previous else None
+        self.last_id: Optional[str] = previous.last_id if previous else None
+        self.overlap = overlap
+        self.exported = 0
+        self._previous: dict[str, datetime] = dict(previous.overlap_ids) if previous else {}
+        self._recent: dict[str, datetime] = {}
+        self._prune_at = self.PRUNE_AFTER
+
+    async def track(self, transactions: AsyncIterable[TransactionModel]) -> AsyncIterator[TransactionModel]:
+        async for tx in transactions:
+            changed_at = tx.updated_at or tx.created_at
+            if changed_at in (self._previous.get(tx.id), self._recent.get(tx.id)):
+                continue
+            self._recent[tx.id] = changed_at
+            self.exported += 1
+            if self.changed_at is None or (changed_at, tx.id) > (self.changed_at, self.last_id):
+                self.changed_at, self.last_id = changed_at, tx.id
+            if len(self._recent) >= self._prune_at:
+                # Rows arrive by id, not by time, so prune in passes rather than per row.
+                self._recent = self._within_overlap(self._recent)
+                self._prune_at = max(2 * len(self._recent), self.PRUNE_AFTER)
+            yield tx
+
+    def overlap_ids(self) -> dict[str, datetime]:
+        """Return the exported rows the next export will find again in its overlap window."""
+
+        return self._within_overlap({**self._previous, **self._recent})
+
+    def _within_overlap(self, rows: dict[str, datetime]) -> dict[str, datetime]:
+        start = self.changed_at - self.overlap
+        return {tx_id: changed_at for tx_id, changed_at in rows.items() if changed_at > start}
+
+
+async def _prepend(first: TransactionModel, rest: AsyncIterator[TransactionModel]) -> AsyncIterator[TransactionModel]:
+    yield first
+    async for tx in rest:
+        yield tx
 
 
 class ReportService:
     """Generates file based reports for the API."""
 
-    def __init__(self, repository: TransactionRepository, file_manager: FileManager | None = None) -> None:
+    def __init__(
+        self,
+        repository: TransactionRepository,
+        file_manager: FileManager | None = None,
+        watermark_repository: ExportWatermarkRepository | None = None,
+        version_repository: DataVersionRepository | None = None,
+    ) -> None:
         self.repository = repository
         self.file_manager = file_manager or FileManager()
+        self.watermark_repository = watermark_repository
+        self.version_repository = version_repository
+
+    async def export_transactions(
+        self,
+        user_id: str,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        export_format: ExportFormat = ExportFormat.CSV,
+    ) -> ReportPayload:
+        """Export all transactions for a user without blocking the event loop.
+
+        When a data version repository is configured the report is cached per user,
+        version and format, so repeated exports reuse the file until a transaction changes.
+        """
+
+        chunk_size = get_settings().export_chunk_size
+        if self.version_repository is None:
+            transactions = self.repository.iterate({"user_id": user_id}, batch_size=chunk_size)
+            return await self.file_manager.export_transactions_async(
+                transactions,
+                chunk_size=chunk_size,
+                on_progress=on_progress,
+                export_format=export_format,
+            )
+
+        version = await self.version_repository.get_version(user_id)
+        key = FileManager.cache_key("transactions", user_id, version, export_format.value)
+        cached = await self.file_manager.load_cached_report(key, export_format)
+        if cached is not None:
+            return cached
+        transactions = self.repository.iterate({"user_id": user_id}, batch_size=chunk_size)
+        return await self.file_manager.export_transactions_cached(
+            key,
+            transactions,
+            chunk_size=chunk_size,
+            on_progress=on_progress,
+            export_format=export_format,
+        )
+
+    async def export_incremental(self, user_id: str, append: bool = True) -> IncrementalReportPayload:
+        """Export only transactions changed since the user's last watermark.
+
+        With ``append`` the rows are added to the previous export file; updated rows are
+        written again, so consumers should keep the last row seen for each id.
+
+        Timestamps come from the application clocks, so a write can commit after an
+        export already moved past its timestamp. Each export therefore re-reads the
+        ``export_watermark_overlap_seconds`` before the watermark and skips the rows
+        the previous one already wrote. Writes committing later than that window are
+        missed.
+        """
+
+        if self.watermark_repository is None:
+            raise ServiceError("Incremental exports are not configured")
+        settings = get_settings()
+        watermark = await self.watermark_repository.get_for_user(user_id)
+        since = watermark.changed_at if watermark else None
+        previous_file = Path(watermark.file_path) if watermark and watermark.file_path else None
+        chunk_size = settings.export_chunk_size
+        overlap = timedelta(seconds=settings.export_watermark_overlap_seconds)
+        tracker = _WatermarkTracker(watermark, overlap)
+        if since is not None and overlap:
+            changes = self.repository.iterate_changed_since(user_id, since=since - overlap, batch_size=chunk_size)
+        else:
+            changes = self.repository.iterate_changed_since(
+                user_id,
+                since=since,
+                after_id=watermark.last_id if watermark else None,
+                batch_size=chunk_size,
+            )
+        rows = tracker.track(changes)
+        first = await anext(rows, None)
+        previous_exists = previous_file is not None and await run_in_export_pool(previous_file.exists)
+        if first is None:
+            # Nothing changed: polling must not leave a header-only file behind on every call.
+            return IncrementalReportPayload(
+                generated_at=datetime.utcnow(),
+                file_path=str(previous_file) if previous_exists else None,
+                total_transactions=0,
+                total_expenses=0.0,
+                total_income=0.0,
+                since=since,
+            )
+        reuse_file = append and previous_exists
+        report = await self.file_manager.export_transactions_async(
+            _prepend(first, rows),
+            chunk_size=chunk_size,
+            file_path=previous_file if reuse_file else None,
+            append=reuse_file,
+        )
+        if tracker.exported:
+            await self.watermark_repository.save(
+                user_id, tracker.changed_at, tracker.last_id, report.file_path, tracker.overlap_ids()
+            )
+        return IncrementalReportPayload(**report.model_dump(), since=since, appended=reuse_file)
 
-    async def export_transactions(self, user_id: str) -> ReportPayload:
-        """Export all transactions for a user to CSV."""
+    def stream_transactions(self, user_id: str) -> AsyncIterator[str]:
+        """Stream all transactions for a user as CSV chunks without buffering them."""
 
-        transactions = await self.repository.list({"user_id": user_id})
-        return self.file_manager.export_transactions(transactions)
+        chunk_size = get_settings().export_chunk_size
+        transactions = self.repository.iterate({"user_id": user_id}, batch_size=chunk_size)
+        return self.file_manager.stream_transactions_csv(transactions, chunk_size=chunk_size)
@@ -0,0 +1,136 @@
+"""Monthly statements built from a single aggregation over the user's data."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from config.settings import get_settings
+from src.models import (
+    BudgetModel,
+    MonthlyStatement,
+    StatementAccountLine,
+    StatementBudgetLine,
+    StatementCategoryLine,
+    TransactionType,
+)
+from src.repositories import DataVersionRepository, TransactionRepository
+from src.utils import FileManager, run_in_export_pool
+
+from .exceptions import ValidationError
+
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """Return the first and last day of a ``YYYY-MM`` month."""
+
+    try:
+        first_day = datetime.strptime(month, "%Y-%m").date()
+    except ValueError as exc:
+        raise ValidationError("Month must use the YYYY-MM format") from exc
+    next_month = (first_day + timedelta(days=32)).replace(day=1)
+    return first_day, next_month - timedelta(days=1)
+
+
+class StatementService:
+    """Builds monthly statements, cached until the user's data version changes.
+
+    The cache belongs to the instance, so each application container owns its own.
+    """
+
+    def __init__(
+        self,
+        transaction_repository: TransactionRepository,
+        version_repository: Optional[DataVersionRepository] = None,
+        file_manager: FileManager | None = None,
+    ) -> None:
+        self.transaction_repository = transaction_repository
+        self.version_repository = version_repository
+        self.file_manager = file_manager or FileManager()
+        self.settings = get_settings()
+        self._cache: OrderedDict[tuple[str, str], tuple[int, MonthlyStatement]] = OrderedDict()
+
+    async def monthly_statement(self, user_id: str, month: str, render_csv: bool = False) -> MonthlyStatement:
+        """Return the statement of a month, optionally rendered to a CSV file."""
+
+        first_day, last_day = month_bounds(month)
+        key = (user_id, month)
+        version = await self.version_repository.get_version(user_id) if self.version_repository else None
+        cached = self._cache.get(key)
+        if version is not None and cached is not None and cached[0] == version:
+            self._cache.move_to_end(key)
+            statement = cached[1]
+        else:
+            statement = await self._build(user_id, month, first_day, last_day)
+            if version is not None:
+                self._cache[key] = (version, statement)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.settings.statement_cache_size:
+                    self._cache.popitem(last=False)
+
+        if render_csv:
+            file_path = await run_in_export_pool(self.file_manager.write_statement_csv, statement)
+            statement = statement.model_copy(update={"file_path": str(file_path)})
+        return statement
+
+    async def _build(self, user_id: str, month: str, first_day: date, last_day: date) -> MonthlyStatement:
+        data = await self.transaction_repository.monthly_statement(
+            user_id,
+            datetime.combine(first_day, datetime.min.time()),
+            datetime.combine(last_day + timedelta(days=1), datetime.min.time()),
+            first_day,
+            last_day,
+        )
+        categories = sorted(
+            (
+                StatementCategoryLine(
+                    category=row["category"],
+                    type=row["type"],
+                    total=round(row["total"], 2),
+                    count=row["count"],
+                )
+                for row in data["pivot"]
+            ),
+            key=lambda line: (line.category, line.type.value),
+        )
+
+        accounts = []
+        for account in data["accounts"]:
+            flow = data["flows"].get(account["account_id"], {"inflow": 0.0, "outflow": 0.0, "after": 0.0})
+            closing = account["balance"] - flow["after"]
+            accounts.append(
+                StatementAccountLine(
+                    account_id=account["account_id"],
+                    name=account["name"],
+                    opening_balance=round(closing - flow["inflow"] + flow["outflow"], 2),
+                    inflow=round(flow["inflow"], 2),
+                    outflow=round(flow["outflow"], 2),
+                    closing_balance=round(closing, 2),
+                )
+            )
+
+        budgets = []
+        for row in data["budgets"]:
+            fields = {key: value for key, value in row.items() if key != "budget_id"}
+            budget = BudgetModel(id=row["budget_id"], user_id=user_id, **fields)
+            budgets.append(
+                StatementBudgetLine(
+                    budget_id=budget.id,
+                    category=budget.category,
+                    limit_amount=budget.limit_amount,
+                    amount_spent=budget.amount_spent,
+                    usage_percent=round(budget.amount_spent / budget.limit_amount * 100, 1),
+                    status=budget.status,
+                )
+            )
+
+        return MonthlyStatement(
+            user_id=user_id,
+            month=month,
+            generated_at=datetime.utcnow(),
+            total_income=round(sum(line.total for line in categories if line.type == TransactionType.INCOME), 2),
+            total_expenses=round(sum(line.total for line in categories if line.type == TransactionType.EXPENSE), 2),
+            categories=categories,
+            accounts=accounts,
+            budgets=budgets,
+        )
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence
 
 from src.models import (
     BudgetModel,
+    EntityBatch,
     TransactionCreate,
     TransactionFilter,
     TransactionModel,
@@ -13,9 +14,11 @@ from src.models import (
     TransactionUpdate,
 )
 from src.repositories import AccountRepository, TransactionRepository, UserRepository
+from src.utils import cached_or_compute
 
 from .exceptions import BusinessRuleError, NotFoundError
 from .goals import GoalService
+from .invalidation import Invalidator
 from .budgets import BudgetService
 
 
@@ -29,12 +32,14 @@ class TransactionService:
         user_repository: UserRepository,
         budget_service: BudgetService,
         goal_service: GoalService,
+        invalidator: Optional[Invalidator] = None,
     ) -> None:
         self.repository = repository
         self.account_repository = account_repository
         self.user_repository = user_repository
         self.budget_service = budget_service
         self.goal_service = goal_service
+        self.invalidator = invalidator or Invalidator()
 
     async def create_transaction(self, payload: TransactionCreate) -> TransactionModel:
         """Validate and persist a new transaction."""
@@ -70,6 +75,7 @@ class TransactionService:
             await self.goal_service.apply_contribution(payload.goal_id, payload.amount)
 
         transaction = await self.repository.create(payload.model_dump())
+        await self.invalidator.invalidate(payload.user_id)
         return transaction
 
     async def _get_budget(self, payload: TransactionCreate, skip_budget: bool) -> BudgetModel | None:
@@ -98,6 +104,12 @@ class TransactionService:
             raise NotFoundError("Transaction not found")
         return transaction
 
+    async def get_transactions(self, transaction_ids: Sequence[str]) -> EntityBatch[TransactionModel]:
+        """Return the transactions with the given ids in that order, listing the ids not found."""
+
+        items, missing_ids = await self.repository.get_many(transaction_ids)
+        return EntityBatch[TransactionModel](items=items, missing_ids=missing_ids)
+
     async def update_transaction(self, transaction_id: str, payload: TransactionUpdate) -> TransactionModel:
         """Update mutable fields of a transaction."""
 
@@ -105,17 +117,27 @@ class TransactionService:
         updated = await self.repository.update(transaction_id, data)
         if not updated:
             raise NotFoundError("Transaction not found")
+        await self.invalidator.invalidate(updated.user_id)
         return updated
 
     async def delete_transaction(self, transaction_id: str) -> bool:
         """Delete a transaction by id."""
 
+        owner = await self.invalidator.owner_of(self.repository, transaction_id)
         deleted = await self.repository.delete(transaction_id)
         if not deleted:
             raise NotFoundError("Transaction not found")
+        if owner is not None:
+            await self.invalidator.invalidate(owner)
         return deleted
 
     async def search_transactions(self, filters: TransactionFilter) -> List[TransactionModel]:
         """Perform filtered search with ordering."""
 
-        return await self.repository.search(filters)
+        return await cached_or_compute(
+            self.invalidator.result_cache,
+            filters.user_id,
+            "transactions.search",
+            filters,
+            lambda: self.repository.search(filters),
+        )
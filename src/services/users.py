@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Sequence
 
-from src.models import UserCreate, UserModel, UserUpdate
+from src.models import EntityBatch, UserCreate, UserModel, UserUpdate
 from src.repositories import UserRepository
 
 from .exceptions import BusinessRuleError, NotFoundError
@@ -37,6 +37,12 @@ class UserService:
             raise NotFoundError("User not found")
         return user
 
+    async def get_users(self, user_ids: Sequence[str]) -> EntityBatch[UserModel]:
+        """Return the users with the given ids in that order, listing the ids not found."""
+
+        items, missing_ids = await self.repository.get_many(user_ids)
+        return EntityBatch[UserModel](items=items, missing_ids=missing_ids)
+
     async def update_user(self, user_id: str, payload: UserUpdate) -> UserModel:
         """Update user properties."""
 
@@ -1,8 +1,70 @@
-"""Utility helpers for logging, configuration, and persistence."""
+"""Utility helpers for logging, configuration, and persistence.
 
-from .database import get_database
-from .file_manager import FileManager
-from .logger import get_logger
-from .serializers import serialize_document
+Names are resolved from their submodules on first access, so importing one helper
+(say, the metrics registry) does not pull in motor, loguru or the file exporters.
+"""
 
-__all__ = ["get_database", "FileManager", "get_logger", "serialize_document"]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .database import close_client, get_database, warm_up_client
+    from .executors import (
+        export_slot,
+        get_batch_export_pool,
+        run_in_export_pool,
+        run_in_process_pool,
+        shutdown_executors,
+        spawn_process_pool,
+    )
+    from .file_manager import FileManager
+    from .logger import flush_logs, get_logger, get_throttled_logger
+    from .metrics import REGISTRY, MetricsRegistry, render_metrics
+    from .result_cache import ResultCache, cached_or_compute
+    from .single_flight import SingleFlight, coalesced
+    from .serializers import API_CODEC_OPTIONS, decode_document, serialize_document
+
+_EXPORTS = {
+    "API_CODEC_OPTIONS": "serializers",
+    "cached_or_compute": "result_cache",
+    "close_client": "database",
+    "coalesced": "single_flight",
+    "decode_document": "serializers",
+    "export_slot": "executors",
+    "get_batch_export_pool": "executors",
+    "get_database": "database",
+    "FileManager": "file_manager",
+    "flush_logs": "logger",
+    "get_logger": "logger",
+    "get_throttled_logger": "logger",
+    "MetricsRegistry": "metrics",
+    "REGISTRY": "metrics",
+    "render_metrics": "metrics",
+    "ResultCache": "result_cache",
+    "run_in_export_pool": "executors",
+    "run_in_process_pool": "executors",
+    "serialize_document": "serializers",
+    "shutdown_executors": "executors",
+    "SingleFlight": "single_flight",
+    "spawn_process_pool": "executors",
+    "warm_up_client": "database",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule that defines ``name`` and cache the attribute."""
+
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
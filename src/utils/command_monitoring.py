@@ -0,0 +1,266 @@
+"""Per-collection Mongo command metrics and a slow-query log fed by pymongo command events."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from bson import encode as bson_encode
+from pymongo import monitoring
+
+from .logger import get_throttled_logger
+from .metrics import REGISTRY
+
+COMMAND_DURATION = REGISTRY.histogram(
+    "mongodb_command_duration_seconds",
+    "Server round trip time of Mongo commands.",
+    ("collection", "command", "outcome"),
+)
+COMMAND_DOCUMENTS = REGISTRY.counter(
+    "mongodb_command_documents_total",
+    "Documents returned (reads) or affected (writes) by Mongo commands.",
+    ("collection", "command"),
+)
+COMMAND_REPLY_BYTES = REGISTRY.counter(
+    "mongodb_command_reply_bytes_total",
+    "BSON size of Mongo command replies.",
+    ("collection", "command"),
+)
+SLOW_COMMANDS = REGISTRY.counter(
+    "mongodb_slow_commands_total",
+    "Mongo commands slower than the slow-query threshold.",
+    ("collection", "command"),
+)
+
+# Commands whose first field names the collection they run against.
+_COLLECTION_COMMANDS = frozenset(
+    {"find", "aggregate", "count", "distinct", "insert", "update", "delete", "findAndModify", "findandmodify"}
+)
+_EXPLAINABLE_COMMANDS = frozenset({"find", "aggregate", "count", "distinct"})
+# Session and cluster bookkeeping pymongo adds to every command; explain rejects or ignores them.
+_DRIVER_FIELDS = frozenset({"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"})
+_MAX_EXPLAINED_SHAPES = 1024
+
+ExplainRunner = Callable[[str, dict], dict]
+
+
+def query_shape(value: Any) -> Any:
+    """Replace literal values with ``"?"`` while keeping field names and operators."""
+
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Operators such as $and/$or hold sub-queries; $in and friends hold literals.
+        return [query_shape(item) for item in value] if any(isinstance(item, dict) for item in value) else "?"
+    return "?"
+
+
+def command_filter(command_name: str, command: dict) -> Optional[dict]:
+    """Return the query part of a command, if it has one."""
+
+    if command_name in ("find", "count", "distinct"):
+        return command.get("filter", command.get("query"))
+    if command_name.lower() == "findandmodify":
+        return command.get("query")
+    if command_name == "aggregate":
+        for stage in command.get("pipeline", []):
+            if "$match" in stage:
+                return stage["$match"]
+        return None
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        return statements[0].get("q")
+    return None
+
+
+def _collection(command_name: str, command: dict) -> str:
+    if command_name == "getMore":
+        return str(command.get("collection", ""))
+    if command_name in _COLLECTION_COMMANDS:
+        return str(command.get(command_name, ""))
+    return ""
+
+
+def _reply_documents(command_name: str, reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if command_name in ("insert", "update", "delete", "count"):
+        return int(reply.get("n", 0))
+    if command_name == "distinct":
+        return len(reply.get("values", []))
+    return 0
+
+
+def summarize_plan(explain: dict) -> dict[str, Any]:
+    """Extract the stages and indexes of the winning plan from ``explain`` output."""
+
+    stages: list[str] = []
+    indexes: list[str] = []
+
+    def find_plan(node: Any) -> Optional[dict]:
+        if isinstance(node, dict):
+            if isinstance(node.get("winningPlan"), dict):
+                return node["winningPlan"]
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            return None
+        for child in children:
+            plan = find_plan(child)
+            if plan is not None:
+                return plan
+        return None
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if "stage" in node:
+                stages.append(node["stage"])
+            if "indexName" in node:
+                indexes.append(node["indexName"])
+            for child in node.values():
+                walk(child)
+        elif isinstance(node, list):
+            for child in node:
+                walk(child)
+
+    walk(find_plan(explain))
+    return {"stages": stages, "indexes": indexes, "collection_scan": "COLLSCAN" in stages}
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records command latency, documents and reply sizes and logs slow commands.
+
+    pymongo calls the listener from the thread running the command, so state shared
+    between the started and finished events is guarded by a lock. When
+    ``explain_runner`` is given, each slow query shape is explained once on a
+    background thread and its winning plan is logged.
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float,
+        measure_reply_bytes: bool = False,
+        explain_runner: Optional[ExplainRunner] = None,
+        explain_executor: Optional[Executor] = None,
+    ) -> None:
+        self.slow_threshold_us = slow_threshold_ms * 1000
+        self.measure_reply_bytes = measure_reply_bytes
+        self.explain_runner = explain_runner
+        self._explain_executor = explain_executor
+        self._explained: set[str] = set()
+        self._pending: dict[tuple[Any, int], tuple[str, dict]] = {}
+        self._lock = threading.Lock()
+        self.logger = get_throttled_logger("mongodb", per_second=5)
+
+    def started(self, event) -> None:
+        if event.command_name not in _COLLECTION_COMMANDS and event.command_name != "getMore":
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event) -> None:
+        self._finish(event, "success", event.reply)
+
+    def failed(self, event) -> None:
+        self._finish(event, "failure", None)
+
+    def _finish(self, event, outcome: str, reply: Optional[dict]) -> None:
+        with self._lock:
+            started = self._pending.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        database_name, command = started
+        name = event.command_name
+        collection = _collection(name, command)
+        seconds = event.duration_micros / 1_000_000
+        COMMAND_DURATION.observe(seconds, collection=collection, command=name, outcome=outcome)
+        if reply is not None:
+            COMMAND_DOCUMENTS.inc(_reply_documents(name, reply), collection=collection, command=name)
+            if self.measure_reply_bytes:
+                COMMAND_REPLY_BYTES.inc(len(bson_encode(reply)), collection=collection, command=name)
+        if event.duration_micros >= self.slow_threshold_us:
+            self._report_slow(database_name, collection, name, command, event.duration_micros / 1000)
+
+    def _report_slow(self, database_name: str, collection: str, name: str, command: dict, duration_ms: float) -> None:
+        SLOW_COMMANDS.inc(collection=collection, command=name)
+        shape = query_shape(command_filter(name, command) or {})
+        sort = query_shape(command.get("sort") or {})
+        self.logger.warning(
+            "Slow Mongo {command} on {collection} took {duration_ms:.1f}ms (filter={shape}, sort={sort})",
+            command=name,
+            collection=collection,
+            duration_ms=duration_ms,
+            shape=shape,
+            sort=sort,
+        )
+        if self.explain_runner is None or name not in _EXPLAINABLE_COMMANDS:
+            return
+        key = f"{collection}:{name}:{shape}:{sort}"
+        with self._lock:
+            if key in self._explained or len(self._explained) >= _MAX_EXPLAINED_SHAPES:
+                return
+            self._explained.add(key)
+        explained = {field: value for field, value in command.items() if field not in _DRIVER_FIELDS}
+        explained = {field: value for field, value in explained.items() if not field.startswith("$")}
+        self._executor().submit(self._explain, database_name, collection, name, shape, explained)
+
+    def _executor(self) -> Executor:
+        with self._lock:
+            if self._explain_executor is None:
+                self._explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mongo-explain")
+            return self._explain_executor
+
+    def _explain(self, database_name: str, collection: str, name: str, shape: Any, command: dict) -> None:
+        try:
+            plan = summarize_plan(self.explain_runner(database_name, command))
+        except Exception as exc:  # noqa: BLE001 - explain is best effort diagnostics
+            self.logger.warning(
+                "Could not explain slow {command} on {collection}: {exc}", command=name, collection=collection, exc=exc
+            )
+            return
+        self.logger.warning(
+            "Plan for slow {command} on {collection} (filter={shape}): stages={stages} indexes={indexes}",
+            command=name,
+            collection=collection,
+            shape=shape,
+            stages=plan["stages"],
+            indexes=plan["indexes"],
+        )
+
+    def close(self) -> None:
+        """Stop the explain thread and close the explain runner, if any."""
+
+        if self._explain_executor is not None:
+            self._explain_executor.shutdown(wait=False, cancel_futures=True)
+        close = getattr(self.explain_runner, "close", None)
+        if close is not None:
+            close()
+
+
+class PymongoExplainRunner:
+    """Runs ``explain`` through its own synchronous client, created on first use.
+
+    The client carries no listeners, so explain commands are not monitored themselves.
+    """
+
+    def __init__(self, uri: str) -> None:
+        self.uri = uri
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __call__(self, database_name: str, command: dict) -> dict:
+        with self._lock:
+            if self._client is None:
+                from pymongo import MongoClient
+
+                self._client = MongoClient(self.uri, maxPoolSize=1)
+        return self._client[database_name].command({"explain": command, "verbosity": "queryPlanner"})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
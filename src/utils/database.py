@@ -3,10 +3,115 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
 
-from config.settings import get_settings
+from config.settings import Settings, get_settings
+
+from .command_monitoring import CommandMetricsListener, PymongoExplainRunner
+from .metrics import REGISTRY
+
+POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the Motor pool.",
+    ("address",),
+)
+POOL_CHECKOUT_FAILURES = REGISTRY.counter(
+    "mongodb_pool_checkout_failures_total",
+    "Connection checkouts that failed, by reason.",
+    ("address", "reason"),
+)
+POOL_CONNECTIONS = REGISTRY.gauge(
+    "mongodb_pool_connections",
+    "Open connections in the Motor pool.",
+    ("address",),
+)
+POOL_CONNECTIONS_IN_USE = REGISTRY.gauge(
+    "mongodb_pool_connections_in_use",
+    "Connections currently checked out of the Motor pool.",
+    ("address",),
+)
+
+
+def _address(event: Any) -> str:
+    host, port = event.address
+    return f"{host}:{port}"
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Feeds connection pool events into the metrics registry."""
+
+    def connection_checked_out(self, event) -> None:
+        address = _address(event)
+        POOL_CONNECTIONS_IN_USE.inc(address=address)
+        if event.duration is not None:
+            POOL_CHECKOUT_WAIT.observe(event.duration, address=address)
+
+    def connection_check_out_failed(self, event) -> None:
+        address = _address(event)
+        POOL_CHECKOUT_FAILURES.inc(address=address, reason=str(event.reason))
+        if event.duration is not None:
+            POOL_CHECKOUT_WAIT.observe(event.duration, address=address)
+
+    def connection_checked_in(self, event) -> None:
+        POOL_CONNECTIONS_IN_USE.dec(address=_address(event))
+
+    def connection_created(self, event) -> None:
+        POOL_CONNECTIONS.inc(address=_address(event))
+
+    def connection_closed(self, event) -> None:
+        POOL_CONNECTIONS.dec(address=_address(event))
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+
+def client_options(settings: Settings) -> dict[str, Any]:
+    """Translate settings into ``AsyncIOMotorClient`` keyword options."""
+
+    listeners: list[Any] = [PoolMetricsListener()]
+    if settings.mongodb_command_monitoring:
+        explain_runner = PymongoExplainRunner(settings.mongodb_uri) if settings.mongodb_explain_slow_queries else None
+        listeners.append(
+            CommandMetricsListener(
+                slow_threshold_ms=settings.benchmark_threshold_ms,
+                measure_reply_bytes=settings.mongodb_command_reply_bytes,
+                explain_runner=explain_runner,
+            )
+        )
+    options: dict[str, Any] = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "event_listeners": listeners,
+    }
+    if settings.mongodb_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    if settings.mongodb_compressors:
+        options["compressors"] = settings.mongodb_compressors
+    return options
+
+
+_LISTENERS: list[Any] = []
 
 
 @lru_cache(maxsize=1)
@@ -14,7 +119,9 @@ def _get_client() -> AsyncIOMotorClient:
     """Return a cached Motor client."""
 
     settings = get_settings()
-    return AsyncIOMotorClient(settings.mongodb_uri)
+    options = client_options(settings)
+    _LISTENERS[:] = options["event_listeners"]
+    return AsyncIOMotorClient(settings.mongodb_uri, **options)
 
 
 def get_database() -> AsyncIOMotorDatabase:
@@ -23,3 +130,26 @@ def get_database() -> AsyncIOMotorDatabase:
     settings = get_settings()
     client = _get_client()
     return client[settings.mongodb_database]
+
+
+async def warm_up_client() -> None:
+    """Open the pool eagerly so the first requests do not pay for the handshake.
+
+    The ping checks out one connection; ``minPoolSize`` connections are then kept
+    open by the pool's background maintenance.
+    """
+
+    await _get_client().admin.command("ping")
+
+
+def close_client() -> None:
+    """Close the cached client and drop it so a later call reconnects."""
+
+    if _get_client.cache_info().currsize:
+        _get_client().close()
+        _get_client.cache_clear()
+    for listener in _LISTENERS:
+        close = getattr(listener, "close", None)
+        if close is not None:
+            close()
+    _LISTENERS.clear()
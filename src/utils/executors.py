@@ -0,0 +1,103 @@
+"""Shared executors used to move blocking and CPU-bound work off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from config.settings import get_settings
+
+ResultType = TypeVar("ResultType")
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_BATCH_EXPORT_POOL: Optional[ProcessPoolExecutor] = None
+_EXPORT_POOL: Optional[ThreadPoolExecutor] = None
+_EXPORT_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the lazily created process pool shared by the application."""
+
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        settings = get_settings()
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=max(settings.process_pool_workers, 1))
+    return _PROCESS_POOL
+
+
+def spawn_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return a new process pool whose workers are spawned rather than forked."""
+
+    # Spawned workers never inherit the parent's Motor client or executor threads.
+    return ProcessPoolExecutor(max_workers=max(max_workers, 1), mp_context=multiprocessing.get_context("spawn"))
+
+
+def get_batch_export_pool() -> ProcessPoolExecutor:
+    """Return the lazily created process pool shared by multi-user batch exports."""
+
+    global _BATCH_EXPORT_POOL
+    if _BATCH_EXPORT_POOL is None:
+        _BATCH_EXPORT_POOL = spawn_process_pool(get_settings().batch_export_workers)
+    return _BATCH_EXPORT_POOL
+
+
+def get_export_pool() -> ThreadPoolExecutor:
+    """Return the bounded thread pool dedicated to report file I/O."""
+
+    global _EXPORT_POOL
+    if _EXPORT_POOL is None:
+        settings = get_settings()
+        _EXPORT_POOL = ThreadPoolExecutor(
+            max_workers=max(settings.export_io_workers, 1),
+            thread_name_prefix="export-io",
+        )
+    return _EXPORT_POOL
+
+
+async def run_in_process_pool(func: Callable[..., ResultType], *args: Any, **kwargs: Any) -> ResultType:
+    """Run a picklable callable in the shared process pool without blocking the loop."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+
+
+async def run_in_export_pool(func: Callable[..., ResultType], *args: Any, **kwargs: Any) -> ResultType:
+    """Run blocking file I/O in the export thread pool."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_export_pool(), partial(func, *args, **kwargs))
+
+
+@asynccontextmanager
+async def export_slot() -> AsyncIterator[None]:
+    """Limit how many exports run concurrently on the current event loop."""
+
+    loop = asyncio.get_running_loop()
+    semaphore = _EXPORT_SLOTS.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(get_settings().export_max_concurrency, 1))
+        _EXPORT_SLOTS[loop] = semaphore
+    async with semaphore:
+        yield
+
+
+def shutdown_executors() -> None:
+    """Release pooled workers; used on application shutdown."""
+
+    global _PROCESS_POOL, _BATCH_EXPORT_POOL, _EXPORT_POOL
+    if _PROCESS_POOL is not None:
+        _PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+        _PROCESS_POOL = None
+    if _BATCH_EXPORT_POOL is not None:
+        _BATCH_EXPORT_POOL.shutdown(wait=False, cancel_futures=True)
+        _BATCH_EXPORT_POOL = None
+    if _EXPORT_POOL is not None:
+        _EXPORT_POOL.shutdown(wait=True)
+        _EXPORT_POOL = None
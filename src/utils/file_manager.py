@@ -3,12 +3,231 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, BinaryIO, Callable, Iterable, Optional
 
 from config.settings import get_settings
-from src.models import ReportPayload, TransactionModel, TransactionType
+from src.models import ExportFormat, MonthlyStatement, ReportPayload, TransactionModel, TransactionType
+
+from .executors import export_slot, run_in_export_pool
+
+CSV_HEADER = (
+    "id",
+    "user_id",
+    "account_id",
+    "type",
+    "category",
+    "amount",
+    "event_date",
+    "description",
+)
+
+# Cache entries are ``report_<key>.<format>`` plus a ``.json`` payload sidecar.
+REPORT_CACHE_PREFIX = "report_"
+REPORT_SUFFIXES = {".csv", ".gz", ".ndjson", ".parquet", ".json"}
+
+
+def transaction_row(tx: TransactionModel) -> list:
+    """Return the CSV row representing a transaction."""
+
+    return [
+        tx.id,
+        tx.user_id,
+        tx.account_id,
+        tx.type.value,
+        tx.category,
+        tx.amount,
+        tx.event_date.isoformat(),
+        tx.description,
+    ]
+
+
+class ReportTotals:
+    """Running totals accumulated while transactions are exported."""
+
+    def __init__(self) -> None:
+        self.total_transactions = 0
+        self.total_expenses = 0.0
+        self.total_income = 0.0
+
+    def add(self, tx: TransactionModel) -> None:
+        """Account for a single exported transaction."""
+
+        self.total_transactions += 1
+        if tx.type == TransactionType.EXPENSE:
+            self.total_expenses += tx.amount
+        else:
+            self.total_income += tx.amount
+
+    def summary_rows(self) -> list[list]:
+        """Return trailing ``#``-prefixed rows summarizing the export."""
+
+        return [
+            ["# total_transactions", self.total_transactions],
+            ["# total_expenses", round(self.total_expenses, 2)],
+            ["# total_income", round(self.total_income, 2)],
+        ]
+
+    def to_payload(
+        self,
+        file_path: Path,
+        export_format: ExportFormat = ExportFormat.CSV,
+        bytes_written: int = 0,
+        raw_bytes: int = 0,
+    ) -> ReportPayload:
+        """Build the report payload for a written file."""
+
+        return ReportPayload(
+            generated_at=datetime.utcnow(),
+            file_path=str(file_path),
+            total_transactions=self.total_transactions,
+            total_expenses=round(self.total_expenses, 2),
+            total_income=round(self.total_income, 2),
+            format=export_format,
+            bytes_written=bytes_written,
+            compression_ratio=round(raw_bytes / bytes_written, 2) if bytes_written else 1.0,
+        )
+
+
+class ReportWriter(ABC):
+    """Writes chunks of transactions to a report file in a given format.
+
+    ``raw_bytes`` tracks the uncompressed size of the rendered rows so the
+    compression ratio can be reported once the file is closed.
+    """
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.path = path
+        self.raw_bytes = 0
+        self._initial_size = path.stat().st_size if append and path.exists() else 0
+        self._appending = self._initial_size > 0
+
+    @abstractmethod
+    def write(self, transactions: list[TransactionModel]) -> None:
+        """Append a chunk of transactions to the report."""
+
+    @abstractmethod
+    def close(self) -> int:
+        """Close the file and return the number of bytes written."""
+
+
+class _StreamReportWriter(ReportWriter):
+    """Row oriented writer rendering each chunk to bytes before writing it."""
+
+    def __init__(self, path: Path, append: bool = False, compress: bool = False) -> None:
+        super().__init__(path, append)
+        mode = "ab" if self._appending else "wb"
+        self._file: BinaryIO = gzip.open(path, mode) if compress else path.open(mode)
+        header = self.header()
+        if header and not self._appending:
+            self._emit(header)
+
+    def header(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def render(self, transactions: list[TransactionModel]) -> bytes:
+        """Return the bytes representing a chunk of transactions."""
+
+    def write(self, transactions: list[TransactionModel]) -> None:
+        self._emit(self.render(transactions))
+
+    def close(self) -> int:
+        self._file.close()
+        return self.path.stat().st_size - self._initial_size
+
+    def _emit(self, data: bytes) -> None:
+        self.raw_bytes += len(data)
+        self._file.write(data)
+
+
+class CsvReportWriter(_StreamReportWriter):
+    """Plain or gzip compressed CSV with the standard report header."""
+
+    def header(self) -> bytes:
+        return self._render_rows([list(CSV_HEADER)])
+
+    def render(self, transactions: list[TransactionModel]) -> bytes:
+        return self._render_rows([transaction_row(tx) for tx in transactions])
+
+    @staticmethod
+    def _render_rows(rows: list[list]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+
+class NdjsonReportWriter(_StreamReportWriter):
+    """One JSON object per line with the same columns as the CSV report."""
+
+    def render(self, transactions: list[TransactionModel]) -> bytes:
+        lines = [
+            json.dumps(dict(zip(CSV_HEADER, transaction_row(tx))), ensure_ascii=False) + "\n"
+            for tx in transactions
+        ]
+        return "".join(lines).encode("utf-8")
+
+
+class ParquetReportWriter(ReportWriter):
+    """Columnar Parquet file written as one row group per chunk."""
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        if append:
+            raise ValueError("Parquet reports cannot be appended to")
+        super().__init__(path)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("user_id", pa.string()),
+                ("account_id", pa.string()),
+                ("type", pa.string()),
+                ("category", pa.string()),
+                ("amount", pa.float64()),
+                ("event_date", pa.timestamp("us")),
+                ("description", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="snappy")
+
+    def write(self, transactions: list[TransactionModel]) -> None:
+        columns: dict[str, list[Any]] = {name: [] for name in CSV_HEADER}
+        for tx in transactions:
+            columns["id"].append(tx.id)
+            columns["user_id"].append(tx.user_id)
+            columns["account_id"].append(tx.account_id)
+            columns["type"].append(tx.type.value)
+            columns["category"].append(tx.category)
+            columns["amount"].append(tx.amount)
+            columns["event_date"].append(tx.event_date)
+            columns["description"].append(tx.description)
+        table = self._pa.Table.from_pydict(columns, schema=self._schema)
+        self.raw_bytes += table.nbytes
+        self._writer.write_table(table)
+
+    def close(self) -> int:
+        self._writer.close()
+        return self.path.stat().st_size
+
+
+def open_report_writer(path: Path, export_format: ExportFormat, append: bool = False) -> ReportWriter:
+    """Return the writer producing ``export_format`` at ``path``."""
+
+    if export_format == ExportFormat.PARQUET:
+        return ParquetReportWriter(path, append=append)
+    if export_format == ExportFormat.NDJSON:
+        return NdjsonReportWriter(path, append=append)
+    return CsvReportWriter(path, append=append, compress=export_format == ExportFormat.CSV_GZIP)
 
 
 class FileManager:
@@ -19,46 +238,222 @@ class FileManager:
         self.base_dir = base_dir or Path(settings.export_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
-    def export_transactions(self, transactions: Iterable[TransactionModel]) -> ReportPayload:
-        """Write a CSV report with consolidated transaction totals."""
+    def export_transactions(
+        self,
+        transactions: Iterable[TransactionModel],
+        export_format: ExportFormat = ExportFormat.CSV,
+        chunk_size: int = 500,
+    ) -> ReportPayload:
+        """Write a report with consolidated transaction totals in the requested format."""
+
+        file_path = self._new_report_path("transactions", suffix=f".{export_format.value}")
+        totals = ReportTotals()
+        writer = open_report_writer(file_path, export_format)
+        try:
+            chunk: list[TransactionModel] = []
+            for tx in transactions:
+                totals.add(tx)
+                chunk.append(tx)
+                if len(chunk) >= chunk_size:
+                    writer.write(chunk)
+                    chunk = []
+            if chunk:
+                writer.write(chunk)
+        finally:
+            bytes_written = writer.close()
+        return totals.to_payload(file_path, export_format, bytes_written, writer.raw_bytes)
+
+    async def export_transactions_async(
+        self,
+        transactions: AsyncIterable[TransactionModel],
+        chunk_size: int = 500,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        file_path: Optional[Path] = None,
+        append: bool = False,
+        export_format: ExportFormat = ExportFormat.CSV,
+    ) -> ReportPayload:
+        """Write the report with all blocking file work done in the export pool.
+
+        Rows are rendered and written one chunk at a time, so memory stays bounded by
+        ``chunk_size`` whatever the format. ``on_progress`` is awaited with the number
+        of rows written after every chunk. With ``append`` the rows are added to an
+        existing ``file_path`` without a new header.
+        """
+
+        async with export_slot():
+            await run_in_export_pool(self.base_dir.mkdir, parents=True, exist_ok=True)
+            file_path = file_path or self._new_report_path("transactions", suffix=f".{export_format.value}")
+            writer = await run_in_export_pool(open_report_writer, file_path, export_format, append)
+            try:
+                totals = ReportTotals()
+                chunk: list[TransactionModel] = []
+                async for tx in transactions:
+                    totals.add(tx)
+                    chunk.append(tx)
+                    if len(chunk) >= chunk_size:
+                        await run_in_export_pool(writer.write, chunk)
+                        chunk = []
+                        if on_progress is not None:
+                            await on_progress(totals.total_transactions)
+                if chunk:
+                    await run_in_export_pool(writer.write, chunk)
+            finally:
+                bytes_written = await run_in_export_pool(writer.close)
+        return totals.to_payload(file_path, export_format, bytes_written, writer.raw_bytes)
 
-        file_path = self.base_dir / f"transactions_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-        total_expenses = 0.0
-        total_income = 0.0
-        tx_list = list(transactions)
+    def write_statement_csv(self, statement: MonthlyStatement) -> Path:
+        """Render a monthly statement as a CSV file with one block per section."""
+
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self._new_report_path(f"statement_{statement.month}")
         with file_path.open("w", newline="", encoding="utf-8") as csv_file:
             writer = csv.writer(csv_file)
-            writer.writerow([
-                "id",
-                "user_id",
-                "account_id",
-                "type",
-                "category",
-                "amount",
-                "event_date",
-                "description",
-            ])
-            for tx in tx_list:
-                if tx.type == TransactionType.EXPENSE:
-                    total_expenses += tx.amount
-                else:
-                    total_income += tx.amount
-                writer.writerow(
-                    [
-                        tx.id,
-                        tx.user_id,
-                        tx.account_id,
-                        tx.type.value,
-                        tx.category,
-                        tx.amount,
-                        tx.event_date.isoformat(),
-                        tx.description,
-                    ]
-                )
-        return ReportPayload(
-            generated_at=datetime.utcnow(),
-            file_path=str(file_path),
-            total_transactions=len(tx_list),
-            total_expenses=round(total_expenses, 2),
-            total_income=round(total_income, 2),
-        )
+            writer.writerow(["# categories"])
+            writer.writerow(["category", "type", "total", "count"])
+            writer.writerows([line.category, line.type.value, line.total, line.count] for line in statement.categories)
+            writer.writerow(["# accounts"])
+            writer.writerow(["account_id", "name", "opening_balance", "inflow", "outflow", "closing_balance"])
+            writer.writerows(
+                [line.account_id, line.name, line.opening_balance, line.inflow, line.outflow, line.closing_balance]
+                for line in statement.accounts
+            )
+            writer.writerow(["# budgets"])
+            writer.writerow(["budget_id", "category", "limit_amount", "amount_spent", "usage_percent", "status"])
+            writer.writerows(
+                [
+                    line.budget_id,
+                    line.category,
+                    line.limit_amount,
+                    line.amount_spent,
+                    line.usage_percent,
+                    line.status.value,
+                ]
+                for line in statement.budgets
+            )
+            writer.writerow(["# total_income", statement.total_income])
+            writer.writerow(["# total_expenses", statement.total_expenses])
+        return file_path
+
+    @staticmethod
+    def cache_key(*parts: object) -> str:
+        """Return a content address for a report built from the given inputs."""
+
+        return hashlib.sha256(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+
+    async def load_cached_report(
+        self, key: str, export_format: ExportFormat = ExportFormat.CSV
+    ) -> Optional[ReportPayload]:
+        """Return the payload of a cached report, marking it as recently used."""
+
+        return await run_in_export_pool(self._load_cached_report, self._cached_report_path(key, export_format))
+
+    async def export_transactions_cached(
+        self,
+        key: str,
+        transactions: AsyncIterable[TransactionModel],
+        chunk_size: int = 500,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        export_format: ExportFormat = ExportFormat.CSV,
+    ) -> ReportPayload:
+        """Export transactions into the cache entry ``key`` and evict old entries.
+
+        The file is written under a temporary name and renamed once complete, so
+        concurrent exports of the same key never expose a partial report.
+        """
+
+        final_path = self._cached_report_path(key, export_format)
+        partial_path = self.base_dir / f".{REPORT_CACHE_PREFIX}{key}_{os.getpid()}_{id(transactions)}.partial"
+        try:
+            report = await self.export_transactions_async(
+                transactions,
+                chunk_size=chunk_size,
+                on_progress=on_progress,
+                file_path=partial_path,
+                export_format=export_format,
+            )
+            report = report.model_copy(update={"file_path": str(final_path)})
+            await run_in_export_pool(self._commit_cached_report, partial_path, final_path, report)
+        finally:
+            await run_in_export_pool(partial_path.unlink, True)
+        return report
+
+    def _cached_report_path(self, key: str, export_format: ExportFormat) -> Path:
+        return self.base_dir / f"{REPORT_CACHE_PREFIX}{key}.{export_format.value}"
+
+    def _load_cached_report(self, report_path: Path) -> Optional[ReportPayload]:
+        meta_path = report_path.with_suffix(".json")
+        try:
+            report = ReportPayload.model_validate_json(meta_path.read_text(encoding="utf-8"))
+            os.utime(report_path)
+            os.utime(meta_path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return report
+
+    def _commit_cached_report(self, partial_path: Path, final_path: Path, report: ReportPayload) -> None:
+        os.replace(partial_path, final_path)
+        final_path.with_suffix(".json").write_text(report.model_dump_json(), encoding="utf-8")
+        self.evict_reports(get_settings().report_cache_max_bytes, keep={final_path})
+
+    def evict_reports(self, max_bytes: int, keep: Iterable[Path] = ()) -> list[Path]:
+        """Delete least recently used cached reports until the cache fits in ``max_bytes``.
+
+        Only ``report_*`` cache entries and their sidecars are counted and evicted; other
+        files in the export directory, such as incremental export bases and report job
+        outputs, are left alone.
+        """
+
+        protected = {path.stem for path in keep}
+        entries: dict[str, list] = {}
+        total = 0
+        for path in self.base_dir.iterdir():
+            if not path.name.startswith(REPORT_CACHE_PREFIX) or path.suffix not in REPORT_SUFFIXES:
+                continue
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            total += stat.st_size
+            entry = entries.setdefault(path.stem, [0.0, []])
+            entry[0] = max(entry[0], stat.st_mtime)
+            entry[1].append((path, stat.st_size))
+
+        evicted: list[Path] = []
+        for stem, (_, files) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= max_bytes:
+                break
+            if stem in protected:
+                continue
+            for path, size in files:
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted.append(path)
+        return evicted
+
+    def _new_report_path(self, prefix: str, suffix: str = ".csv") -> Path:
+        """Return a unique timestamped path inside the export directory."""
+
+        return self.base_dir / f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}{suffix}"
+
+    @staticmethod
+    async def stream_transactions_csv(
+        transactions: AsyncIterable[TransactionModel],
+        chunk_size: int = 500,
+    ) -> AsyncIterator[str]:
+        """Render transactions as CSV text chunks, ending with the summary rows."""
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+        totals = ReportTotals()
+        pending = 0
+        async for tx in transactions:
+            totals.add(tx)
+            writer.writerow(transaction_row(tx))
+            pending += 1
+            if pending >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        writer.writerows(totals.summary_rows())
+        yield buffer.getvalue()
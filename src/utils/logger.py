@@ -2,14 +2,122 @@
 
 from __future__ import annotations
 
+import asyncio
+import queue
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, TextIO
 
 from loguru import logger
 
 from config.settings import get_settings
 
+from .metrics import REGISTRY
+
 _CONFIGURED = False
+_BACKGROUND_SINKS: list["BackgroundSink"] = []
+
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total",
+    "Log records dropped because a background sink queue was full.",
+    ("sink",),
+)
+
+
+def parse_component_levels(spec: str) -> dict[str, int]:
+    """Parse ``"report_jobs=DEBUG,startup=WARNING"`` into numeric levels per component."""
+
+    levels: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        component, _, level = item.partition("=")
+        if not level:
+            raise ValueError(f"Invalid log level override '{item}', expected component=LEVEL")
+        levels[component.strip()] = logger.level(level.strip().upper()).no
+    return levels
+
+
+class ComponentLevelFilter:
+    """Sink filter applying per-component level overrides on top of the default level."""
+
+    def __init__(self, default_level: str, overrides: Optional[dict[str, int]] = None) -> None:
+        self.default = logger.level(default_level.upper()).no
+        self.overrides = overrides or {}
+
+    def __call__(self, record: dict[str, Any]) -> bool:
+        threshold = self.overrides.get(record["extra"].get("component"), self.default)
+        return record["level"].no >= threshold
+
+
+class BackgroundSink:
+    """Stream sink that hands formatted messages to a writer thread.
+
+    Callers only pay for a ``put`` on an in-process queue, so a terminal or pipe that
+    stalls never blocks the event loop. When the queue is full the message is dropped
+    and counted instead of waiting.
+    """
+
+    def __init__(self, stream: TextIO, name: str = "console", max_pending: int = 10_000) -> None:
+        self.stream = stream
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._drain, name=f"log-sink-{name}", daemon=True)
+        self._thread.start()
+        _BACKGROUND_SINKS.append(self)
+
+    def write(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(sink=self.name)
+
+    def _drain(self) -> None:
+        while True:
+            message = self._queue.get()
+            try:
+                if message is None:
+                    return
+                self.stream.write(message)
+                if self._queue.empty():
+                    self.stream.flush()
+            except Exception:  # noqa: BLE001 - a broken stream must not kill the writer thread
+                pass
+            finally:
+                self._queue.task_done()
+
+    def stop(self) -> None:
+        """Write what is pending and stop the thread (called by ``logger.remove``)."""
+
+        self._queue.put(None)
+        self._thread.join()
+        if self in _BACKGROUND_SINKS:
+            _BACKGROUND_SINKS.remove(self)
+
+    def wait_idle(self) -> None:
+        """Block until every pending message has been written."""
+
+        self._queue.join()
+
+
+def _add_sinks(settings: Any, log_dir: Path) -> list[int]:
+    """Attach the console and file sinks and return their handler ids.
+
+    With ``log_enqueue`` neither sink writes on the caller's thread: the console goes
+    through a :class:`BackgroundSink` and the file sink uses loguru's ``enqueue``, which
+    keeps rotation and retention on its own writer thread. ``flush_logs`` drains both.
+    """
+
+    log_filter = ComponentLevelFilter(settings.log_level, parse_component_levels(settings.log_levels))
+    # Level filtering is left to the filter so overrides can go below the default level.
+    options = dict(level=0, filter=log_filter, serialize=settings.log_json)
+    console = BackgroundSink(sys.stdout) if settings.log_enqueue else sys.stdout
+    return [
+        logger.add(console, backtrace=False, diagnose=False, **options),
+        logger.add(
+            log_dir / "app.log", rotation="10 MB", retention="10 days", enqueue=settings.log_enqueue, **options
+        ),
+    ]
 
 
 def _configure_logger() -> None:
@@ -19,22 +127,10 @@ def _configure_logger() -> None:
     if _CONFIGURED:
         return
     settings = get_settings()
-    log_dir = Path("logs")
+    log_dir = Path(settings.log_dir)
     log_dir.mkdir(parents=True, exist_ok=True)
     logger.remove()
-    logger.add(
-        sink=lambda msg: print(msg, end=""),
-        level=settings.log_level,
-        backtrace=False,
-        diagnose=False,
-    )
-    logger.add(
-        log_dir / "app.log",
-        rotation="10 MB",
-        retention="10 days",
-        level=settings.log_level,
-        serialize=False,
-    )
+    _add_sinks(settings, log_dir)
     _CONFIGURED = True
 
 
@@ -43,3 +139,87 @@ def get_logger(name: Optional[str] = None):
 
     _configure_logger()
     return logger if name is None else logger.bind(component=name)
+
+
+class ThrottledLogger:
+    """Logger for hot paths that samples and rate limits each message template.
+
+    Every ``sample_every``-th call of a template is considered, and at most
+    ``per_second`` of those are emitted (token bucket with a burst of
+    ``max(per_second, 1)``, so rates below one per second still let a record through).
+    The next emitted record carries the number of calls dropped in between as
+    ``extra["suppressed"]``.
+    """
+
+    def __init__(self, bound_logger, per_second: float = 10.0, sample_every: int = 1) -> None:
+        if per_second <= 0 or sample_every < 1:
+            raise ValueError("per_second must be positive and sample_every at least 1")
+        self._logger = bound_logger
+        self.per_second = per_second
+        self.sample_every = sample_every
+        self.burst = max(per_second, 1.0)
+        self._state: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _admit(self, message: str) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(message)
+            if state is None:
+                # [calls, tokens, last refill, suppressed]
+                state = self._state[message] = [0, self.burst, now, 0]
+            state[0] += 1
+            state[1] = min(self.burst, state[1] + (now - state[2]) * self.per_second)
+            state[2] = now
+            if (state[0] - 1) % self.sample_every or state[1] < 1:
+                state[3] += 1
+                return None
+            state[1] -= 1
+            suppressed, state[3] = state[3], 0
+            return suppressed
+
+    def log(self, level: str, message: str, *args: Any, **kwargs: Any) -> bool:
+        """Log ``message`` unless it is sampled out or throttled; return whether it was emitted."""
+
+        return self._emit(level, message, args, kwargs, exception=False)
+
+    def _emit(self, level: str, message: str, args: tuple, kwargs: dict, exception: bool) -> bool:
+        suppressed = self._admit(message)
+        if suppressed is None:
+            return False
+        target = self._logger.bind(suppressed=suppressed) if suppressed else self._logger
+        target.opt(depth=2, exception=exception).log(level, message, *args, **kwargs)
+        return True
+
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._emit("DEBUG", message, args, kwargs, exception=False)
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._emit("INFO", message, args, kwargs, exception=False)
+
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._emit("WARNING", message, args, kwargs, exception=False)
+
+    def error(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._emit("ERROR", message, args, kwargs, exception=False)
+
+    def exception(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._emit("ERROR", message, args, kwargs, exception=True)
+
+
+def get_throttled_logger(
+    name: Optional[str] = None,
+    per_second: float = 10.0,
+    sample_every: int = 1,
+) -> ThrottledLogger:
+    """Return a :class:`ThrottledLogger` bound to the provided name."""
+
+    return ThrottledLogger(get_logger(name), per_second=per_second, sample_every=sample_every)
+
+
+async def flush_logs() -> None:
+    """Wait until every queued record has been written by the background sinks."""
+
+    for sink in list(_BACKGROUND_SINKS):
+        await asyncio.to_thread(sink.wait_idle)
+    await logger.complete()
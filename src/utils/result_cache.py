@@ -0,0 +1,183 @@
+"""Bounded in-process cache of per-user query results with generation-based invalidation."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from .metrics import REGISTRY
+
+T = TypeVar("T")
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "result_cache_requests_total",
+    "Result cache lookups by outcome (hit or miss).",
+    ("cache", "outcome"),
+)
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "result_cache_hit_ratio",
+    "Share of result cache lookups answered from the cache since start-up.",
+    ("cache",),
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "result_cache_evictions_total",
+    "Entries dropped from the result cache, by reason.",
+    ("cache", "reason"),
+)
+CACHE_BYTES = REGISTRY.gauge(
+    "result_cache_bytes",
+    "Estimated size of the results held by the cache.",
+    ("cache",),
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "result_cache_entries",
+    "Results held by the cache.",
+    ("cache",),
+)
+
+
+def normalize_filters(filters: Any) -> str:
+    """Return a canonical string for filters given as a model, mapping or scalar."""
+
+    if isinstance(filters, BaseModel):
+        filters = filters.model_dump(mode="json", exclude_none=True)
+    return json.dumps(filters, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a result by the size of its JSON encoding."""
+
+    return len(to_json(value))
+
+
+class ResultCache:
+    """LRU of query results keyed by ``(user_id, endpoint, filters, generation)``.
+
+    ``invalidate(user_id)`` only moves the user to a new generation: older entries can
+    no longer be reached and age out of the LRU, so a write costs O(1). A result
+    computed while a write happened is stored under the old generation and is never
+    served. Generations come from one counter and only the ``max_entries`` most recently
+    invalidated users are remembered; users forgotten or never invalidated share the
+    floor generation, which rises past every forgotten one, so forgetting a user only
+    turns some hits into misses. Entries also expire after ``ttl_seconds``, which bounds
+    how long writes made by other processes can go unnoticed. Results are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        ttl_seconds: float,
+        max_entries: int = 10_000,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float]] = OrderedDict()
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._clock = 0
+        self._floor = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl_seconds > 0
+
+    def invalidate(self, user_id: str) -> None:
+        """Make every cached result of ``user_id`` unreachable."""
+
+        self._clock += 1
+        self._generations[user_id] = self._clock
+        self._generations.move_to_end(user_id)
+        while len(self._generations) > self.max_entries:
+            _, self._floor = self._generations.popitem(last=False)
+
+    def _generation(self, user_id: str) -> int:
+        return self._generations.get(user_id, self._floor)
+
+    async def get_or_compute(
+        self,
+        user_id: str,
+        endpoint: str,
+        filters: Any,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return the cached result for the key, or await ``compute`` and cache it."""
+
+        if not self.enabled:
+            return await compute()
+        generation = self._generation(user_id)
+        key = (user_id, endpoint, normalize_filters(filters), generation)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() < entry[2]:
+                self._entries.move_to_end(key)
+                self._record(hit=True)
+                return entry[0]
+            self._remove(key, "expired")
+
+        self._record(hit=False)
+        value = await compute()
+        if self._generation(user_id) == generation:
+            self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key, "replaced")
+        self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+        self._bytes += size
+        while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)), "size")
+        self._update_gauges()
+
+    def _remove(self, key: Hashable, reason: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        CACHE_EVICTIONS.inc(cache=self.name, reason=reason)
+        self._update_gauges()
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        CACHE_REQUESTS.inc(cache=self.name, outcome="hit" if hit else "miss")
+        CACHE_HIT_RATIO.set(self.hits / (self.hits + self.misses), cache=self.name)
+
+    def _update_gauges(self) -> None:
+        CACHE_BYTES.set(self._bytes, cache=self.name)
+        CACHE_ENTRIES.set(len(self._entries), cache=self.name)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._update_gauges()
+
+
+def cached_or_compute(
+    cache: Optional[ResultCache],
+    user_id: str,
+    endpoint: str,
+    filters: Any,
+    compute: Callable[[], Awaitable[T]],
+) -> Awaitable[T]:
+    """Go through ``cache`` when a service was given one, otherwise just compute."""
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(user_id, endpoint, filters, compute)
@@ -2,18 +2,53 @@
 
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Mapping, MutableMapping
 
 from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+
+
+class _ObjectIdAsString(TypeDecoder):
+    bson_type = ObjectId
+
+    def transform_bson(self, value: ObjectId) -> str:
+        return str(value)
+
+
+API_CODEC_OPTIONS: CodecOptions = CodecOptions(type_registry=TypeRegistry([_ObjectIdAsString()]))
+"""Codec options turning every ObjectId, at any depth, into a string while BSON is decoded."""
+
+
+def decode_document(document: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    """Rename ``_id`` to ``id`` in place on a document read with :data:`API_CODEC_OPTIONS`.
+
+    Cursor documents are fresh objects, so no copy is made; ObjectIds have already
+    been converted by the codec.
+    """
+
+    if "_id" in document:
+        document["id"] = str(document.pop("_id"))
+    return document
 
 
 def serialize_document(document: Mapping[str, Any]) -> dict[str, Any]:
-    """Transform Mongo documents into API friendly dicts."""
-
-    payload = dict(document)
-    if "_id" in payload:
-        payload["id"] = str(payload.pop("_id"))
-    for key, value in list(payload.items()):
-        if isinstance(value, ObjectId):
-            payload[key] = str(value)
+    """Transform Mongo documents decoded with the default codec into API friendly dicts.
+
+    Converts ObjectIds at any depth in one pass; prefer reading through
+    :data:`API_CODEC_OPTIONS` and :func:`decode_document`, which avoid the copy.
+    """
+
+    payload = {key: _serialize_value(value) for key, value in document.items() if key != "_id"}
+    if "_id" in document:
+        payload["id"] = str(document["_id"])
     return payload
+
+
+def _serialize_value(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Mapping):
+        return {key: _serialize_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_serialize_value(item) for item in value]
+    return value
@@ -0,0 +1,89 @@
+"""Coalesce identical concurrent reads into one in-flight query."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from .metrics import REGISTRY
+from .result_cache import normalize_filters
+
+T = TypeVar("T")
+
+FLIGHT_CALLS = REGISTRY.counter(
+    "single_flight_calls_total",
+    "Reads that started a query (leader) or joined one already in flight (coalesced).",
+    ("flight", "endpoint", "outcome"),
+)
+FLIGHT_IN_FLIGHT = REGISTRY.gauge(
+    "single_flight_in_flight",
+    "Distinct queries currently in flight.",
+    ("flight",),
+)
+
+
+class SingleFlight:
+    """Shares one in-flight computation between callers asking for the same key.
+
+    Keys are ``(user_id, endpoint, filters)``. The first caller starts ``compute`` as a
+    task and later callers await the same task, so they all get its result or its
+    exception; the result is shared and must be treated as read-only. A caller being
+    cancelled does not cancel the query for the others. ``invalidate(user_id)`` detaches
+    the user's queries in flight, so reads issued after a write never join a query
+    started before it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def do(
+        self,
+        user_id: str,
+        endpoint: str,
+        filters: Any,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Await the in-flight query for the key, starting it when there is none."""
+
+        key = (user_id, endpoint, normalize_filters(filters))
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(compute())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finish(key, done))
+            outcome = "leader"
+        else:
+            outcome = "coalesced"
+        FLIGHT_CALLS.inc(flight=self.name, endpoint=endpoint, outcome=outcome)
+        FLIGHT_IN_FLIGHT.set(len(self._calls), flight=self.name)
+        return await asyncio.shield(call)
+
+    def invalidate(self, user_id: str) -> None:
+        """Stop handing the user's queries in flight to new callers."""
+
+        for key in [key for key in self._calls if key[0] == user_id]:
+            del self._calls[key]
+        FLIGHT_IN_FLIGHT.set(len(self._calls), flight=self.name)
+
+    def _finish(self, key: Hashable, call: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        FLIGHT_IN_FLIGHT.set(len(self._calls), flight=self.name)
+        if not call.cancelled():
+            # Retrieved here so a query whose callers all went away does not log a warning.
+            call.exception()
+
+
+def coalesced(
+    flight: Optional[SingleFlight],
+    user_id: str,
+    endpoint: str,
+    filters: Any,
+    compute: Callable[[], Awaitable[T]],
+) -> Awaitable[T]:
+    """Go through ``flight`` when a service was given one, otherwise just compute."""
+
+    if flight is None:
+        return compute()
+    return flight.do(user_id, endpoint, filters, compute)
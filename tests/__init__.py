@@ -58,6 +58,9 @@ def _install_motor_stub() -> None:
             return []
 
     class _AsyncIOMotorCollection(SimpleNamespace):
+        def with_options(self, **kwargs) -> "_AsyncIOMotorCollection":
+            return self
+
         async def create_index(self, *args, **kwargs):
             return None
 
@@ -83,6 +86,9 @@ def _install_motor_stub() -> None:
             return _AsyncCursor()
 
     class _AsyncIOMotorDatabase(dict):
+        def __missing__(self, name: str) -> _AsyncIOMotorCollection:
+            return self.get_collection(name)
+
         def get_collection(self, name: str) -> _AsyncIOMotorCollection:
             if name not in self:
                 self[name] = _AsyncIOMotorCollection()
@@ -137,9 +143,21 @@ def _install_pymongo_stub() -> None:
     errors_module = ModuleType("pymongo.errors")
     errors_module.DuplicateKeyError = _DuplicateKeyError
     pymongo_module.errors = errors_module  # type: ignore[attr-defined]
+    monitoring_module = ModuleType("pymongo.monitoring")
+
+    class _ConnectionPoolListener:
+        """Fallback ConnectionPoolListener."""
+
+    class _CommandListener:
+        """Fallback CommandListener."""
+
+    monitoring_module.ConnectionPoolListener = _ConnectionPoolListener
+    monitoring_module.CommandListener = _CommandListener
+    pymongo_module.monitoring = monitoring_module  # type: ignore[attr-defined]
 
     sys.modules["pymongo"] = pymongo_module
     sys.modules["pymongo.errors"] = errors_module
+    sys.modules["pymongo.monitoring"] = monitoring_module
 
 
 _install_motor_stub()
@@ -14,7 +14,9 @@ from httpx import AsyncClient
 
 from src.controllers.dependencies import (
     get_account_service,
+    get_budget_projection_service,
     get_budget_service,
+    get_goal_forecast_service,
     get_goal_service,
     get_report_service,
     get_transaction_service,
@@ -22,7 +24,16 @@ from src.controllers.dependencies import (
 )
 from src.main import create_app
 from src.models import TransactionType
-from src.services import AccountService, BudgetService, GoalService, ReportService, TransactionService, UserService
+from src.services import (
+    AccountService,
+    BudgetProjectionService,
+    BudgetService,
+    GoalForecastService,
+    GoalService,
+    ReportService,
+    TransactionService,
+    UserService,
+)
 from src.utils import FileManager
 from tests.fixtures.memory_repositories import (
     MemoryAccountRepository,
@@ -51,8 +62,8 @@ def budget_repository() -> MemoryBudgetRepository:
 
 
 @pytest.fixture()
-def goal_repository() -> MemoryGoalRepository:
-    return MemoryGoalRepository()
+def goal_repository(account_repository: MemoryAccountRepository) -> MemoryGoalRepository:
+    return MemoryGoalRepository(account_repository=account_repository)
 
 
 @pytest.fixture()
@@ -78,6 +89,14 @@ def budget_service(budget_repository: MemoryBudgetRepository) -> BudgetService:
     return BudgetService(repository=budget_repository)
 
 
+@pytest.fixture()
+def budget_projection_service(
+    budget_repository: MemoryBudgetRepository,
+    transaction_repository: MemoryTransactionRepository,
+) -> BudgetProjectionService:
+    return BudgetProjectionService(repository=budget_repository, transaction_repository=transaction_repository)
+
+
 @pytest.fixture()
 def goal_service(
     goal_repository: MemoryGoalRepository,
@@ -86,6 +105,14 @@ def goal_service(
     return GoalService(repository=goal_repository, account_repository=account_repository)
 
 
+@pytest.fixture()
+def goal_forecast_service(
+    goal_repository: MemoryGoalRepository,
+    transaction_repository: MemoryTransactionRepository,
+) -> GoalForecastService:
+    return GoalForecastService(repository=goal_repository, transaction_repository=transaction_repository)
+
+
 @pytest.fixture()
 def transaction_service(
     transaction_repository: MemoryTransactionRepository,
@@ -114,7 +141,9 @@ def api_app(
     user_service: UserService,
     account_service: AccountService,
     budget_service: BudgetService,
+    budget_projection_service: BudgetProjectionService,
     goal_service: GoalService,
+    goal_forecast_service: GoalForecastService,
     transaction_service: TransactionService,
     report_service: ReportService,
 ):
@@ -122,7 +151,9 @@ def api_app(
     app.dependency_overrides[get_user_service] = lambda: user_service
     app.dependency_overrides[get_account_service] = lambda: account_service
     app.dependency_overrides[get_budget_service] = lambda: budget_service
+    app.dependency_overrides[get_budget_projection_service] = lambda: budget_projection_service
     app.dependency_overrides[get_goal_service] = lambda: goal_service
+    app.dependency_overrides[get_goal_forecast_service] = lambda: goal_forecast_service
     app.dependency_overrides[get_transaction_service] = lambda: transaction_service
     app.dependency_overrides[get_report_service] = lambda: report_service
     return app
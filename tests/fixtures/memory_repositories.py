@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional
 from uuid import uuid4
 
@@ -10,8 +11,14 @@ from src.models import (
     AccountModel,
     BudgetModel,
     BudgetSummary,
+    ExportWatermark,
+    GoalAccountSummary,
     GoalModel,
+    GoalWithAccount,
+    ReportJobModel,
+    ReportJobStatus,
     TransactionModel,
+    TransactionType,
     UserModel,
 )
 
@@ -44,6 +51,11 @@ class BaseMemoryRepository:
     async def get_by_id(self, entity_id: str):
         return self._to_model(self.storage.get(entity_id))
 
+    async def get_many(self, entity_ids: Iterable[str]) -> tuple[List[Any], List[str]]:
+        wanted = list(dict.fromkeys(entity_ids))
+        items = [self._to_model(self.storage[entity_id]) for entity_id in wanted if entity_id in self.storage]
+        return items, [entity_id for entity_id in wanted if entity_id not in self.storage]
+
     async def list(self, filters: Optional[dict[str, Any]] = None) -> List[Any]:
         if not filters:
             items = list(self.storage.values())
@@ -51,15 +63,23 @@ class BaseMemoryRepository:
             items = [item for item in self.storage.values() if all(item.get(k) == v for k, v in filters.items())]
         return [self._to_model(item) for item in items]
 
+    async def iterate(self, filters: Optional[dict[str, Any]] = None, batch_size: int = 500) -> AsyncIterator[Any]:
+        for item in await self.list(filters):
+            yield item
+
     async def update(self, entity_id: str, payload: dict[str, Any]):
         if entity_id not in self.storage:
             return None
-        self.storage[entity_id].update(payload)
+        stored = self.storage[entity_id]
+        stored.update(payload, updated_at=datetime.utcnow(), version=stored.get("version", 0) + 1)
         return self._to_model(self.storage[entity_id])
 
     async def delete(self, entity_id: str) -> bool:
         return self.storage.pop(entity_id, None) is not None
 
+    async def count(self, filters: Optional[dict[str, Any]] = None) -> int:
+        return len(await self.list(filters))
+
     async def exists(self, filters: dict[str, Any]) -> bool:
         return any(all(item.get(k) == v for k, v in filters.items()) for item in self.storage.values())
 
@@ -85,12 +105,16 @@ class MemoryAccountRepository(BaseMemoryRepository):
         if account_id not in self.storage:
             return None
         self.storage[account_id]["balance"] += delta
+        self.storage[account_id]["updated_at"] = datetime.utcnow()
+        self.storage[account_id]["version"] = self.storage[account_id].get("version", 0) + 1
         return AccountModel(**self.storage[account_id])
 
     async def update_goal_lock(self, account_id: str, delta: float) -> Optional[AccountModel]:
         if account_id not in self.storage:
             return None
         self.storage[account_id]["goal_locked_amount"] = self.storage[account_id].get("goal_locked_amount", 0) + delta
+        self.storage[account_id]["updated_at"] = datetime.utcnow()
+        self.storage[account_id]["version"] = self.storage[account_id].get("version", 0) + 1
         return AccountModel(**self.storage[account_id])
 
 
@@ -107,10 +131,19 @@ class MemoryBudgetRepository(BaseMemoryRepository):
                 return BudgetModel(**item)
         return None
 
+    async def list_active(self, user_id: str, day) -> List[BudgetModel]:
+        return [
+            BudgetModel(**item)
+            for item in self.storage.values()
+            if item["user_id"] == user_id and item["period_start"] <= day <= item["period_end"]
+        ]
+
     async def increment_spent(self, budget_id: str, amount: float) -> Optional[BudgetModel]:
         if budget_id not in self.storage:
             return None
         self.storage[budget_id]["amount_spent"] += amount
+        self.storage[budget_id]["updated_at"] = datetime.utcnow()
+        self.storage[budget_id]["version"] = self.storage[budget_id].get("version", 0) + 1
         return BudgetModel(**self.storage[budget_id])
 
     async def summary(self, user_id: str) -> List[BudgetModel]:
@@ -144,16 +177,50 @@ class MemoryBudgetRepository(BaseMemoryRepository):
 class MemoryGoalRepository(BaseMemoryRepository):
     model_cls = GoalModel
 
+    def __init__(self, account_repository: Optional[MemoryAccountRepository] = None) -> None:
+        super().__init__()
+        self.account_repository = account_repository
+
+    def _with_account(self, item: dict[str, Any]) -> GoalWithAccount:
+        accounts = self.account_repository.storage if self.account_repository else {}
+        account = accounts.get(item["account_id"])
+        summary = None
+        if account:
+            locked = account.get("goal_locked_amount", 0)
+            summary = GoalAccountSummary(
+                id=account["id"],
+                name=account["name"],
+                balance=account["balance"],
+                goal_locked_amount=locked,
+                available_balance=account["balance"] - locked,
+            )
+        return GoalWithAccount(**item, account=summary)
+
+    async def list_with_account(self, filters: dict[str, Any]) -> List[GoalWithAccount]:
+        return [
+            self._with_account(item)
+            for item in self.storage.values()
+            if all(item.get(k) == v for k, v in filters.items())
+        ]
+
+    async def get_with_account(self, goal_id: str) -> Optional[GoalWithAccount]:
+        item = self.storage.get(goal_id)
+        return self._with_account(item) if item else None
+
     async def increment_amount(self, goal_id: str, delta: float) -> Optional[GoalModel]:
         if goal_id not in self.storage:
             return None
         self.storage[goal_id]["current_amount"] += delta
+        self.storage[goal_id]["updated_at"] = datetime.utcnow()
+        self.storage[goal_id]["version"] = self.storage[goal_id].get("version", 0) + 1
         return GoalModel(**self.storage[goal_id])
 
     async def adjust_reserved(self, goal_id: str, delta: float) -> Optional[GoalModel]:
         if goal_id not in self.storage:
             return None
         self.storage[goal_id]["reserved_amount"] = self.storage[goal_id].get("reserved_amount", 0) + delta
+        self.storage[goal_id]["updated_at"] = datetime.utcnow()
+        self.storage[goal_id]["version"] = self.storage[goal_id].get("version", 0) + 1
         return GoalModel(**self.storage[goal_id])
 
     async def list_active(self, user_id: str) -> List[GoalModel]:
@@ -167,6 +234,15 @@ class MemoryGoalRepository(BaseMemoryRepository):
 class MemoryTransactionRepository(BaseMemoryRepository):
     model_cls = TransactionModel
 
+    def __init__(
+        self,
+        account_repository: Optional[MemoryAccountRepository] = None,
+        budget_repository: Optional[MemoryBudgetRepository] = None,
+    ) -> None:
+        super().__init__()
+        self.account_repository = account_repository
+        self.budget_repository = budget_repository
+
     async def search(self, filters) -> List[TransactionModel]:
         results = []
         for item in self.storage.values():
@@ -188,3 +264,211 @@ class MemoryTransactionRepository(BaseMemoryRepository):
                 continue
             totals[item["type"].value] += item["amount"]
         return totals
+
+    async def goal_contributions(self, user_id: str) -> dict[str, list[Any]]:
+        columns: dict[str, list[Any]] = {"goal_id": [], "event_date": [], "amount": []}
+        for item in self.storage.values():
+            if item["user_id"] != user_id or not item.get("goal_id"):
+                continue
+            columns["goal_id"].append(item["goal_id"])
+            columns["event_date"].append(item["event_date"])
+            columns["amount"].append(item["amount"])
+        return columns
+
+    async def daily_spend(self, user_id: str, categories, start, end) -> dict:
+        wanted = set(categories)
+        series: dict = {}
+        for item in self.storage.values():
+            if item["user_id"] != user_id or item["type"] != TransactionType.EXPENSE or item.get("goal_id"):
+                continue
+            if item["category"] not in wanted or not start <= item["event_date"] < end:
+                continue
+            per_day = series.setdefault(item["category"], {})
+            day = item["event_date"].date()
+            per_day[day] = per_day.get(day, 0.0) + item["amount"]
+        return series
+
+    async def monthly_statement(self, user_id: str, start, end, first_day, last_day) -> dict:
+        pivot: dict = {}
+        flows: dict = {}
+        for item in self.storage.values():
+            if item["user_id"] != user_id or item["event_date"] < start:
+                continue
+            if item["type"] == TransactionType.INCOME:
+                signed = item["amount"]
+            else:
+                signed = 0.0 if item.get("goal_id") else -item["amount"]
+            flow = flows.setdefault(item["account_id"], {"inflow": 0.0, "outflow": 0.0, "after": 0.0})
+            if item["event_date"] >= end:
+                flow["after"] += signed
+                continue
+            flow["inflow" if signed > 0 else "outflow"] += abs(signed)
+            line = pivot.setdefault(
+                (item["category"], item["type"].value),
+                {"category": item["category"], "type": item["type"].value, "total": 0.0, "count": 0},
+            )
+            line["total"] += item["amount"]
+            line["count"] += 1
+        accounts = self.account_repository.storage.values() if self.account_repository else []
+        budgets = self.budget_repository.storage.values() if self.budget_repository else []
+        return {
+            "pivot": list(pivot.values()),
+            "flows": flows,
+            "accounts": [
+                {"account_id": item["id"], "name": item["name"], "balance": item["balance"]}
+                for item in accounts
+                if item["user_id"] == user_id
+            ],
+            "budgets": [
+                {
+                    "budget_id": item["id"],
+                    **{
+                        key: item[key]
+                        for key in ("category", "limit_amount", "amount_spent", "period_start", "period_end")
+                    },
+                }
+                for item in budgets
+                if item["user_id"] == user_id and item["period_start"] <= last_day and item["period_end"] >= first_day
+            ],
+        }
+
+    async def iterate_changed_since(
+        self, user_id: str, since=None, after_id: Optional[str] = None, batch_size: int = 500
+    ) -> AsyncIterator[TransactionModel]:
+        for entity_id in sorted(self.storage):
+            item = self.storage[entity_id]
+            if item["user_id"] != user_id:
+                continue
+            tied = since in (item["created_at"], item.get("updated_at"))
+            if since is not None and not (
+                item["created_at"] > since
+                or (item.get("updated_at") and item["updated_at"] > since)
+                or (tied and after_id is not None and entity_id > after_id)
+            ):
+                continue
+            yield TransactionModel(**item)
+
+
+class MemoryDataVersionRepository(BaseMemoryRepository):
+    async def get_version(self, user_id: str, max_age: float = 0.0) -> int:
+        return self.storage.get(user_id, {}).get("version", 0)
+
+    async def bump(self, user_id: str) -> int:
+        entry = self.storage.setdefault(user_id, {"user_id": user_id, "version": 0})
+        entry["version"] += 1
+        return entry["version"]
+
+
+class MemoryExportWatermarkRepository(BaseMemoryRepository):
+    model_cls = ExportWatermark
+
+    async def get_for_user(self, user_id: str) -> Optional[ExportWatermark]:
+        item = self.storage.get(user_id)
+        return ExportWatermark(**item) if item else None
+
+    async def save(self, user_id: str, changed_at, last_id: str, file_path: str, overlap_ids=None) -> ExportWatermark:
+        watermark = ExportWatermark(
+            id=user_id,
+            user_id=user_id,
+            changed_at=changed_at,
+            last_id=last_id,
+            file_path=file_path,
+            overlap_ids=overlap_ids or {},
+        )
+        self.storage[user_id] = watermark.model_dump()
+        return watermark
+
+
+class MemoryReportJobRepository(BaseMemoryRepository):
+    model_cls = ReportJobModel
+
+    async def count_by_status(self, user_id: str, statuses) -> int:
+        return sum(1 for item in self.storage.values() if item["user_id"] == user_id and item["status"] in statuses)
+
+    @staticmethod
+    def _leased(item: dict[str, Any], now: datetime) -> bool:
+        return item["status"] == ReportJobStatus.RUNNING and (item.get("lease_expires_at") or now) > now
+
+    async def running_by_user(self) -> dict[str, int]:
+        running: dict[str, int] = {}
+        now = datetime.utcnow()
+        for item in self.storage.values():
+            if self._leased(item, now):
+                running[item["user_id"]] = running.get(item["user_id"], 0) + 1
+        return running
+
+    async def count_running(self, user_id: str) -> int:
+        now = datetime.utcnow()
+        return sum(1 for item in self.storage.values() if item["user_id"] == user_id and self._leased(item, now))
+
+    async def claim_next(self, lease_seconds: float, exclude_users: Iterable[str] = ()) -> Optional[ReportJobModel]:
+        excluded = set(exclude_users)
+        now = datetime.utcnow()
+        claimable = [
+            item
+            for item in self.storage.values()
+            if item["status"] in (ReportJobStatus.QUEUED, ReportJobStatus.RUNNING)
+            and not self._leased(item, now)
+            and item["user_id"] not in excluded
+        ]
+        if not claimable:
+            return None
+        item = min(claimable, key=lambda job: job["created_at"])
+        item.update(
+            {
+                "status": ReportJobStatus.RUNNING,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "claim_token": uuid4().hex,
+                "attempts": item.get("attempts", 0) + 1,
+            }
+        )
+        return ReportJobModel(**item)
+
+    def _claimed(self, job_id: str, claim_token: Optional[str]) -> Optional[dict[str, Any]]:
+        item = self.storage.get(job_id)
+        if item is None or (claim_token is not None and item.get("claim_token") != claim_token):
+            return None
+        return item
+
+    async def renew_lease(self, job_id: str, claim_token: str, lease_seconds: float) -> bool:
+        item = self._claimed(job_id, claim_token)
+        if item is None:
+            return False
+        item["lease_expires_at"] = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        return True
+
+    async def requeue(self, job_id: str, claim_token: str, count_attempt: bool = True) -> None:
+        item = self._claimed(job_id, claim_token)
+        if item is not None:
+            item.update(
+                {"status": ReportJobStatus.QUEUED, "progress": 0, "lease_expires_at": None, "claim_token": None}
+            )
+            if not count_attempt:
+                item["attempts"] -= 1
+
+    async def set_progress(
+        self, job_id: str, progress: int, total: Optional[int] = None, claim_token: Optional[str] = None
+    ) -> None:
+        item = self._claimed(job_id, claim_token)
+        if item is None:
+            return
+        item["progress"] = progress
+        if total is not None:
+            item["total"] = total
+
+    async def complete(self, job_id: str, report, claim_token: Optional[str] = None) -> None:
+        item = self._claimed(job_id, claim_token)
+        if item is not None:
+            item.update(
+                {
+                    "status": ReportJobStatus.COMPLETED,
+                    "progress": report.total_transactions,
+                    "report": report.model_dump(),
+                    "lease_expires_at": None,
+                }
+            )
+
+    async def fail(self, job_id: str, error: str, claim_token: Optional[str] = None) -> None:
+        item = self._claimed(job_id, claim_token)
+        if item is not None:
+            item.update({"status": ReportJobStatus.FAILED, "error": error, "lease_expires_at": None})
@@ -300,3 +300,27 @@ class TestFunctionalScenarios(unittest.IsolatedAsyncioTestCase):
         data = response.json()
         self.assertEqual(data["total_expenses"], 50)
         self.assertEqual(data["total_income"], 120)
+
+    async def test_batch_routes_return_entities_in_request_order(self):
+        user_id = await self._create_user()
+        savings = await self._create_account(user_id, name="Savings")
+        wallet = await self._create_account(user_id, name="Wallet")
+
+        accounts = await self.client.get("/api/v1/accounts/batch", params={"ids": f"{wallet},ghost,{savings}"})
+        users = await self.client.get("/api/v1/users/batch", params=[("ids", user_id), ("ids", user_id)])
+
+        self.assertEqual(accounts.status_code, 200)
+        self.assertEqual([item["name"] for item in accounts.json()["items"]], ["Wallet", "Savings"])
+        self.assertEqual(accounts.json()["missing_ids"], ["ghost"])
+        self.assertEqual([item["id"] for item in users.json()["items"]], [user_id])
+        self.assertEqual(users.json()["missing_ids"], [])
+
+    async def test_batch_routes_reject_empty_or_oversized_id_lists(self):
+        empty = await self.client.get("/api/v1/goals/batch", params={"ids": " , "})
+        oversized = await self.client.get(
+            "/api/v1/transactions/batch", params={"ids": ",".join(f"id-{index}" for index in range(101))}
+        )
+
+        self.assertEqual(empty.status_code, 422)
+        self.assertEqual(oversized.status_code, 422)
+        self.assertEqual(oversized.json()["detail"], "At most 100 ids can be fetched at once")
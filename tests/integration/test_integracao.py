@@ -6,26 +6,47 @@ import unittest
 from datetime import date
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from httpx import ASGITransport, AsyncClient
 
+from src.controllers.conditional import entity_etag
 from src.controllers.dependencies import (
     get_account_service,
+    get_budget_projection_service,
     get_budget_service,
+    get_goal_forecast_service,
     get_goal_service,
+    get_report_job_service,
     get_report_service,
+    get_statement_service,
     get_transaction_service,
     get_user_service,
 )
 from src.main import create_app
-from src.models import AccountCreate, AccountType
-from src.services import AccountService, BudgetService, GoalService, ReportService, TransactionService, UserService
+from src.models import AccountCreate, AccountModel, AccountType
+from src.services import (
+    AccountService,
+    BudgetProjectionService,
+    BudgetService,
+    GoalForecastService,
+    GoalService,
+    Invalidator,
+    ReportJobService,
+    ReportJobWorker,
+    ReportService,
+    StatementService,
+    TransactionService,
+    UserService,
+)
 from src.utils import FileManager
 from tests.fixtures.factories import make_budget_create, make_transaction_create, make_user_create
 from tests.fixtures.memory_repositories import (
     MemoryAccountRepository,
     MemoryBudgetRepository,
+    MemoryDataVersionRepository,
     MemoryGoalRepository,
+    MemoryReportJobRepository,
     MemoryTransactionRepository,
     MemoryUserRepository,
 )
@@ -36,31 +57,61 @@ class TestIntegrationFlows(unittest.IsolatedAsyncioTestCase):
         self.user_repository = MemoryUserRepository()
         self.account_repository = MemoryAccountRepository()
         self.budget_repository = MemoryBudgetRepository()
-        self.goal_repository = MemoryGoalRepository()
-        self.transaction_repository = MemoryTransactionRepository()
+        self.goal_repository = MemoryGoalRepository(account_repository=self.account_repository)
+        self.transaction_repository = MemoryTransactionRepository(self.account_repository, self.budget_repository)
+        self.version_repository = MemoryDataVersionRepository()
+        invalidator = Invalidator(self.version_repository)
         self.user_service = UserService(repository=self.user_repository)
-        self.account_service = AccountService(repository=self.account_repository, user_repository=self.user_repository)
-        self.budget_service = BudgetService(repository=self.budget_repository)
-        self.goal_service = GoalService(repository=self.goal_repository, account_repository=self.account_repository)
+        self.account_service = AccountService(
+            repository=self.account_repository,
+            user_repository=self.user_repository,
+            invalidator=invalidator,
+        )
+        self.budget_service = BudgetService(repository=self.budget_repository, invalidator=invalidator)
+        self.budget_projection_service = BudgetProjectionService(
+            repository=self.budget_repository,
+            transaction_repository=self.transaction_repository,
+        )
+        self.goal_service = GoalService(
+            repository=self.goal_repository,
+            account_repository=self.account_repository,
+            invalidator=invalidator,
+        )
+        self.goal_forecast_service = GoalForecastService(
+            repository=self.goal_repository,
+            transaction_repository=self.transaction_repository,
+        )
         self.temp_dir = TemporaryDirectory()
         self.report_service = ReportService(
             repository=self.transaction_repository,
             file_manager=FileManager(base_dir=Path(self.temp_dir.name)),
         )
+        self.statement_service = StatementService(
+            transaction_repository=self.transaction_repository,
+            version_repository=self.version_repository,
+            file_manager=FileManager(base_dir=Path(self.temp_dir.name)),
+        )
+        self.report_job_repository = MemoryReportJobRepository()
+        self.report_job_service = ReportJobService(repository=self.report_job_repository)
         self.transaction_service = TransactionService(
             repository=self.transaction_repository,
             account_repository=self.account_repository,
             user_repository=self.user_repository,
             budget_service=self.budget_service,
             goal_service=self.goal_service,
+            invalidator=invalidator,
         )
         self.app = create_app()
         self.app.dependency_overrides[get_user_service] = lambda: self.user_service
         self.app.dependency_overrides[get_account_service] = lambda: self.account_service
         self.app.dependency_overrides[get_budget_service] = lambda: self.budget_service
+        self.app.dependency_overrides[get_budget_projection_service] = lambda: self.budget_projection_service
         self.app.dependency_overrides[get_goal_service] = lambda: self.goal_service
+        self.app.dependency_overrides[get_goal_forecast_service] = lambda: self.goal_forecast_service
         self.app.dependency_overrides[get_transaction_service] = lambda: self.transaction_service
         self.app.dependency_overrides[get_report_service] = lambda: self.report_service
+        self.app.dependency_overrides[get_statement_service] = lambda: self.statement_service
+        self.app.dependency_overrides[get_report_job_service] = lambda: self.report_job_service
         transport = ASGITransport(app=self.app)
         self.client = AsyncClient(transport=transport, base_url="http://testserver")
 
@@ -106,6 +157,25 @@ class TestIntegrationFlows(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(summary.status_code, 200)
         self.assertEqual(summary.json()[0]["category"], "groceries")
 
+    async def test_budget_projection_endpoints(self):
+        user = await self.user_service.create_user(make_user_create())
+        account = await self.account_service.create_account(
+            AccountCreate(user_id=user.id, name="Wallet", institution="Bank", type=AccountType.CHECKING, balance=900)
+        )
+        budget = await self.budget_service.create_budget(make_budget_create(user_id=user.id, limit_amount=600))
+        await self.transaction_service.create_transaction(
+            make_transaction_create(user_id=user.id, account_id=account.id, category="groceries", amount=40)
+        )
+
+        single = await self.client.get(f"/api/v1/budgets/{budget.id}/projection")
+        batch = await self.client.get("/api/v1/budgets/projection", params={"user_id": user.id})
+
+        self.assertEqual(single.status_code, 200)
+        self.assertEqual(single.json()["spent_to_date"], 40)
+        self.assertGreaterEqual(single.json()["projected_spend"], 40)
+        self.assertEqual(batch.status_code, 200)
+        self.assertEqual([item["budget_id"] for item in batch.json()], [budget.id])
+
     async def test_transaction_search_returns_inserted_items(self):
         user = await self.user_service.create_user(make_user_create())
         account = await self.account_service.create_account(
@@ -170,6 +240,78 @@ class TestIntegrationFlows(unittest.IsolatedAsyncioTestCase):
         goal_response = await self.client.get(f"/api/v1/goals/{goal_id}")
         self.assertGreaterEqual(goal_response.json()["current_amount"], 120)
 
+    async def test_goal_forecast_endpoint_lists_user_goals(self):
+        user = await self.client.post("/api/v1/users", json=make_user_create().model_dump())
+        user_id = user.json()["id"]
+        account_payload = {
+            "user_id": user_id,
+            "name": "Savings",
+            "institution": "Bank",
+            "type": "checking",
+            "balance": 500,
+        }
+        account = await self.client.post("/api/v1/accounts", json=account_payload)
+        goal_payload = {
+            "user_id": user_id,
+            "account_id": account.json()["id"],
+            "name": "Car",
+            "target_amount": 1000,
+            "target_date": "2030-12-31",
+            "lock_funds": False,
+        }
+        goal = await self.client.post("/api/v1/goals", json=goal_payload)
+        tx_payload = {
+            "user_id": user_id,
+            "account_id": account.json()["id"],
+            "goal_id": goal.json()["id"],
+            "type": "expense",
+            "category": "goals",
+            "description": "Deposit",
+            "amount": 100,
+        }
+        await self.client.post("/api/v1/transactions", json=tx_payload)
+
+        response = await self.client.get("/api/v1/goals/forecast", params={"user_id": user_id})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body[0]["goal_id"], goal.json()["id"])
+        self.assertEqual(body[0]["contributions"], 1)
+        self.assertIsNotNone(body[0]["projected_completion_date"])
+
+    async def test_goal_routes_expand_account_balances(self):
+        user = await self.user_service.create_user(make_user_create())
+        account = await self.account_service.create_account(
+            AccountCreate(user_id=user.id, name="Vault", institution="Bank", type=AccountType.SAVINGS, balance=800)
+        )
+        await self.account_repository.update_goal_lock(account.id, 300)
+        goal_payload = {
+            "user_id": user.id,
+            "account_id": account.id,
+            "name": "House",
+            "target_amount": 5000,
+            "target_date": "2030-01-01",
+        }
+        goal = await self.client.post("/api/v1/goals", json=goal_payload)
+        goal_id = goal.json()["id"]
+
+        plain = await self.client.get("/api/v1/goals", params={"user_id": user.id})
+        expanded = await self.client.get("/api/v1/goals", params={"user_id": user.id, "expand": "account"})
+        single = await self.client.get(f"/api/v1/goals/{goal_id}", params={"expand": "account"})
+
+        self.assertNotIn("account", plain.json()[0])
+        account_view = expanded.json()[0]["account"]
+        self.assertEqual(account_view["id"], account.id)
+        self.assertEqual(account_view["balance"], 800)
+        self.assertEqual(account_view["goal_locked_amount"], 300)
+        self.assertEqual(account_view["available_balance"], 500)
+        self.assertEqual(single.json()["account"]["available_balance"], 500)
+
+    async def test_goal_expand_rejects_unknown_relation(self):
+        response = await self.client.get("/api/v1/goals", params={"user_id": "u", "expand": "budget"})
+
+        self.assertEqual(response.status_code, 422)
+
     async def test_report_endpoint_generates_payload(self):
         user = await self.user_service.create_user(make_user_create())
         account = await self.account_service.create_account(
@@ -193,6 +335,89 @@ class TestIntegrationFlows(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertGreaterEqual(response.json()["total_transactions"], 1)
 
+    async def test_report_endpoint_accepts_format(self):
+        user = await self.user_service.create_user(make_user_create())
+        account = await self.account_service.create_account(
+            AccountCreate(user_id=user.id, name="Format", institution="Bank", type=AccountType.CHECKING, balance=100)
+        )
+        await self.transaction_service.create_transaction(
+            make_transaction_create(user_id=user.id, account_id=account.id, amount=20, description="Lunch")
+        )
+
+        response = await self.client.get(f"/api/v1/reports/transactions/{user.id}", params={"format": "csv.gz"})
+        invalid = await self.client.get(f"/api/v1/reports/transactions/{user.id}", params={"format": "xlsx"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["format"], "csv.gz")
+        self.assertTrue(response.json()["file_path"].endswith(".csv.gz"))
+        self.assertGreater(response.json()["bytes_written"], 0)
+        self.assertEqual(invalid.status_code, 422)
+
+    async def test_monthly_statement_endpoint(self):
+        user = await self.user_service.create_user(make_user_create())
+        account = await self.account_service.create_account(
+            AccountCreate(user_id=user.id, name="Monthly", institution="Bank", type=AccountType.CHECKING, balance=300)
+        )
+        tx = await self.transaction_service.create_transaction(
+            make_transaction_create(user_id=user.id, account_id=account.id, amount=50, description="Groceries")
+        )
+        month = tx.event_date.strftime("%Y-%m")
+
+        response = await self.client.get(f"/api/v1/reports/statement/{user.id}", params={"month": month, "format": "csv"})
+        invalid = await self.client.get(f"/api/v1/reports/statement/{user.id}", params={"month": "2024-13"})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["total_expenses"], 50)
+        self.assertEqual(body["accounts"][0]["closing_balance"], 250)
+        self.assertEqual(body["accounts"][0]["opening_balance"], 300)
+        self.assertTrue(Path(body["file_path"]).exists())
+        self.assertEqual(invalid.status_code, 422)
+
+    async def test_report_download_streams_csv(self):
+        user = await self.user_service.create_user(make_user_create())
+        account = await self.account_service.create_account(
+            AccountCreate(user_id=user.id, name="Stream", institution="Bank", type=AccountType.CHECKING, balance=100)
+        )
+        await self.transaction_service.create_transaction(
+            make_transaction_create(user_id=user.id, account_id=account.id, amount=30, description="Taxi")
+        )
+
+        response = await self.client.get(f"/api/v1/reports/transactions/{user.id}/download")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/csv"))
+        self.assertIn("attachment", response.headers["content-disposition"])
+        lines = response.text.strip().splitlines()
+        self.assertTrue(lines[0].startswith("id,user_id"))
+        self.assertIn("Taxi", lines[1])
+        self.assertEqual(lines[-3], "# total_transactions,1")
+
+    async def test_report_job_lifecycle(self):
+        user = await self.user_service.create_user(make_user_create())
+        account = await self.account_service.create_account(
+            AccountCreate(user_id=user.id, name="Jobs", institution="Bank", type=AccountType.CHECKING, balance=100)
+        )
+        await self.transaction_service.create_transaction(
+            make_transaction_create(user_id=user.id, account_id=account.id, amount=15, description="Coffee")
+        )
+
+        created = await self.client.post("/api/v1/reports/jobs", json={"user_id": user.id})
+        job_id = created.json()["id"]
+        pending_download = await self.client.get(f"/api/v1/reports/jobs/{job_id}/download")
+        worker = ReportJobWorker(repository=self.report_job_repository, report_service=self.report_service)
+        await worker.run_pending()
+        status_response = await self.client.get(f"/api/v1/reports/jobs/{job_id}")
+        download = await self.client.get(f"/api/v1/reports/jobs/{job_id}/download")
+
+        self.assertEqual(created.status_code, 202)
+        self.assertEqual(created.json()["status"], "queued")
+        self.assertEqual(pending_download.status_code, 409)
+        self.assertEqual(status_response.json()["status"], "completed")
+        self.assertEqual(status_response.json()["progress"], 1)
+        self.assertEqual(download.status_code, 200)
+        self.assertIn("Coffee", download.text)
+
     async def test_budget_creation_overlap_returns_conflict(self):
         user = await self.user_service.create_user(make_user_create())
         payload = {
@@ -322,3 +547,73 @@ class TestIntegrationFlows(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(response.status_code, 404)
         self.assertIn("account", response.json()["detail"].lower())
+
+    async def test_collection_etags_answer_304_until_the_user_writes(self):
+        user = await self.user_service.create_user(make_user_create())
+        account_payload = {"user_id": user.id, "name": "Main", "institution": "Bank", "type": "checking"}
+        await self.client.post("/api/v1/accounts", json=account_payload)
+
+        first = await self.client.get("/api/v1/accounts", params={"user_id": user.id})
+        etag = first.headers["etag"]
+        self.assertEqual(first.headers["cache-control"], "private, no-cache")
+
+        with patch.object(self.account_service, "list_accounts", wraps=self.account_service.list_accounts) as listing:
+            cached = await self.client.get(
+                "/api/v1/accounts", params={"user_id": user.id}, headers={"If-None-Match": etag}
+            )
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(cached.content, b"")
+            listing.assert_not_called()
+
+        summary = await self.client.get(f"/api/v1/budgets/summary/{user.id}")
+        self.assertNotEqual(summary.headers["etag"], etag)
+
+        await self.client.post("/api/v1/accounts", json={**account_payload, "name": "Savings"})
+        changed = await self.client.get(
+            "/api/v1/accounts", params={"user_id": user.id}, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.json()), 2)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    async def test_entity_etags_follow_every_write(self):
+        user = await self.client.post("/api/v1/users", json=make_user_create().model_dump())
+        user_id = user.json()["id"]
+        account = await self.client.post(
+            "/api/v1/accounts",
+            json={"user_id": user_id, "name": "Main", "institution": "Bank", "type": "checking"},
+        )
+        path = f"/api/v1/accounts/{account.json()['id']}"
+
+        first = await self.client.get(path)
+        etag = first.headers["etag"]
+        self.assertEqual((await self.client.get(path, headers={"If-None-Match": etag})).status_code, 304)
+        self.assertEqual((await self.client.get(path, headers={"If-None-Match": f"W/\"x\", {etag}"})).status_code, 304)
+
+        await self.client.put(path, json={"name": "Renamed"})
+        renamed = await self.client.get(path, headers={"If-None-Match": etag})
+        self.assertEqual(renamed.status_code, 200)
+        self.assertEqual(renamed.json()["name"], "Renamed")
+
+        # Two writes within the clock resolution share updated_at but not the version.
+        account = AccountModel(**renamed.json())
+        rewritten = account.model_copy(update={"version": account.version + 1})
+        self.assertNotEqual(entity_etag(rewritten), entity_etag(account))
+
+    async def test_metrics_endpoint_serves_prometheus_text(self):
+        response = await self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn("# TYPE mongodb_pool_checkout_wait_seconds histogram", response.text)
+
+    async def test_metrics_endpoint_reports_route_latency(self):
+        await self.client.get("/api/v1/users")
+
+        response = await self.client.get("/metrics")
+
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="/api/v1/users",status="200"}',
+            response.text,
+        )
+        self.assertNotIn('route="/metrics"', response.text)
@@ -0,0 +1,55 @@
+"""Throughput benchmark for the multi-user batch export against a real MongoDB.
+
+Seeds 10k users with ``generate_demo_data.py`` into a scratch database, so it only
+runs when ``BENCHMARK_MONGODB_URI`` points to a disposable server.
+"""
+
+import asyncio
+import os
+from functools import partial
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from scripts.generate_demo_data import seed_demo_data
+from src.repositories import UserRepository
+from src.services.batch_exports import BatchExportService, export_user_batch
+from src.utils import FileManager
+
+BENCHMARK_URI = os.getenv("BENCHMARK_MONGODB_URI")
+BENCHMARK_DATABASE = "finance_manager_batch_benchmark"
+USERS = 10_000
+
+
+@pytest.mark.skipif(not BENCHMARK_URI, reason="BENCHMARK_MONGODB_URI is not set")
+def test_batch_export_ten_thousand_users(tmp_path):
+    async def scenario():
+        await seed_demo_data(
+            users=USERS,
+            accounts_per_user=1,
+            budgets_per_user=1,
+            goals_per_user=0,
+            transactions_per_account=20,
+            mongodb_uri=BENCHMARK_URI,
+            mongodb_database=BENCHMARK_DATABASE,
+            drop_existing=True,
+        )
+        client = AsyncIOMotorClient(BENCHMARK_URI)
+        try:
+            service = BatchExportService(
+                UserRepository(client[BENCHMARK_DATABASE]),
+                FileManager(base_dir=tmp_path),
+                batch_runner=partial(export_user_batch, mongodb_uri=BENCHMARK_URI, mongodb_database=BENCHMARK_DATABASE),
+            )
+            return await service.export_users(bundle=True)
+        finally:
+            client.close()
+
+    report = asyncio.run(scenario())
+
+    print(
+        f"\nbatch export: {report.total_transactions} rows in {report.elapsed_seconds}s "
+        f"({report.rows_per_second} rows/s)"
+    )
+    assert report.total_users == USERS
+    assert report.total_transactions == USERS * 20
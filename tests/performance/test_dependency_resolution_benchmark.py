@@ -0,0 +1,105 @@
+"""Benchmark: per-request cost of resolving the transaction service dependency."""
+
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.controllers import dependencies
+from src.repositories import (
+    AccountRepository,
+    BudgetRepository,
+    DataVersionRepository,
+    GoalRepository,
+    TransactionRepository,
+    UserRepository,
+)
+from src.services import TransactionService
+
+
+class _Collection:
+    def with_options(self, **kwargs):
+        return self
+
+
+class _Database:
+    def __getitem__(self, name):
+        return _Collection()
+
+
+DATABASE = _Database()
+
+
+def _per_request_app() -> FastAPI:
+    # The previous wiring: every request rebuilds the repositories and services of the chain.
+    def user_repo():
+        return UserRepository(DATABASE)
+
+    def account_repo():
+        return AccountRepository(DATABASE)
+
+    def transaction_repo():
+        return TransactionRepository(DATABASE)
+
+    def budget_repo():
+        return BudgetRepository(DATABASE)
+
+    def goal_repo():
+        return GoalRepository(DATABASE)
+
+    def version_repo():
+        return DataVersionRepository(DATABASE)
+
+    def budget_service(repo=Depends(budget_repo), versions=Depends(version_repo)):
+        return dependencies.build_budget_service(repo, versions)
+
+    def goal_service(repo=Depends(goal_repo), accounts=Depends(account_repo), versions=Depends(version_repo)):
+        return dependencies.build_goal_service(repo, accounts, versions)
+
+    def transaction_service(
+        repo=Depends(transaction_repo),
+        accounts=Depends(account_repo),
+        users=Depends(user_repo),
+        budgets=Depends(budget_service),
+        goals=Depends(goal_service),
+        versions=Depends(version_repo),
+    ):
+        return dependencies.build_transaction_service(repo, accounts, users, budgets, goals, versions)
+
+    app = FastAPI()
+
+    @app.get("/resolve")
+    async def resolve(service: TransactionService = Depends(transaction_service)):
+        return {"ok": True}
+
+    return app
+
+
+def _app_scoped_app() -> FastAPI:
+    app = FastAPI()
+    app.state.container = dependencies.ServiceContainer(DATABASE)
+
+    @app.get("/resolve")
+    async def resolve(service: TransactionService = Depends(dependencies.get_transaction_service)):
+        return {"ok": True}
+
+    return app
+
+
+@pytest.mark.parametrize("build_app", [_per_request_app, _app_scoped_app], ids=["per-request", "app-scoped"])
+def test_transaction_service_resolution(benchmark, build_app):
+    client = AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://testserver")
+    loop = asyncio.new_event_loop()
+
+    def request():
+        return loop.run_until_complete(client.get("/resolve"))
+
+    try:
+        benchmark.group = "dependency-resolution"
+        response = benchmark(request)
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+    assert response.status_code == 200
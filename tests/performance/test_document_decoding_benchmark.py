@@ -0,0 +1,70 @@
+"""Micro-benchmark: decoding 100k transaction documents into API dicts."""
+
+from datetime import datetime
+
+import bson
+import pytest
+from bson import ObjectId
+
+from src.utils import API_CODEC_OPTIONS, decode_document, serialize_document
+
+DOCUMENTS = 100_000
+
+
+@pytest.fixture(scope="module")
+def raw_documents() -> bytes:
+    now = datetime.utcnow()
+    return b"".join(
+        bson.encode(
+            {
+                "_id": ObjectId(),
+                "user_id": "perf-user",
+                "account_id": str(ObjectId()),
+                "goal_id": ObjectId(),
+                "amount": float(index),
+                "type": "expense",
+                "category": "groceries",
+                "date": now,
+                "tags": ["food", "weekly"],
+                "created_at": now,
+            }
+        )
+        for index in range(DOCUMENTS)
+    )
+
+
+def _previous_serialize_document(document):
+    # The copy-then-scan implementation the repositories used before the API codec.
+    payload = dict(document)
+    if "_id" in payload:
+        payload["id"] = str(payload.pop("_id"))
+    for key, value in list(payload.items()):
+        if isinstance(value, ObjectId):
+            payload[key] = str(value)
+    return payload
+
+
+def _default_codec_then_previous_serialize(raw: bytes) -> list[dict]:
+    return [_previous_serialize_document(document) for document in bson.decode_all(raw)]
+
+
+def _default_codec_then_serialize(raw: bytes) -> list[dict]:
+    return [serialize_document(document) for document in bson.decode_all(raw)]
+
+
+def _api_codec_then_rename(raw: bytes) -> list[dict]:
+    return [decode_document(document) for document in bson.decode_all(raw, API_CODEC_OPTIONS)]
+
+
+@pytest.mark.parametrize(
+    "decode",
+    [_default_codec_then_previous_serialize, _default_codec_then_serialize, _api_codec_then_rename],
+    ids=["previous-serialize", "default-codec+serialize_document", "api-codec+decode_document"],
+)
+def test_decode_100k_documents(benchmark, raw_documents, decode):
+    benchmark.group = "document-decoding"
+    documents = benchmark.pedantic(decode, args=(raw_documents,), rounds=3, iterations=1)
+
+    assert len(documents) == DOCUMENTS
+    assert isinstance(documents[0]["id"], str)
+    assert isinstance(documents[0]["goal_id"], str)
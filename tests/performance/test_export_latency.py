@@ -0,0 +1,66 @@
+"""Latency check: other endpoints stay responsive while a large export runs."""
+
+import asyncio
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from src.controllers.dependencies import get_report_service, get_user_service
+from src.main import create_app
+from src.services import ReportService
+from src.utils import FileManager
+from tests.fixtures.factories import make_transaction_model, make_user_model
+
+EXPORT_ROWS = 1_000_000
+
+
+class RepeatingTransactionRepository:
+    """Yields the same transaction many times to simulate a huge history cheaply."""
+
+    def __init__(self, rows: int) -> None:
+        self.rows = rows
+        self.transaction = make_transaction_model(user_id="bulk-user")
+
+    async def iterate(self, filters=None, batch_size: int = 500):
+        for _ in range(self.rows):
+            yield self.transaction
+
+
+async def _sample_latency(client: AsyncClient, samples: int) -> list[float]:
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = await client.get("/api/v1/users")
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+def test_latency_stays_flat_during_million_row_export(user_service, tmp_path):
+    async def scenario():
+        repository = RepeatingTransactionRepository(EXPORT_ROWS)
+        report_service = ReportService(repository, FileManager(base_dir=tmp_path))
+        await user_service.repository.create(make_user_model().model_dump())
+        app = create_app()
+        app.dependency_overrides[get_user_service] = lambda: user_service
+        app.dependency_overrides[get_report_service] = lambda: report_service
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            baseline = await _sample_latency(client, 20)
+            export = asyncio.create_task(client.get("/api/v1/reports/transactions/bulk-user", timeout=None))
+            await asyncio.sleep(0.05)
+            during = await _sample_latency(client, 50)
+            still_running = not export.done()
+            response = await export
+        return baseline, during, still_running, response
+
+    baseline, during, still_running, response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json()["total_transactions"] == EXPORT_ROWS
+    assert still_running, "export finished before latency samples were collected"
+    # A blocking export would stall these requests for seconds; allow only scheduling jitter.
+    assert statistics.median(during) < statistics.median(baseline) + 0.05
+    assert max(during) < 0.25
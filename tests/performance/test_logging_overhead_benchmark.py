@@ -0,0 +1,55 @@
+"""Per-request logging overhead with synchronous sinks versus enqueued sinks."""
+
+import contextlib
+import io
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import logger as logger_module
+
+LINES_PER_REQUEST = 5
+
+
+class SlowStream(io.StringIO):
+    """Console stand-in whose writes stall like a pipe under back-pressure."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return super().write(text)
+
+
+@pytest.fixture()
+def isolated_logger(tmp_path):
+    """Swap the application sinks for benchmark ones and restore them lazily afterwards."""
+
+    logger_module.logger.remove()
+    yield tmp_path
+    logger_module.logger.remove()
+    logger_module._CONFIGURED = False
+
+
+@pytest.mark.parametrize("console_delay", [0.0, 0.0002], ids=["fast-console", "stalled-console"])
+@pytest.mark.parametrize("enqueue", [False, True], ids=["sync", "enqueued"])
+def test_logging_overhead_per_request(isolated_logger, benchmark, enqueue, console_delay):
+    settings = SimpleNamespace(log_level="INFO", log_levels="", log_json=False, log_enqueue=enqueue)
+    with contextlib.redirect_stdout(SlowStream(console_delay)):
+        logger_module._add_sinks(settings, isolated_logger)
+        log = logger_module.logger.bind(component="benchmark")
+
+        def handle_request():
+            for index in range(LINES_PER_REQUEST):
+                log.info("Handled step {index} for {user}", index=index, user="perf-user")
+
+        benchmark.group = f"logging-{'stalled' if console_delay else 'fast'}-console"
+        benchmark(handle_request)
+        # Removing the handlers drains the background sink before the file is checked.
+        logger_module.logger.remove()
+
+    assert (isolated_logger / "app.log").stat().st_size > 0
@@ -0,0 +1,81 @@
+"""Benchmark: encoding a 10k-row transaction search response, then compressing it."""
+
+import asyncio
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.controllers.dependencies import get_transaction_service
+from src.main import create_app
+from src.middleware.compression import parse_encodings
+from src.models import TransactionModel
+from tests.fixtures.factories import make_transaction_model
+
+ROWS = 10_000
+
+
+@pytest.fixture(scope="module")
+def search_service():
+    service = MagicMock()
+    service.search_transactions = AsyncMock(
+        return_value=[make_transaction_model(user_id="perf-user", amount=index + 1) for index in range(ROWS)]
+    )
+    return service
+
+
+def _default_encoder_app(service) -> FastAPI:
+    # The route as it was before: FastAPI re-validates response_model and runs jsonable_encoder.
+    app = FastAPI()
+
+    @app.get("/api/v1/transactions/search", response_model=List[TransactionModel])
+    async def search(user_id: str) -> List[TransactionModel]:
+        return await service.search_transactions(user_id)
+
+    return app
+
+
+def _application(service) -> FastAPI:
+    app = create_app()
+    app.dependency_overrides[get_transaction_service] = lambda: service
+    return app
+
+
+def _run_search(benchmark, app: FastAPI, group: str, accept_encoding: str):
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver")
+    loop = asyncio.new_event_loop()
+    headers = {"Accept-Encoding": accept_encoding}
+
+    def search():
+        return loop.run_until_complete(
+            client.get("/api/v1/transactions/search", params={"user_id": "perf-user"}, headers=headers)
+        )
+
+    try:
+        benchmark.group = group
+        response = benchmark.pedantic(search, rounds=5, iterations=1, warmup_rounds=1)
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize("build_app", [_default_encoder_app, _application], ids=["default-encoder", "prevalidated"])
+def test_search_response_10k_rows(benchmark, search_service, build_app):
+    # identity keeps response compression out of the encoding comparison.
+    response = _run_search(benchmark, build_app(search_service), "search-response-10k", "identity")
+
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == ROWS
+
+
+@pytest.mark.parametrize("encoding", ["identity", *parse_encodings("gzip,br,zstd")])
+def test_search_response_10k_rows_compressed(benchmark, search_service, encoding):
+    response = _run_search(benchmark, _application(search_service), "search-response-10k-compression", encoding)
+
+    assert response.headers.get("content-encoding", "identity") == encoding
+    benchmark.extra_info["wire_bytes"] = int(response.headers["content-length"])
@@ -0,0 +1,87 @@
+"""Benchmark: cold start of the API and the CLIs, measured in fresh interpreters."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Imports that must stay off the start-up path of each entry point.
+LAZY_IMPORTS = {
+    "src.utils": ("motor", "loguru", "numpy", "src.models"),
+    "src.main": ("numpy",),
+    "scripts.cli": ("httpx", "src"),
+    "scripts.menu": ("httpx", "src"),
+}
+
+FIRST_REQUEST = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from httpx import ASGITransport, AsyncClient
+from src.main import create_app
+app = create_app()
+built = time.perf_counter()
+
+async def first_request():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        return (await client.get("/metrics")).status_code
+
+status = asyncio.run(first_request())
+done = time.perf_counter()
+print(json.dumps({"status": status, "build": built - started, "total": done - started}))
+"""
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True, timeout=120
+    )
+
+
+def import_breakdown(module: str, top: int = 10) -> list[tuple[str, int]]:
+    """Return the ``top`` top-level packages by self import time in microseconds when importing ``module``."""
+
+    stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+    totals: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, _, name = line[len("import time:") :].split("|")
+        if own.strip().isdigit():
+            package = name.strip().split(".")[0]
+            totals[package] = totals.get(package, 0) + int(own)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+@pytest.mark.parametrize("module", sorted(LAZY_IMPORTS))
+def test_entry_point_imports_stay_lazy(module):
+    probe = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    loaded = set(json.loads(_python("-c", probe).stdout))
+
+    assert not [heavy for heavy in LAZY_IMPORTS[module] if heavy in loaded]
+
+
+def test_importing_main_does_not_build_the_app():
+    probe = "import src.main as main; print('app' in vars(main)); print(type(main.app).__name__)"
+
+    assert _python("-c", probe).stdout.split() == ["False", "FastAPI"]
+
+
+@pytest.mark.parametrize("module", ["src.main", "scripts.cli"])
+def test_import_time(benchmark, module):
+    benchmark.group = "cold-start"
+    benchmark.extra_info["breakdown_us"] = dict(import_breakdown(module))
+
+    benchmark.pedantic(_python, args=("-c", f"import {module}"), rounds=3, iterations=1)
+
+
+def test_time_to_first_request(benchmark):
+    benchmark.group = "cold-start"
+
+    result = benchmark.pedantic(lambda: json.loads(_python("-c", FIRST_REQUEST).stdout), rounds=3, iterations=1)
+
+    benchmark.extra_info.update(build_seconds=result["build"], first_request_seconds=result["total"])
+    assert result["status"] == 200
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import unittest
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -10,55 +11,86 @@ from src.controllers import dependencies
 
 
 class TestDependencyProviders(unittest.TestCase):
-    def test_repository_providers_use_database_dependency(self):
-        repo_paths = {
-            "get_user_repository": "UserRepository",
-            "get_account_repository": "AccountRepository",
-            "get_transaction_repository": "TransactionRepository",
-            "get_budget_repository": "BudgetRepository",
-            "get_goal_repository": "GoalRepository",
+    def test_container_builds_repositories_once_on_one_database(self):
+        repo_attrs = {
+            "user_repository": "UserRepository",
+            "account_repository": "AccountRepository",
+            "transaction_repository": "TransactionRepository",
+            "budget_repository": "BudgetRepository",
+            "goal_repository": "GoalRepository",
+            "report_job_repository": "ReportJobRepository",
+            "export_watermark_repository": "ExportWatermarkRepository",
+            "data_version_repository": "DataVersionRepository",
         }
-        for provider_name, repo_attr in repo_paths.items():
-            with self.subTest(provider=provider_name):
-                fake_db = SimpleNamespace()
-                with patch.object(dependencies, "get_database", return_value=fake_db) as mock_get_db, patch.object(
-                    dependencies, repo_attr
-                ) as mock_repo:
-                    instance = getattr(dependencies, provider_name)()
-                mock_get_db.assert_called_once()
-                mock_repo.assert_called_once_with(fake_db)
-                self.assertIs(instance, mock_repo.return_value)
-
-    def test_service_providers_bind_dependencies(self):
+        fake_db = SimpleNamespace()
+        patches = {name: patch.object(dependencies, name) for name in repo_attrs.values()}
+        mocks = {name: patcher.start() for name, patcher in patches.items()}
+        self.addCleanup(patch.stopall)
+
+        container = dependencies.ServiceContainer(fake_db)
+
+        for attribute, repo_name in repo_attrs.items():
+            with self.subTest(repository=repo_name):
+                mocks[repo_name].assert_called_once_with(fake_db)
+                self.assertIs(getattr(container, attribute), mocks[repo_name].return_value)
+
+    def test_providers_return_app_scoped_instances(self):
+        app = SimpleNamespace(state=SimpleNamespace())
+        request = SimpleNamespace(app=app)
+
+        async def resolve():
+            first = await dependencies.get_transaction_service(request)
+            second = await dependencies.get_transaction_service(request)
+            return (
+                first,
+                second,
+                await dependencies.get_transaction_repository(request),
+                await dependencies.get_budget_service(request),
+                await dependencies.get_goal_service(request),
+            )
+
+        with patch.object(dependencies, "get_database", return_value=MagicMock()) as mock_get_db:
+            first, second, repository, budget_service, goal_service = asyncio.run(resolve())
+
+        mock_get_db.assert_called_once()
+        self.assertIs(first, second)
+        self.assertIs(first.repository, repository)
+        self.assertIs(first.budget_service, budget_service)
+        self.assertIs(first.goal_service, goal_service)
+
+    def test_service_builders_bind_dependencies(self):
+        fake_invalidator = object()
         with patch.object(dependencies, "UserService") as mock_user_service:
             fake_repo = object()
-            service = dependencies.get_user_service(repo=fake_repo)
+            service = dependencies.build_user_service(repo=fake_repo)
             mock_user_service.assert_called_once_with(repository=fake_repo)
             self.assertIs(service, mock_user_service.return_value)
 
         with patch.object(dependencies, "AccountService") as mock_account_service:
             fake_repo = object()
             fake_user_repo = object()
-            service = dependencies.get_account_service(repo=fake_repo, user_repo=fake_user_repo)
+            service = dependencies.build_account_service(
+                repo=fake_repo, user_repo=fake_user_repo, invalidator=fake_invalidator
+            )
             mock_account_service.assert_called_once_with(
-                repository=fake_repo,
-                user_repository=fake_user_repo,
+                repository=fake_repo, user_repository=fake_user_repo, invalidator=fake_invalidator
             )
             self.assertIs(service, mock_account_service.return_value)
 
         with patch.object(dependencies, "BudgetService") as mock_budget_service:
             fake_repo = object()
-            service = dependencies.get_budget_service(repo=fake_repo)
-            mock_budget_service.assert_called_once_with(repository=fake_repo)
+            service = dependencies.build_budget_service(repo=fake_repo, invalidator=fake_invalidator)
+            mock_budget_service.assert_called_once_with(repository=fake_repo, invalidator=fake_invalidator)
             self.assertIs(service, mock_budget_service.return_value)
 
         with patch.object(dependencies, "GoalService") as mock_goal_service:
             fake_repo = object()
             fake_account_repo = object()
-            service = dependencies.get_goal_service(repo=fake_repo, account_repo=fake_account_repo)
+            service = dependencies.build_goal_service(
+                repo=fake_repo, account_repo=fake_account_repo, invalidator=fake_invalidator
+            )
             mock_goal_service.assert_called_once_with(
-                repository=fake_repo,
-                account_repository=fake_account_repo,
+                repository=fake_repo, account_repository=fake_account_repo, invalidator=fake_invalidator
             )
             self.assertIs(service, mock_goal_service.return_value)
 
@@ -69,24 +101,87 @@ class TestDependencyProviders(unittest.TestCase):
                 "user_repo": object(),
                 "budget_service": object(),
                 "goal_service": object(),
+                "invalidator": fake_invalidator,
             }
-            service = dependencies.get_transaction_service(**kwargs)
+            service = dependencies.build_transaction_service(**kwargs)
             mock_transaction_service.assert_called_once_with(
                 repository=kwargs["repo"],
                 account_repository=kwargs["account_repo"],
                 user_repository=kwargs["user_repo"],
                 budget_service=kwargs["budget_service"],
                 goal_service=kwargs["goal_service"],
+                invalidator=fake_invalidator,
             )
             self.assertIs(service, mock_transaction_service.return_value)
 
+    def test_writing_services_share_one_invalidator(self):
+        with patch.object(dependencies, "DataVersionRepository") as mock_version_repository:
+            container = dependencies.ServiceContainer(MagicMock())
+
+        invalidator = container.invalidator
+        self.assertIs(invalidator.version_repository, mock_version_repository.return_value)
+        self.assertIs(invalidator.result_cache, container.result_cache)
+        for service in (
+            container.account_service,
+            container.budget_service,
+            container.goal_service,
+            container.transaction_service,
+        ):
+            self.assertIs(service.invalidator, invalidator)
+
     def test_report_service_builds_file_manager(self):
         fake_repo = MagicMock()
+        fake_watermark_repo = MagicMock()
+        fake_version_repo = MagicMock()
         with patch.object(dependencies, "FileManager") as mock_file_manager, patch.object(
             dependencies, "ReportService"
         ) as mock_report_service:
-            result = dependencies.get_report_service(repo=fake_repo)
+            result = dependencies.build_report_service(
+                repo=fake_repo, watermark_repo=fake_watermark_repo, version_repo=fake_version_repo
+            )
 
         mock_file_manager.assert_called_once()
-        mock_report_service.assert_called_once_with(repository=fake_repo, file_manager=mock_file_manager.return_value)
+        mock_report_service.assert_called_once_with(
+            repository=fake_repo,
+            file_manager=mock_file_manager.return_value,
+            watermark_repository=fake_watermark_repo,
+            version_repository=fake_version_repo,
+        )
         self.assertIs(result, mock_report_service.return_value)
+
+    def test_batch_export_service_uses_user_repository(self):
+        fake_repo = MagicMock()
+        with patch.object(dependencies, "BatchExportService") as mock_service:
+            result = dependencies.build_batch_export_service(user_repo=fake_repo)
+
+        mock_service.assert_called_once_with(user_repository=fake_repo)
+        self.assertIs(result, mock_service.return_value)
+
+    def test_goal_forecast_service_uses_data_versions(self):
+        fake_repo, fake_transaction_repo, fake_version_repo = MagicMock(), MagicMock(), MagicMock()
+        with patch.object(dependencies, "GoalForecastService") as mock_service:
+            result = dependencies.build_goal_forecast_service(
+                repo=fake_repo, transaction_repo=fake_transaction_repo, version_repo=fake_version_repo
+            )
+
+        mock_service.assert_called_once_with(
+            repository=fake_repo,
+            transaction_repository=fake_transaction_repo,
+            version_repository=fake_version_repo,
+        )
+        self.assertIs(result, mock_service.return_value)
+
+    def test_statement_service_builds_file_manager(self):
+        fake_repo = MagicMock()
+        fake_version_repo = MagicMock()
+        with patch.object(dependencies, "FileManager") as mock_file_manager, patch.object(
+            dependencies, "StatementService"
+        ) as mock_service:
+            result = dependencies.build_statement_service(repo=fake_repo, version_repo=fake_version_repo)
+
+        mock_service.assert_called_once_with(
+            transaction_repository=fake_repo,
+            version_repository=fake_version_repo,
+            file_manager=mock_file_manager.return_value,
+        )
+        self.assertIs(result, mock_service.return_value)
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import unittest
-from datetime import datetime
+from datetime import date, datetime
 from types import SimpleNamespace
 from typing import Any, Dict, List
-
-from src.models import MongoBaseModel, TransactionFilter
-from src.repositories import TransactionRepository
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from src.models import MongoBaseModel, ReportJobStatus, TransactionFilter
+from src.repositories import (
+    DataVersionRepository,
+    ExportWatermarkRepository,
+    GoalRepository,
+    ReportJobRepository,
+    TransactionRepository,
+)
 from src.repositories.base import AbstractRepository
+from src.utils import API_CODEC_OPTIONS
 
 
 class DummyModel(MongoBaseModel):
@@ -21,6 +32,12 @@ class FakeCursor:
         self._docs = [doc.copy() for doc in documents]
         self._iter = iter(self._docs)
 
+    def batch_size(self, size: int):
+        return self
+
+    async def to_list(self, length=None):
+        return self._docs[:length] if length else list(self._docs)
+
     def sort(self, field: str, direction: int):
         reverse = direction < 0
         self._docs.sort(key=lambda doc: doc.get(field), reverse=reverse)
@@ -49,6 +66,11 @@ class FakeAggregation:
 class FakeCollection:
     def __init__(self):
         self.documents: Dict[str, dict[str, Any]] = {}
+        self.codec_options = None
+
+    def with_options(self, codec_options=None, **kwargs):
+        self.codec_options = codec_options
+        return self
 
     @staticmethod
     def _match(doc: dict[str, Any], filters: dict[str, Any]) -> bool:
@@ -60,6 +82,9 @@ class FakeCollection:
                     target = doc.get(key, [])
                     if not set(value["$all"]).issubset(set(target)):
                         return False
+                elif "$in" in value:
+                    if doc.get(key) not in value["$in"]:
+                        return False
                 else:
                     lower = value.get("$gte")
                     upper = value.get("$lte")
@@ -99,6 +124,8 @@ class FakeCollection:
         if not document:
             return
         document.update(payload.get("$set", {}))
+        for key, delta in payload.get("$inc", {}).items():
+            document[key] = document.get(key, 0) + delta
         self.documents[str(document["_id"])] = document
 
     async def delete_one(self, query: dict[str, Any]):
@@ -134,11 +161,19 @@ class DummyRepository(AbstractRepository[DummyModel]):
         return entity_id
 
 
+class ObjectIdRepository(AbstractRepository[DummyModel]):
+    collection_name = "dummy_object_ids"
+    model = DummyModel
+
+
 class TestAbstractRepository(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         self.database = FakeDatabase()
         self.repository = DummyRepository(self.database)
 
+    async def test_collection_decodes_with_api_codec_options(self):
+        self.assertIs(self.repository.collection.codec_options, API_CODEC_OPTIONS)
+
     async def test_create_and_get_by_id(self):
         created = await self.repository.create({"id": "ignored", "value": "alpha"})
         self.assertEqual(created.value, "alpha")
@@ -154,12 +189,43 @@ class TestAbstractRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(filtered), 1)
         self.assertTrue(await self.repository.exists({"value": "keep"}))
 
+    async def test_iterate_streams_matching_models(self):
+        await self.repository.create({"value": "keep"})
+        await self.repository.create({"value": "other"})
+
+        values = [model.value async for model in self.repository.iterate({"value": "keep"})]
+
+        self.assertEqual(values, ["keep"])
+
+    async def test_get_many_keeps_request_order_and_reports_missing_ids(self):
+        first = await self.repository.create({"value": "first"})
+        second = await self.repository.create({"value": "second"})
+        self.repository.collection.find = MagicMock(wraps=self.repository.collection.find)
+
+        items, missing = await self.repository.get_many([second.id, "ghost", first.id, second.id])
+
+        self.assertEqual([item.value for item in items], ["second", "first"])
+        self.assertEqual(missing, ["ghost"])
+        self.repository.collection.find.assert_called_once_with({"_id": {"$in": [second.id, "ghost", first.id]}})
+
+    async def test_get_many_reports_malformed_ids_without_querying_them(self):
+        repository = ObjectIdRepository(self.database)
+        valid_id = "64b7f0c2a1b2c3d4e5f60718"
+        repository.collection.find = MagicMock(return_value=FakeCursor([]))
+
+        items, missing = await repository.get_many(["not-an-id", valid_id])
+
+        self.assertEqual((items, missing), ([], ["not-an-id", valid_id]))
+        repository.collection.find.assert_called_once_with({"_id": {"$in": [ObjectId(valid_id)]}})
+
     async def test_update_and_delete(self):
         created = await self.repository.create({"value": "initial"})
         updated = await self.repository.update(created.id, {"value": "updated"})
         self.assertIsNotNone(updated)
         self.assertEqual(updated.value, "updated")
         self.assertIsNotNone(updated.updated_at)
+        self.assertEqual((created.version, updated.version), (0, 1))
+        self.assertEqual((await self.repository.update(created.id, {"version": 0})).version, 2)
 
         deleted = await self.repository.delete(created.id)
         self.assertTrue(deleted)
@@ -222,3 +288,228 @@ class TestTransactionRepository(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(totals["income"], 120)
         self.assertEqual(totals["expense"], 50)
+
+    async def test_changes_at_the_watermark_are_ordered_by_id_for_both_timestamps(self):
+        since = datetime(2024, 1, 2)
+        find = MagicMock(return_value=FakeCursor([]))
+        self.repository.collection.find = find
+
+        _ = [tx async for tx in self.repository.iterate_changed_since("user-1", since=since, after_id="tx-5")]
+
+        branches = find.call_args.args[0]["$or"]
+        self.assertIn({"created_at": since, "_id": {"$gt": "tx-5"}}, branches)
+        self.assertIn({"updated_at": since, "_id": {"$gt": "tx-5"}}, branches)
+
+
+class PipelineCollection:
+    def __init__(self, rows: List[dict[str, Any]]):
+        self.rows = rows
+        self.pipelines: List[list[dict[str, Any]]] = []
+
+    def with_options(self, **kwargs):
+        return self
+
+    def aggregate(self, pipeline: list[dict[str, Any]]):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.rows)
+
+
+class TestGoalRepositoryLookup(unittest.IsolatedAsyncioTestCase):
+    async def test_list_with_account_joins_accounts_in_one_aggregation(self):
+        row = {
+            "_id": "goal-1",
+            "user_id": "user-1",
+            "account_id": "acc-1",
+            "name": "Trip",
+            "target_amount": 1000.0,
+            "target_date": datetime(2030, 1, 1).date(),
+            "account": {
+                "_id": "acc-1",
+                "name": "Main",
+                "balance": 500.0,
+                "goal_locked_amount": 100.0,
+                "available_balance": 400.0,
+            },
+        }
+        collection = PipelineCollection([row])
+        repository = GoalRepository({"goals": collection})
+
+        goals = await repository.list_with_account({"user_id": "user-1"})
+
+        self.assertEqual(len(collection.pipelines), 1)
+        stages = [next(iter(stage)) for stage in collection.pipelines[0]]
+        self.assertEqual(stages, ["$match", "$lookup", "$unwind"])
+        self.assertEqual(collection.pipelines[0][1]["$lookup"]["from"], "accounts")
+        self.assertEqual(goals[0].account.id, "acc-1")
+        self.assertEqual(goals[0].account.available_balance, 400.0)
+
+
+class TestTransactionRepositoryStatement(unittest.IsolatedAsyncioTestCase):
+    async def test_monthly_statement_uses_one_faceted_aggregation(self):
+        facets = {
+            "pivot": [{"_id": {"category": "food", "type": "expense"}, "total": 30, "count": 2}],
+            "flows": [{"_id": "acc-1", "inflow": 100, "outflow": 30, "after": 10}],
+            "accounts": [{"_source": "account", "account_id": "acc-1", "name": "Main", "balance": 500}],
+            "budgets": [],
+        }
+        collection = PipelineCollection([facets])
+        repository = TransactionRepository({"transactions": collection})
+
+        data = await repository.monthly_statement(
+            "user-1", datetime(2024, 5, 1), datetime(2024, 6, 1), date(2024, 5, 1), date(2024, 5, 31)
+        )
+
+        self.assertEqual(len(collection.pipelines), 1)
+        stages = [next(iter(stage)) for stage in collection.pipelines[0]]
+        self.assertEqual(stages, ["$match", "$unionWith", "$unionWith", "$facet"])
+        self.assertEqual(
+            [stage["$unionWith"]["coll"] for stage in collection.pipelines[0][1:3]], ["accounts", "budgets"]
+        )
+        self.assertEqual(data["pivot"], [{"category": "food", "type": "expense", "total": 30.0, "count": 2}])
+        self.assertEqual(data["flows"]["acc-1"], {"inflow": 100.0, "outflow": 30.0, "after": 10.0})
+        self.assertEqual(data["accounts"][0]["balance"], 500.0)
+
+
+class VersionCollection:
+    def __init__(self):
+        self.versions: Dict[str, int] = {}
+        self.reads = 0
+
+    def with_options(self, **kwargs):
+        return self
+
+    async def find_one(self, filters, projection=None):
+        self.reads += 1
+        version = self.versions.get(filters["user_id"])
+        return {"version": version} if version is not None else None
+
+    async def find_one_and_update(self, filters, update, upsert=False, return_document=None):
+        user_id = filters["user_id"]
+        self.versions[user_id] = self.versions.get(user_id, 0) + update["$inc"]["version"]
+        return {"version": self.versions[user_id]}
+
+
+class TestDataVersionRepositoryCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.collection = VersionCollection()
+        self.repository = DataVersionRepository({"data_versions": self.collection}, cache_size=2)
+
+    async def test_max_age_serves_recent_versions_without_a_query(self):
+        self.assertEqual(await self.repository.get_version("user-1", max_age=60), 0)
+        self.assertEqual(await self.repository.bump("user-1"), 1)
+
+        self.assertEqual(await self.repository.get_version("user-1", max_age=60), 1)
+        self.assertEqual(self.collection.reads, 1)
+
+        self.collection.versions["user-1"] = 5  # written by another instance
+        self.assertEqual(await self.repository.get_version("user-1"), 5)
+        self.assertEqual(self.collection.reads, 2)
+
+    async def test_remembered_versions_are_bounded_and_never_move_backwards(self):
+        await self.repository.bump("user-1")
+        await self.repository.bump("user-1")
+        self.collection.versions["user-1"] = 1  # a read that raced with the bumps
+        self.assertEqual(await self.repository.get_version("user-1"), 1)
+        self.assertEqual(await self.repository.get_version("user-1", max_age=60), 2)
+
+        await self.repository.get_version("user-2")
+        await self.repository.get_version("user-3")
+        reads = self.collection.reads
+        await self.repository.get_version("user-1", max_age=60)
+        self.assertEqual(self.collection.reads, reads + 1)
+
+    async def test_user_id_is_uniquely_indexed_replacing_an_older_non_unique_index(self):
+        self.collection.create_index = AsyncMock(side_effect=[OperationFailure("conflict", code=86), None])
+        self.collection.drop_index = AsyncMock()
+
+        await self.repository.ensure_indexes()
+
+        self.collection.drop_index.assert_awaited_once_with([("user_id", 1)])
+        self.collection.create_index.assert_awaited_with([("user_id", 1)], unique=True)
+        self.assertEqual(self.collection.create_index.await_count, 2)
+
+    async def test_bump_retries_after_losing_the_first_insert_race(self):
+        upsert = self.collection.find_one_and_update
+        attempts = []
+
+        async def racing(*args, **kwargs):
+            attempts.append(args)
+            if len(attempts) == 1:
+                raise DuplicateKeyError("E11000 duplicate key")
+            return await upsert(*args, **kwargs)
+
+        self.collection.find_one_and_update = racing
+
+        self.assertEqual(await self.repository.bump("user-1"), 1)
+        self.assertEqual(len(attempts), 2)
+
+
+class TestExportWatermarkRepository(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.collection = MagicMock()
+        self.collection.with_options.return_value = self.collection
+        self.repository = ExportWatermarkRepository({"export_watermarks": self.collection})
+
+    async def test_user_id_is_uniquely_indexed(self):
+        self.collection.create_index = AsyncMock()
+
+        await self.repository.ensure_indexes()
+
+        self.collection.create_index.assert_awaited_once_with([("user_id", 1)], unique=True)
+
+    async def test_save_retries_after_losing_the_first_insert_race(self):
+        saved = {"_id": ObjectId(), "user_id": "u1", "changed_at": datetime(2024, 1, 1), "last_id": "t1"}
+        self.collection.find_one_and_update = AsyncMock(side_effect=[DuplicateKeyError("E11000"), saved])
+
+        watermark = await self.repository.save("u1", datetime(2024, 1, 1), "t1", "/tmp/report.csv")
+
+        self.assertEqual(self.collection.find_one_and_update.await_count, 2)
+        self.assertEqual(watermark.last_id, "t1")
+
+
+class TestReportJobRepositoryLeases(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.collection = MagicMock()
+        self.collection.with_options.return_value = self.collection
+        self.repository = ReportJobRepository({"report_jobs": self.collection})
+        self.job_id = str(ObjectId())
+
+    async def test_claim_takes_queued_jobs_or_running_jobs_with_an_expired_lease(self):
+        self.collection.find_one_and_update = AsyncMock(
+            return_value={"_id": self.job_id, "user_id": "u1", "kind": "transactions_csv", "status": "running"}
+        )
+
+        job = await self.repository.claim_next(30.0, exclude_users=["busy"])
+
+        query, update = self.collection.find_one_and_update.call_args.args
+        queued, expired = query["$or"]
+        self.assertEqual(queued, {"status": ReportJobStatus.QUEUED.value})
+        self.assertEqual(expired["status"], ReportJobStatus.RUNNING.value)
+        self.assertIn("$not", expired["lease_expires_at"])
+        self.assertEqual(query["user_id"], {"$nin": ["busy"]})
+        self.assertEqual(update["$inc"], {"attempts": 1})
+        lease = update["$set"]["lease_expires_at"] - update["$set"]["started_at"]
+        self.assertEqual(lease.total_seconds(), 30.0)
+        self.assertEqual(job.id, self.job_id)
+
+    async def test_claim_and_running_count_queries_are_indexed(self):
+        self.collection.create_index = AsyncMock()
+
+        await self.repository.ensure_indexes()
+
+        created = [call.args[0] for call in self.collection.create_index.await_args_list]
+        self.assertIn([("status", 1), ("created_at", 1)], created)
+        self.assertIn([("status", 1), ("lease_expires_at", 1)], created)
+        self.assertIn([("user_id", 1), ("status", 1)], created)
+
+    async def test_updates_only_apply_while_the_claim_token_owns_the_job(self):
+        self.collection.update_one = AsyncMock(return_value=SimpleNamespace(matched_count=0))
+
+        self.assertFalse(await self.repository.renew_lease(self.job_id, "stale", 30.0))
+        await self.repository.requeue(self.job_id, "stale")
+
+        for call in self.collection.update_one.call_args_list:
+            self.assertEqual(call.args[0], {"_id": ObjectId(self.job_id), "claim_token": "stale"})
+        requeue = self.collection.update_one.call_args_list[1].args[1]
+        self.assertEqual(requeue["$set"]["status"], ReportJobStatus.QUEUED.value)
+        self.assertIn("lease_expires_at", requeue["$unset"])
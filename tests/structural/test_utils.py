@@ -2,15 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
+import io
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from bson import ObjectId
+from bson import BSON, ObjectId
 
-from src.utils import database, logger as logger_module, serializers
+from src.utils import (
+    command_monitoring,
+    database,
+    logger as logger_module,
+    metrics,
+    result_cache,
+    serializers,
+    single_flight,
+)
 
 
 class TestDatabaseHelpers(unittest.TestCase):
@@ -20,14 +32,83 @@ class TestDatabaseHelpers(unittest.TestCase):
     @patch("src.utils.database.AsyncIOMotorClient")
     @patch("src.utils.database.get_settings")
     def test_get_client_is_cached(self, mock_get_settings, mock_motor_client):
-        settings = SimpleNamespace(mongodb_uri="mongodb://example", mongodb_database="finance")
+        settings = self._settings()
         mock_get_settings.return_value = settings
 
         first_client = database._get_client()
         second_client = database._get_client()
 
         self.assertIs(first_client, second_client)
-        mock_motor_client.assert_called_once_with(settings.mongodb_uri)
+        mock_motor_client.assert_called_once()
+        self.assertEqual(mock_motor_client.call_args.args, (settings.mongodb_uri,))
+        self.assertEqual(mock_motor_client.call_args.kwargs["maxPoolSize"], 100)
+
+    @staticmethod
+    def _settings(**overrides):
+        values = dict(
+            mongodb_uri="mongodb://example",
+            mongodb_database="finance",
+            mongodb_max_pool_size=100,
+            mongodb_min_pool_size=0,
+            mongodb_max_idle_time_ms=None,
+            mongodb_server_selection_timeout_ms=30_000,
+            mongodb_wait_queue_timeout_ms=None,
+            mongodb_compressors="",
+            mongodb_command_monitoring=True,
+            mongodb_command_reply_bytes=False,
+            mongodb_explain_slow_queries=False,
+            benchmark_threshold_ms=500,
+        )
+        values.update(overrides)
+        return SimpleNamespace(**values)
+
+    def test_client_options_include_only_configured_values(self):
+        options = database.client_options(self._settings())
+
+        self.assertEqual(options["minPoolSize"], 0)
+        self.assertEqual(options["serverSelectionTimeoutMS"], 30_000)
+        self.assertNotIn("maxIdleTimeMS", options)
+        self.assertNotIn("waitQueueTimeoutMS", options)
+        self.assertNotIn("compressors", options)
+        self.assertIsInstance(options["event_listeners"][0], database.PoolMetricsListener)
+        self.assertIsInstance(options["event_listeners"][1], command_monitoring.CommandMetricsListener)
+        self.assertIsNone(options["event_listeners"][1].explain_runner)
+
+        tuned = database.client_options(
+            self._settings(
+                mongodb_max_idle_time_ms=60_000,
+                mongodb_wait_queue_timeout_ms=500,
+                mongodb_compressors="zstd",
+            )
+        )
+        self.assertEqual(tuned["maxIdleTimeMS"], 60_000)
+        self.assertEqual(tuned["waitQueueTimeoutMS"], 500)
+        self.assertEqual(tuned["compressors"], "zstd")
+
+    @patch("src.utils.database.AsyncIOMotorClient")
+    @patch("src.utils.database.get_settings")
+    def test_close_client_closes_and_drops_cached_client(self, mock_get_settings, mock_motor_client):
+        mock_get_settings.return_value = self._settings()
+        client = database._get_client()
+
+        database.close_client()
+        database.close_client()
+
+        client.close.assert_called_once()
+        self.assertEqual(database._get_client.cache_info().currsize, 0)
+
+    def test_pool_listener_records_checkout_wait_and_failures(self):
+        listener = database.PoolMetricsListener()
+        address = ("pool-test", 27017)
+        count, _ = database.POOL_CHECKOUT_WAIT.snapshot(address="pool-test:27017")
+
+        listener.connection_checked_out(SimpleNamespace(address=address, duration=0.02))
+        listener.connection_check_out_failed(SimpleNamespace(address=address, duration=0.5, reason="timeout"))
+        listener.connection_checked_in(SimpleNamespace(address=address))
+
+        self.assertEqual(database.POOL_CHECKOUT_WAIT.snapshot(address="pool-test:27017")[0], count + 2)
+        self.assertEqual(database.POOL_CHECKOUT_FAILURES.value(address="pool-test:27017", reason="timeout"), 1)
+        self.assertEqual(database.POOL_CONNECTIONS_IN_USE.value(address="pool-test:27017"), 0)
 
     @patch("src.utils.database._get_client")
     @patch("src.utils.database.get_settings")
@@ -43,6 +124,277 @@ class TestDatabaseHelpers(unittest.TestCase):
         mock_get_client.assert_called_once()
 
 
+class ImmediateExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+class TestCommandMetricsListener(unittest.TestCase):
+    @staticmethod
+    def _events(command_name, command, reply, duration_ms, request_id=1):
+        ids = dict(command_name=command_name, connection_id=("db", 27017), request_id=request_id)
+        started = SimpleNamespace(command=command, database_name="finance", **ids)
+        finished = SimpleNamespace(reply=reply, duration_micros=int(duration_ms * 1000), **ids)
+        return started, finished
+
+    def test_records_duration_and_documents_per_collection(self):
+        listener = command_monitoring.CommandMetricsListener(slow_threshold_ms=500, measure_reply_bytes=True)
+        labels = dict(collection="cm_accounts", command="find")
+        count_before, _ = command_monitoring.COMMAND_DURATION.snapshot(outcome="success", **labels)
+        started, finished = self._events(
+            "find", {"find": "cm_accounts", "filter": {"user_id": "u"}}, {"cursor": {"firstBatch": [{}, {}]}}, 3
+        )
+
+        listener.started(started)
+        listener.succeeded(finished)
+        listener.succeeded(finished)  # unknown request ids are ignored
+
+        self.assertEqual(command_monitoring.COMMAND_DURATION.snapshot(outcome="success", **labels)[0], count_before + 1)
+        self.assertEqual(command_monitoring.COMMAND_DOCUMENTS.value(**labels), 2)
+        self.assertGreater(command_monitoring.COMMAND_REPLY_BYTES.value(**labels), 0)
+        self.assertEqual(command_monitoring.SLOW_COMMANDS.value(**labels), 0)
+
+    def test_slow_query_is_logged_with_shape_and_explained_once(self):
+        explain_runner = MagicMock(
+            return_value={"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+        )
+        listener = command_monitoring.CommandMetricsListener(
+            slow_threshold_ms=100, explain_runner=explain_runner, explain_executor=ImmediateExecutor()
+        )
+        listener.logger = MagicMock()
+        command = {
+            "find": "cm_transactions",
+            "filter": {"user_id": "u-1", "amount": {"$gte": 10}, "category": {"$in": ["a", "b"]}},
+            "sort": {"date": -1},
+            "lsid": {"id": "session"},
+            "$db": "finance",
+        }
+
+        for request_id in (1, 2):
+            started, finished = self._events("find", command, {"cursor": {"firstBatch": []}}, 250, request_id)
+            listener.started(started)
+            listener.succeeded(finished)
+
+        self.assertEqual(command_monitoring.SLOW_COMMANDS.value(collection="cm_transactions", command="find"), 2)
+        slow_log = listener.logger.warning.call_args_list[0]
+        self.assertEqual(
+            slow_log.kwargs["shape"], {"user_id": "?", "amount": {"$gte": "?"}, "category": {"$in": "?"}}
+        )
+        self.assertEqual(slow_log.kwargs["sort"], {"date": "?"})
+        explain_runner.assert_called_once()
+        explained = explain_runner.call_args.args[1]
+        self.assertNotIn("lsid", explained)
+        self.assertNotIn("$db", explained)
+        plan_log = listener.logger.warning.call_args_list[1]
+        self.assertEqual(plan_log.kwargs["stages"], ["SORT", "COLLSCAN"])
+
+    def test_summarize_plan_finds_nested_aggregate_plans(self):
+        winning_plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1_date_-1"}}
+        explain = {"stages": [{"$cursor": {"queryPlanner": {"winningPlan": winning_plan}}}]}
+
+        plan = command_monitoring.summarize_plan(explain)
+
+        self.assertEqual(plan["indexes"], ["user_id_1_date_-1"])
+        self.assertFalse(plan["collection_scan"])
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_render_uses_prometheus_text_format(self):
+        registry = metrics.MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        requests.inc(route="/a")
+        latency.observe(0.05)
+        latency.observe(2.0)
+
+        rendered = registry.render()
+
+        self.assertIn("# TYPE requests_total counter", rendered)
+        self.assertIn('requests_total{route="/a"} 1.0', rendered)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', rendered)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', rendered)
+        self.assertIn("latency_seconds_count 2", rendered)
+        self.assertIs(registry.counter("requests_total", "Requests.", ("route",)), requests)
+        with self.assertRaises(ValueError):
+            registry.gauge("requests_total", "Requests.")
+
+
+class TestResultCache(unittest.IsolatedAsyncioTestCase):
+    def _cache(self, **overrides) -> result_cache.ResultCache:
+        options = {"max_bytes": 1024, "ttl_seconds": 60.0, "sizeof": lambda value: 100}
+        options.update(overrides)
+        return result_cache.ResultCache(self.id(), **options)
+
+    @staticmethod
+    def _counting(value="result"):
+        calls = []
+
+        async def compute():
+            calls.append(value)
+            return value
+
+        return compute, calls
+
+    async def test_hits_are_keyed_by_user_endpoint_and_filters(self):
+        cache = self._cache()
+        compute, calls = self._counting()
+
+        for _ in range(3):
+            await cache.get_or_compute("u1", "search", {"a": 1, "b": 2}, compute)
+        await cache.get_or_compute("u1", "search", {"b": 2, "a": 1}, compute)
+        await cache.get_or_compute("u1", "search", {"a": 2}, compute)
+        await cache.get_or_compute("u2", "search", {"a": 1, "b": 2}, compute)
+        await cache.get_or_compute("u1", "summary", {"a": 1, "b": 2}, compute)
+
+        self.assertEqual(len(calls), 4)
+        self.assertEqual((cache.hits, cache.misses), (3, 4))
+        self.assertAlmostEqual(result_cache.CACHE_HIT_RATIO.value(cache=cache.name), 3 / 7)
+
+    async def test_invalidate_drops_only_that_users_results(self):
+        cache = self._cache()
+        compute, calls = self._counting()
+        await cache.get_or_compute("u1", "summary", None, compute)
+        await cache.get_or_compute("u2", "summary", None, compute)
+
+        cache.invalidate("u1")
+        await cache.get_or_compute("u1", "summary", None, compute)
+        await cache.get_or_compute("u2", "summary", None, compute)
+
+        self.assertEqual(len(calls), 3)
+
+    async def test_result_computed_across_a_write_is_not_stored(self):
+        cache = self._cache()
+
+        async def racing_compute():
+            cache.invalidate("u1")
+            return "stale"
+
+        self.assertEqual(await cache.get_or_compute("u1", "summary", None, racing_compute), "stale")
+        compute, calls = self._counting("fresh")
+        self.assertEqual(await cache.get_or_compute("u1", "summary", None, compute), "fresh")
+        self.assertEqual(calls, ["fresh"])
+
+    async def test_forgotten_generations_never_expose_stale_results(self):
+        cache = self._cache(max_entries=2)
+        compute, calls = self._counting()
+        await cache.get_or_compute("u1", "summary", None, compute)
+
+        async def racing_compute():
+            for user_id in ("u2", "u3", "u4"):
+                cache.invalidate(user_id)
+            return "stale"
+
+        await cache.get_or_compute("u5", "summary", None, racing_compute)
+        await cache.get_or_compute("u5", "summary", None, compute)
+        await cache.get_or_compute("u1", "summary", None, compute)
+
+        self.assertEqual(len(cache._generations), 2)
+        self.assertEqual(calls, ["result", "result", "result"])
+
+    async def test_entries_expire_after_the_ttl(self):
+        cache = self._cache(ttl_seconds=5.0)
+        compute, calls = self._counting()
+        with patch("src.utils.result_cache.time.monotonic", return_value=100.0):
+            await cache.get_or_compute("u1", "summary", None, compute)
+        with patch("src.utils.result_cache.time.monotonic", return_value=104.0):
+            await cache.get_or_compute("u1", "summary", None, compute)
+        with patch("src.utils.result_cache.time.monotonic", return_value=106.0):
+            await cache.get_or_compute("u1", "summary", None, compute)
+
+        self.assertEqual(len(calls), 2)
+
+    async def test_least_recently_used_entries_are_evicted_past_the_byte_budget(self):
+        cache = self._cache(max_bytes=300)
+        compute, calls = self._counting()
+        for endpoint in ("a", "b", "c"):
+            await cache.get_or_compute("u1", endpoint, None, compute)
+        await cache.get_or_compute("u1", "a", None, compute)
+        await cache.get_or_compute("u1", "d", None, compute)
+
+        await cache.get_or_compute("u1", "a", None, compute)
+        await cache.get_or_compute("u1", "b", None, compute)
+
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(result_cache.CACHE_BYTES.value(cache=cache.name), 300)
+        self.assertGreaterEqual(result_cache.CACHE_EVICTIONS.value(cache=cache.name, reason="size"), 1)
+
+    async def test_disabled_or_missing_cache_always_computes(self):
+        compute, calls = self._counting()
+        disabled = self._cache(max_bytes=0)
+        for _ in range(2):
+            await disabled.get_or_compute("u1", "summary", None, compute)
+            await result_cache.cached_or_compute(None, "u1", "summary", None, compute)
+
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(disabled.misses, 0)
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.flight = single_flight.SingleFlight(self.id())
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def _query(self):
+        self.calls += 1
+        await self.release.wait()
+        return ["row"]
+
+    async def _start(self, count, user_id="u1", filters=None):
+        tasks = [
+            asyncio.create_task(self.flight.do(user_id, "accounts.list", filters, self._query)) for _ in range(count)
+        ]
+        await asyncio.sleep(0)
+        return tasks
+
+    async def test_concurrent_identical_reads_share_one_query(self):
+        tasks = await self._start(3)
+        tasks += await self._start(1, filters={"page": 2})
+        self.release.set()
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(self.calls, 2)
+        self.assertIs(results[0], results[1])
+        labels = {"flight": self.flight.name, "endpoint": "accounts.list"}
+        counts = {
+            outcome: single_flight.FLIGHT_CALLS.value(**labels, outcome=outcome)
+            for outcome in ("leader", "coalesced")
+        }
+        self.assertEqual(counts, {"leader": 2, "coalesced": 2})
+        self.assertEqual(single_flight.FLIGHT_IN_FLIGHT.value(flight=self.flight.name), 0)
+
+    async def test_errors_reach_every_waiter_and_are_not_remembered(self):
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *(self.flight.do("u1", "budgets.summary", None, failing) for _ in range(2)), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+        self.release.set()
+        self.assertEqual(await self.flight.do("u1", "budgets.summary", None, self._query), ["row"])
+
+    async def test_reads_after_invalidate_start_a_new_query(self):
+        before = await self._start(1)
+        self.flight.invalidate("u1")
+        after = await self._start(1)
+        self.release.set()
+        await asyncio.gather(*before, *after)
+
+        self.assertEqual(self.calls, 2)
+
+    async def test_cancelled_caller_does_not_cancel_the_shared_query(self):
+        leader, follower = await self._start(2)
+        leader.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await follower, ["row"])
+        self.assertTrue(leader.cancelled())
+
+
 class TestSerializerHelpers(unittest.TestCase):
     def test_serialize_document_converts_object_ids(self):
         doc = {"_id": "abc", "nested": ObjectId()}
@@ -51,6 +403,25 @@ class TestSerializerHelpers(unittest.TestCase):
         self.assertEqual(serialized["id"], "abc")
         self.assertEqual(serialized["nested"], str(doc["nested"]))
 
+    def test_serialize_document_converts_nested_object_ids(self):
+        account_id = ObjectId()
+        doc = {"_id": ObjectId(), "account": {"_id": account_id}, "links": [account_id, {"ref": account_id}]}
+
+        serialized = serializers.serialize_document(doc)
+
+        self.assertEqual(serialized["account"], {"_id": str(account_id)})
+        self.assertEqual(serialized["links"], [str(account_id), {"ref": str(account_id)}])
+
+    def test_api_codec_decodes_object_ids_at_any_depth_in_one_pass(self):
+        doc_id, account_id = ObjectId(), ObjectId()
+        raw = BSON.encode({"_id": doc_id, "account": {"_id": account_id, "tags": [account_id]}, "amount": 1.5})
+
+        decoded = serializers.decode_document(raw.decode(codec_options=serializers.API_CODEC_OPTIONS))
+
+        self.assertEqual(
+            decoded, {"id": str(doc_id), "account": {"_id": str(account_id), "tags": [str(account_id)]}, "amount": 1.5}
+        )
+
 
 class TestLoggerConfiguration(unittest.TestCase):
     def setUp(self):
@@ -58,15 +429,72 @@ class TestLoggerConfiguration(unittest.TestCase):
 
     @patch("src.utils.logger.get_settings")
     def test_logger_configures_once_and_binds_name(self, mock_get_settings):
-        settings = SimpleNamespace(log_level="INFO")
-        mock_get_settings.return_value = settings
-        fake_logger = MagicMock()
-        with patch.object(logger_module, "logger", fake_logger):
-            bound = logger_module.get_logger("component")
-            logger_module.get_logger()  # second call should reuse configuration
+        with tempfile.TemporaryDirectory() as log_dir:
+            settings = SimpleNamespace(
+                log_level="INFO", log_levels="", log_json=True, log_enqueue=True, log_dir=log_dir
+            )
+            mock_get_settings.return_value = settings
+            fake_logger = MagicMock()
+            with patch.object(logger_module, "logger", fake_logger):
+                bound = logger_module.get_logger("component")
+                logger_module.get_logger()  # second call should reuse configuration
 
         fake_logger.remove.assert_called_once()
         self.assertGreaterEqual(fake_logger.add.call_count, 2)  # console + file sink
+        console_sink = fake_logger.add.call_args_list[0].args[0]
+        self.addCleanup(console_sink.stop)
+        self.assertIsInstance(console_sink, logger_module.BackgroundSink)
+        self.assertTrue(fake_logger.add.call_args_list[1].kwargs["enqueue"])  # file sink
+        for call in fake_logger.add.call_args_list:
+            self.assertTrue(call.kwargs["serialize"])
         fake_logger.bind.assert_called_once_with(component="component")
         self.assertIs(bound, fake_logger.bind.return_value)
 
+    def test_component_level_overrides(self):
+        log_filter = logger_module.ComponentLevelFilter(
+            "WARNING", logger_module.parse_component_levels("report_jobs=DEBUG, startup=ERROR")
+        )
+
+        def record(level, component=None):
+            extra = {"component": component} if component else {}
+            return {"level": SimpleNamespace(no=logger_module.logger.level(level).no), "extra": extra}
+
+        self.assertTrue(log_filter(record("DEBUG", "report_jobs")))
+        self.assertFalse(log_filter(record("WARNING", "startup")))
+        self.assertFalse(log_filter(record("INFO")))
+        self.assertTrue(log_filter(record("WARNING")))
+        with self.assertRaises(ValueError):
+            logger_module.parse_component_levels("report_jobs")
+
+    def test_throttled_logger_samples_limits_and_reports_suppressed(self):
+        fake_logger = MagicMock()
+        throttled = logger_module.ThrottledLogger(fake_logger, per_second=2, sample_every=2)
+
+        emitted = [throttled.info("hot path {n}", n=index) for index in range(10)]
+
+        # Calls 0, 2 and 4 are sampled in, but the bucket only holds two tokens.
+        self.assertEqual(emitted, [True, False, True] + [False] * 7)
+        with patch("src.utils.logger.time.monotonic", return_value=10**9):
+            self.assertTrue(throttled.info("hot path {n}", n=10))
+        suppressed = [call.kwargs["suppressed"] for call in fake_logger.bind.call_args_list]
+        self.assertEqual(suppressed, [1, 7])
+        self.assertTrue(throttled.warning("other template"))
+
+    def test_background_sink_writes_off_thread_and_drops_when_full(self):
+        stream = io.StringIO()
+        sink = logger_module.BackgroundSink(stream, name="test-sink")
+        sink.write("first\n")
+        sink.write("second\n")
+        sink.stop()
+        self.assertEqual(stream.getvalue(), "first\nsecond\n")
+
+        blocked = threading.Event()
+        slow_stream = MagicMock()
+        slow_stream.write.side_effect = lambda _: blocked.wait(1)
+        full_sink = logger_module.BackgroundSink(slow_stream, name="full-sink", max_pending=1)
+        for _ in range(5):
+            full_sink.write("message\n")
+        blocked.set()
+        full_sink.stop()
+        self.assertGreaterEqual(logger_module.LOG_RECORDS_DROPPED.value(sink="full-sink"), 3)
+
@@ -1,11 +1,18 @@
 """Unit tests for AccountService."""
 
+import asyncio
 import unittest
+from unittest.mock import patch
 
 from src.models import AccountUpdate
-from src.services import AccountService, NotFoundError
+from src.services import AccountService, Invalidator, NotFoundError
+from src.utils import SingleFlight
 from tests.fixtures.factories import make_account_create, make_account_model, make_user_model
-from tests.fixtures.memory_repositories import MemoryAccountRepository, MemoryUserRepository
+from tests.fixtures.memory_repositories import (
+    MemoryAccountRepository,
+    MemoryDataVersionRepository,
+    MemoryUserRepository,
+)
 
 
 class TestAccountService(unittest.IsolatedAsyncioTestCase):
@@ -80,3 +87,40 @@ class TestAccountService(unittest.IsolatedAsyncioTestCase):
             with self.subTest(missing_id=missing_id):
                 with self.assertRaises(NotFoundError):
                     await self.service.delete_account(missing_id)
+
+    async def test_account_writes_bump_user_data_version(self):
+        versions = MemoryDataVersionRepository()
+        service = AccountService(
+            repository=self.account_repository,
+            user_repository=self.user_repository,
+            invalidator=Invalidator(versions),
+        )
+        user = make_user_model()
+        self.user_repository.storage[user.id] = user.model_dump()
+
+        account = await service.create_account(make_account_create(user_id=user.id))
+        await service.update_account(account.id, AccountUpdate(name="Renamed"))
+        await service.delete_account(account.id)
+
+        self.assertEqual(await versions.get_version(user.id), 3)
+
+    async def test_concurrent_listings_share_one_repository_query(self):
+        service = AccountService(
+            repository=self.account_repository,
+            user_repository=self.user_repository,
+            invalidator=Invalidator(single_flight=SingleFlight("accounts")),
+        )
+        account = make_account_model(user_id="owner")
+        self.account_repository.storage[account.id] = account.model_dump()
+        find_by_user = self.account_repository.find_by_user
+
+        async def slow_find_by_user(user_id):
+            await asyncio.sleep(0.01)
+            return await find_by_user(user_id)
+
+        with patch.object(self.account_repository, "find_by_user", side_effect=slow_find_by_user) as mock_find:
+            results = await asyncio.gather(*(service.list_accounts("owner") for _ in range(5)))
+
+        mock_find.assert_awaited_once_with("owner")
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(results[0][0].id, account.id)
@@ -0,0 +1,173 @@
+"""Tests for per-route-class admission control and load shedding."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.middleware import EXPORTS, READS, WRITES, AdmissionControlMiddleware, export_route
+from src.middleware.admission import (
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED,
+    _RouteClassLimiter,
+    export_routes,
+    route_class,
+)
+
+
+def _build_app(release: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def items():
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/api/v1/items")
+    async def create_item():
+        return {"created": True}
+
+    @app.get("/api/v1/reports/export")
+    @export_route
+    async def export():
+        return {"exported": True}
+
+    @app.get("/metrics")
+    async def metrics():
+        return {"up": True}
+
+    return app
+
+
+def _scope(method: str, path: str) -> dict:
+    return {"type": "http", "method": method, "path": path, "root_path": ""}
+
+
+class TestRouteClass(unittest.TestCase):
+    def test_only_marked_routes_are_exports_and_the_rest_are_classified_by_method(self):
+        app = FastAPI()
+
+        @app.get("/api/v1/reports/transactions/{user_id}/download")
+        @export_route
+        async def download(user_id: str):
+            return {}
+
+        @app.get("/api/v1/reports/jobs/{job_id}")
+        async def job_status(job_id: str):
+            return {}
+
+        routes = export_routes(app.routes)
+        self.assertEqual([route.path for route in routes], ["/api/v1/reports/transactions/{user_id}/download"])
+        self.assertEqual(route_class(_scope("GET", "/api/v1/reports/transactions/u1/download"), routes), EXPORTS)
+        self.assertEqual(route_class(_scope("GET", "/api/v1/reports/jobs/j1"), routes), READS)
+        self.assertEqual(route_class(_scope("POST", "/api/v1/reports/jobs"), routes), WRITES)
+        self.assertEqual(route_class(_scope("HEAD", "/api/v1/accounts"), routes), READS)
+        self.assertEqual(route_class(_scope("DELETE", "/api/v1/accounts/a1"), routes), WRITES)
+
+
+class TestRouteClassLimiter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.limiter = _RouteClassLimiter(READS, limit=1, max_queue=5, max_wait=1.0)
+        await self.limiter.acquire()
+
+    def _slot_handed_over_then(self, error: type[BaseException]):
+        async def wait_for(waiter, timeout):
+            # The holder releases into the queued waiter just before the wait is interrupted.
+            self.limiter.release(0.0)
+            raise error
+
+        return patch("src.middleware.admission.asyncio.wait_for", side_effect=wait_for)
+
+    async def test_slot_handed_over_as_the_deadline_fires_admits_the_request(self):
+        with self._slot_handed_over_then(asyncio.TimeoutError):
+            await self.limiter.acquire()
+
+        self.assertEqual((self.limiter.active, len(self.limiter._waiters)), (1, 0))
+        self.limiter.release(0.0)
+        self.assertEqual(self.limiter.active, 0)
+
+    async def test_slot_handed_over_as_the_client_goes_away_is_released(self):
+        with self._slot_handed_over_then(asyncio.CancelledError):
+            with self.assertRaises(asyncio.CancelledError):
+                await self.limiter.acquire()
+
+        self.assertEqual((self.limiter.active, len(self.limiter._waiters)), (0, 0))
+
+
+class TestAdmissionControlMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.release = asyncio.Event()
+
+    def _client(self, **options) -> AsyncClient:
+        self.middleware = AdmissionControlMiddleware(
+            _build_app(self.release),
+            limits={READS: 1, WRITES: 1, EXPORTS: 1},
+            **options,
+        )
+        return AsyncClient(transport=ASGITransport(app=self.middleware), base_url="http://testserver")
+
+    async def _start_reads(self, client: AsyncClient, count: int) -> list[asyncio.Task]:
+        tasks = [asyncio.create_task(client.get("/api/v1/items")) for _ in range(count)]
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return tasks
+
+    async def test_excess_requests_wait_for_a_slot_in_order(self):
+        async with self._client(max_queue=5, max_wait=5.0) as client:
+            tasks = await self._start_reads(client, 3)
+            limiter = self.middleware.limiters[READS]
+            self.assertEqual((limiter.active, ADMISSION_QUEUE_DEPTH.value(route_class=READS)), (1, 2))
+
+            self.release.set()
+            responses = await asyncio.gather(*tasks)
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200])
+        self.assertEqual((limiter.active, ADMISSION_QUEUE_DEPTH.value(route_class=READS)), (0, 0))
+
+    async def test_full_queue_is_shed_immediately_with_retry_after(self):
+        before = ADMISSION_REJECTED.value(route_class=READS, reason="queue_full")
+        async with self._client(max_queue=1, max_wait=5.0) as client:
+            tasks = await self._start_reads(client, 2)
+            response = await client.get("/api/v1/items")
+            self.release.set()
+            await asyncio.gather(*tasks)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "1")
+        self.assertEqual(ADMISSION_REJECTED.value(route_class=READS, reason="queue_full"), before + 1)
+
+    async def test_queued_requests_are_shed_at_the_deadline(self):
+        async with self._client(max_queue=5, max_wait=0.05) as client:
+            tasks = await self._start_reads(client, 2)
+            timed_out = await tasks[1]
+            self.release.set()
+            admitted = await tasks[0]
+
+        self.assertEqual((admitted.status_code, timed_out.status_code), (200, 503))
+        self.assertEqual(self.middleware.limiters[READS].active, 0)
+
+    async def test_expected_wait_past_the_deadline_is_rejected_without_queueing(self):
+        async with self._client(max_queue=5, max_wait=1.0) as client:
+            tasks = await self._start_reads(client, 1)
+            self.middleware.limiters[READS].service_time = 3.0
+            response = await client.get("/api/v1/items")
+            self.release.set()
+            await asyncio.gather(*tasks)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "3")
+
+    async def test_route_classes_and_excluded_paths_are_limited_independently(self):
+        async with self._client(max_queue=0, max_wait=1.0) as client:
+            tasks = await self._start_reads(client, 1)
+            write = await client.post("/api/v1/items")
+            export = await client.get("/api/v1/reports/export")
+            metrics = await client.get("/metrics")
+            read = await client.get("/api/v1/items")
+            self.release.set()
+            await asyncio.gather(*tasks)
+
+        statuses = [response.status_code for response in (write, export, metrics, read)]
+        self.assertEqual(statuses, [200, 200, 200, 503])
@@ -0,0 +1,146 @@
+"""Unit tests for BatchExportService."""
+
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from src.models import TransactionModel
+from src.services import BatchExportService
+from src.utils import FileManager
+from tests.fixtures.factories import make_transaction_model, make_user_model
+from tests.fixtures.memory_repositories import MemoryTransactionRepository, MemoryUserRepository
+
+
+class TestBatchExportService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.user_repository = MemoryUserRepository()
+        self.transaction_repository = MemoryTransactionRepository()
+        self.users = [make_user_model() for _ in range(5)]
+        for index, user in enumerate(self.users):
+            self.user_repository.storage[user.id] = user.model_dump()
+            for _ in range(index + 1):
+                tx = make_transaction_model(user_id=user.id)
+                self.transaction_repository.storage[tx.id] = tx.model_dump()
+        self.service = BatchExportService(
+            self.user_repository,
+            FileManager(base_dir=Path(self.temp_dir.name)),
+            batch_runner=self._run_batch,
+            executor=ThreadPoolExecutor(max_workers=2),
+        )
+        self.addCleanup(self.service.executor.shutdown)
+        self.failing_users: set[str] = set()
+
+    def _run_batch(self, user_ids, output_dir, chunk_size):
+        results = []
+        for user_id in user_ids:
+            if user_id in self.failing_users:
+                results.append((user_id, None, 0, "RuntimeError: disk full"))
+                continue
+            rows = [
+                TransactionModel(**item)
+                for item in self.transaction_repository.storage.values()
+                if item["user_id"] == user_id
+            ]
+            report = FileManager(base_dir=Path(output_dir)).export_transactions(rows)
+            target = Path(output_dir) / f"transactions_{user_id}.csv"
+            Path(report.file_path).rename(target)
+            results.append((user_id, str(target), report.total_transactions, None))
+        return results
+
+    async def test_exports_one_file_per_user_and_reports_progress(self):
+        progress = []
+
+        report = await self.service.export_users(workers=2, on_progress=lambda *args: progress.append(args))
+
+        self.assertEqual(report.total_users, 5)
+        self.assertEqual(report.total_transactions, 15)
+        self.assertEqual(len(list(Path(report.directory).glob("transactions_*.csv"))), 5)
+        self.assertEqual(progress[-1][:3], (5, 5, 15))
+        self.assertIsNone(report.archive_path)
+
+    async def test_filtered_users_are_bundled_into_archive(self):
+        selected = [self.users[0].id, self.users[4].id]
+
+        report = await self.service.export_users(selected, bundle=True)
+
+        self.assertEqual((report.total_users, report.total_transactions), (2, 6))
+        with zipfile.ZipFile(report.archive_path) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                sorted(f"transactions_{user_id}.csv" for user_id in selected),
+            )
+
+    async def test_unknown_and_malformed_ids_are_reported_without_writing_files(self):
+        selected = [self.users[1].id, "../../etc/passwd", "64b7f0c2a1b2c3d4e5f60718"]
+
+        report = await self.service.export_users(selected)
+
+        self.assertEqual((report.total_users, report.total_transactions), (1, 2))
+        self.assertEqual(
+            report.failures,
+            {"../../etc/passwd": "User not found", "64b7f0c2a1b2c3d4e5f60718": "User not found"},
+        )
+        self.assertEqual(
+            [path.name for path in Path(report.directory).iterdir()],
+            [f"transactions_{self.users[1].id}.csv"],
+        )
+
+    async def test_failed_users_and_crashed_batches_do_not_fail_the_export(self):
+        self.failing_users.add(self.users[0].id)
+
+        report = await self.service.export_users(workers=1)
+
+        self.assertEqual((report.total_users, report.total_transactions), (4, 14))
+        self.assertEqual(report.failures, {self.users[0].id: "RuntimeError: disk full"})
+
+        def crash(user_ids, output_dir, chunk_size):
+            raise RuntimeError("worker died")
+
+        self.service.batch_runner = crash
+        report = await self.service.export_users([self.users[2].id])
+
+        self.assertEqual(report.total_users, 0)
+        self.assertEqual(report.failures, {self.users[2].id: "RuntimeError: worker died"})
+
+    async def test_workers_sets_the_process_count_and_the_batches(self):
+        calls = []
+        pools = []
+
+        def run_batch(user_ids, output_dir, chunk_size):
+            calls.append(list(user_ids))
+            return self._run_batch(user_ids, output_dir, chunk_size)
+
+        def spawn(max_workers):
+            pools.append(max_workers)
+            return ThreadPoolExecutor(max_workers=max_workers)
+
+        service = BatchExportService(
+            self.user_repository,
+            FileManager(base_dir=Path(self.temp_dir.name)),
+            batch_runner=run_batch,
+        )
+        with patch("src.services.batch_exports.spawn_process_pool", side_effect=spawn), patch(
+            "src.services.batch_exports.get_batch_export_pool", side_effect=AssertionError("shared pool used")
+        ):
+            report = await service.export_users(workers=1)
+
+        self.assertEqual(pools, [1])
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(sorted(user_id for batch in calls for user_id in batch), sorted(u.id for u in self.users))
+        self.assertEqual(report.total_users, 5)
+
+        calls.clear()
+        shared = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(shared.shutdown)
+        with patch("src.services.batch_exports.spawn_process_pool", side_effect=AssertionError("pool spawned")), patch(
+            "src.services.batch_exports.get_batch_export_pool", return_value=shared
+        ):
+            report = await service.export_users()
+
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(report.total_users, 5)
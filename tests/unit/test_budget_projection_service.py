@@ -0,0 +1,98 @@
+"""Unit tests for BudgetProjectionService."""
+
+import unittest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+from src.models import BudgetStatus, TransactionType
+from src.services import BudgetProjectionService, NotFoundError
+from src.services.forecasts import project_period_spend
+from tests.fixtures.factories import make_budget_model, make_transaction_model
+from tests.fixtures.memory_repositories import MemoryBudgetRepository, MemoryTransactionRepository
+
+
+class TestProjectPeriodSpend(unittest.TestCase):
+    def test_projects_each_row_from_elapsed_average(self):
+        matrix = np.array([[10.0, 20.0, 0.0, 0.0], [5.0, 0.0, 0.0, 0.0]])
+
+        spent, average, projected = project_period_spend(matrix, np.array([2, 0]), np.array([4, 3]))
+
+        np.testing.assert_allclose(spent, [30.0, 0.0])
+        np.testing.assert_allclose(average, [15.0, 0.0])
+        np.testing.assert_allclose(projected, [60.0, 0.0])
+
+
+class TestBudgetProjectionService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.budget_repository = MemoryBudgetRepository()
+        self.transaction_repository = MemoryTransactionRepository()
+        self.service = BudgetProjectionService(
+            repository=self.budget_repository,
+            transaction_repository=self.transaction_repository,
+        )
+        self.user_id = "projection-user"
+        self.today = date(2024, 3, 10)
+
+    def _store_budget(self, **overrides):
+        payload = {"period_start": date(2024, 3, 1), "period_end": date(2024, 3, 31), **overrides}
+        budget = make_budget_model(user_id=self.user_id, **payload)
+        self.budget_repository.storage[budget.id] = budget.model_dump()
+        return budget
+
+    def _store_expense(self, day: int, amount: float, **overrides):
+        tx = make_transaction_model(
+            user_id=self.user_id,
+            amount=amount,
+            event_date=datetime(2024, 3, day, 12),
+            **overrides,
+        )
+        self.transaction_repository.storage[tx.id] = tx.model_dump()
+
+    async def test_project_budget_extrapolates_daily_average(self):
+        budget = self._store_budget(limit_amount=500)
+        self._store_expense(2, 50)
+        self._store_expense(5, 50)
+        self._store_expense(20, 999)  # after today, ignored by the burn rate
+        self._store_expense(3, 80, type=TransactionType.INCOME)
+
+        projection = await self.service.project_budget(budget.id, today=self.today)
+
+        self.assertEqual(projection.elapsed_days, 10)
+        self.assertEqual(projection.total_days, 31)
+        self.assertEqual(projection.spent_to_date, 100)
+        self.assertEqual(projection.daily_average, 10)
+        self.assertEqual(projection.projected_spend, 310)
+        self.assertEqual(projection.projected_status, BudgetStatus.HEALTHY)
+        self.assertEqual(len(projection.daily_spend), 10)
+
+    async def test_projection_flags_budgets_heading_over_limit(self):
+        budget = self._store_budget(limit_amount=200)
+        self._store_expense(1, 100)
+
+        projection = await self.service.project_budget(budget.id, today=self.today)
+
+        self.assertEqual(projection.projected_status, BudgetStatus.EXCEEDED)
+        self.assertEqual(projection.projected_remaining, 0)
+
+    async def test_missing_budget_raises(self):
+        with self.assertRaises(NotFoundError):
+            await self.service.project_budget("missing", today=self.today)
+
+    async def test_batch_projection_uses_single_aggregation(self):
+        groceries = self._store_budget(category="groceries")
+        transport = self._store_budget(category="transport")
+        self._store_budget(category="old", period_start=date(2024, 1, 1), period_end=date(2024, 1, 31))
+        self._store_expense(4, 30, category="groceries")
+        self._store_expense(6, 20, category="transport")
+        spend = AsyncMock(wraps=self.transaction_repository.daily_spend)
+
+        with patch.object(self.transaction_repository, "daily_spend", spend):
+            projections = await self.service.project_active_budgets(self.user_id, today=self.today)
+
+        spend.assert_awaited_once()
+        by_id = {item.budget_id: item for item in projections}
+        self.assertEqual(set(by_id), {groceries.id, transport.id})
+        self.assertEqual(by_id[groceries.id].spent_to_date, 30)
+        self.assertEqual(by_id[transport.id].spent_to_date, 20)
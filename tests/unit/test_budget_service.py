@@ -4,9 +4,10 @@ import unittest
 from datetime import date, timedelta
 
 from src.models import BudgetUpdate
-from src.services import BudgetService, BusinessRuleError, NotFoundError
+from src.services import BudgetService, BusinessRuleError, Invalidator, NotFoundError
+from src.utils import ResultCache
 from tests.fixtures.factories import make_budget_create, make_budget_model
-from tests.fixtures.memory_repositories import MemoryBudgetRepository
+from tests.fixtures.memory_repositories import MemoryBudgetRepository, MemoryDataVersionRepository
 
 
 class TestBudgetService(unittest.IsolatedAsyncioTestCase):
@@ -127,3 +128,28 @@ class TestBudgetService(unittest.IsolatedAsyncioTestCase):
         summaries = await self.service.summarize("owner")
 
         self.assertEqual(summaries[0].category, "entertainment")
+
+    async def test_budget_writes_bump_user_data_version(self):
+        versions = MemoryDataVersionRepository()
+        service = BudgetService(repository=self.repository, invalidator=Invalidator(versions))
+
+        budget = await service.create_budget(make_budget_create())
+        await service.update_budget(budget.id, BudgetUpdate(limit_amount=900))
+        await service.delete_budget(budget.id)
+
+        self.assertEqual(await versions.get_version(budget.user_id), 3)
+
+    async def test_summary_is_cached_until_the_user_writes_a_budget(self):
+        service = BudgetService(
+            repository=self.repository, invalidator=Invalidator(result_cache=ResultCache("budgets", 1 << 20, 60.0))
+        )
+        budget = await service.create_budget(make_budget_create(user_id="owner", limit_amount=100))
+
+        first = await service.summarize("owner")
+        self.repository.storage[budget.id]["limit_amount"] = 500
+        cached = await service.summarize("owner")
+        await service.update_budget(budget.id, BudgetUpdate(limit_amount=900))
+        refreshed = await service.summarize("owner")
+
+        self.assertIs(cached, first)
+        self.assertEqual(refreshed[0].limit_amount, 900)
@@ -0,0 +1,184 @@
+"""Tests for negotiated response compression and encoded request bodies."""
+
+import gzip
+import json
+import unittest
+
+from fastapi import Body, FastAPI
+from fastapi.responses import Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.middleware import CompressionMiddleware, RequestDecompressionMiddleware, skip_compression
+from src.middleware.compression import BROTLI_BOUNDED_OUTPUT, brotli, negotiate_encoding, parse_encodings, zstandard
+
+ROWS = [{"id": index, "description": "grocery shopping", "amount": 12.5} for index in range(200)]
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/rows")
+    async def rows():
+        return ROWS
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/tagged")
+    async def tagged():
+        return Response(json.dumps(ROWS), media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/archive")
+    async def archive():
+        return Response(b"\0" * 4096, media_type="application/zip")
+
+    @app.get("/raw")
+    @skip_compression
+    async def raw():
+        return ROWS
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for row in ROWS:
+                yield json.dumps(row) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.post("/import")
+    async def import_rows(payload: list = Body(...)):
+        return {"received": len(payload)}
+
+    app.add_middleware(RequestDecompressionMiddleware, max_size=64 * 1024)
+    app.add_middleware(CompressionMiddleware, minimum_size=512, encodings=["gzip"])
+    return app
+
+
+class TestNegotiation(unittest.TestCase):
+    def test_highest_quality_wins_and_ties_follow_server_order(self):
+        self.assertEqual(negotiate_encoding("gzip;q=0.5, br", ["br", "gzip"]), "br")
+        self.assertEqual(negotiate_encoding("gzip, br;q=0.1", ["br", "gzip"]), "gzip")
+        self.assertEqual(negotiate_encoding("gzip, br", ["br", "gzip"]), "br")
+        self.assertEqual(negotiate_encoding("*", ["zstd", "gzip"]), "zstd")
+
+    def test_refused_or_missing_encodings_disable_compression(self):
+        self.assertIsNone(negotiate_encoding("", ["gzip"]))
+        self.assertIsNone(negotiate_encoding("gzip;q=0", ["gzip"]))
+        self.assertIsNone(negotiate_encoding("identity, *;q=0", ["gzip"]))
+        self.assertIsNone(negotiate_encoding("deflate", ["gzip"]))
+
+    def test_parse_encodings_keeps_only_installed_codecs(self):
+        self.assertEqual(parse_encodings(" GZIP, unknown, gzip"), ["gzip"])
+        self.assertIn("gzip", parse_encodings("br,zstd,gzip"))
+
+
+class TestCompressionMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncClient(transport=ASGITransport(app=_build_app()), base_url="http://testserver")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def _get_raw(self, path: str, accept_encoding: str = "gzip"):
+        request = self.client.build_request("GET", path, headers={"Accept-Encoding": accept_encoding})
+        response = await self.client.send(request, stream=True)
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+        await response.aclose()
+        return response, body
+
+    async def test_large_json_is_gzipped_with_length_and_vary(self):
+        response, body = await self._get_raw("/rows")
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(int(response.headers["content-length"]), len(body))
+        self.assertEqual(json.loads(gzip.decompress(body)), ROWS)
+        self.assertLess(len(body), len(json.dumps(ROWS)) / 4)
+
+    async def test_small_bodies_and_unaccepting_clients_get_identity(self):
+        small, body = await self._get_raw("/small")
+        self.assertNotIn("content-encoding", small.headers)
+        self.assertEqual(json.loads(body), {"ok": True})
+
+        refused, body = await self._get_raw("/rows", accept_encoding="identity")
+        self.assertNotIn("content-encoding", refused.headers)
+        self.assertEqual(json.loads(body), ROWS)
+
+    async def test_opted_out_routes_and_binary_types_are_untouched(self):
+        raw, body = await self._get_raw("/raw")
+        self.assertNotIn("content-encoding", raw.headers)
+        self.assertEqual(json.loads(body), ROWS)
+
+        archive, body = await self._get_raw("/archive")
+        self.assertNotIn("content-encoding", archive.headers)
+        self.assertEqual(body, b"\0" * 4096)
+
+    async def test_streamed_responses_are_compressed_incrementally(self):
+        response, body = await self._get_raw("/stream")
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("content-length", response.headers)
+        lines = gzip.decompress(body).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], ROWS)
+
+    async def test_strong_etags_are_weakened_for_the_compressed_representation(self):
+        response, _ = await self._get_raw("/tagged")
+
+        self.assertEqual(response.headers["etag"], 'W/"v1"')
+
+
+class TestRequestDecompressionMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncClient(transport=ASGITransport(app=_build_app()), base_url="http://testserver")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def _post(self, body: bytes, encoding: str):
+        headers = {"Content-Type": "application/json", "Content-Encoding": encoding}
+        return await self.client.post("/import", content=body, headers=headers)
+
+    async def test_gzipped_bodies_reach_the_route_decoded(self):
+        response = await self._post(gzip.compress(json.dumps(ROWS).encode()), "gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"received": len(ROWS)})
+
+    async def test_bodies_inflating_past_the_limit_are_rejected(self):
+        bomb = gzip.compress(b"[" + b" " * (1024 * 1024) + b"]")
+
+        response = await self._post(bomb, "gzip")
+
+        self.assertEqual(response.status_code, 413)
+
+    @unittest.skipUnless(BROTLI_BOUNDED_OUTPUT, "brotli>=1.2 is not installed")
+    async def test_brotli_bodies_inflating_past_the_limit_are_rejected(self):
+        self.assertEqual((await self._post(brotli.compress(json.dumps(ROWS).encode()), "br")).status_code, 200)
+        bomb = brotli.compress(b"[" + b" " * (64 * 1024 * 1024) + b"]")
+
+        self.assertEqual((await self._post(bomb, "br")).status_code, 413)
+
+    @unittest.skipUnless(zstandard, "zstandard is not installed")
+    async def test_zstd_bodies_inflating_past_the_limit_are_rejected(self):
+        compressor = zstandard.ZstdCompressor()
+        self.assertEqual((await self._post(compressor.compress(json.dumps(ROWS).encode()), "zstd")).status_code, 200)
+        bomb = compressor.compress(b"[" + b" " * (64 * 1024 * 1024) + b"]")
+
+        self.assertEqual((await self._post(bomb, "zstd")).status_code, 413)
+
+    async def test_unknown_or_corrupt_encodings_are_rejected(self):
+        self.assertEqual((await self._post(b"{}", "compress")).status_code, 415)
+        self.assertEqual((await self._post(b"not gzip", "gzip")).status_code, 400)
+
+    async def test_truncated_bodies_are_rejected(self):
+        payload = json.dumps(ROWS).encode()
+        bodies = {"gzip": gzip.compress(payload)}
+        if BROTLI_BOUNDED_OUTPUT:
+            bodies["br"] = brotli.compress(payload)
+        if zstandard:
+            bodies["zstd"] = zstandard.ZstdCompressor().compress(payload)
+
+        for encoding, body in bodies.items():
+            with self.subTest(encoding=encoding):
+                self.assertEqual((await self._post(body[:-8], encoding)).status_code, 400)
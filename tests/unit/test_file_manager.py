@@ -1,9 +1,16 @@
 """Tests for FileManager and ReportService."""
 
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+from src.models import ExportFormat
 from src.utils import FileManager
 from tests.fixtures.factories import make_transaction_model
 
@@ -32,3 +39,110 @@ class TestFileManager(unittest.TestCase):
         for metric, expected_value in expected.items():
             with self.subTest(metric=metric):
                 self.assertEqual(metrics[metric], expected_value)
+
+    def test_stream_transactions_csv_appends_summary_rows(self):
+        transactions = [
+            make_transaction_model(amount=100),
+            make_transaction_model(amount=50, type="income"),
+            make_transaction_model(amount=25),
+        ]
+
+        async def source():
+            for tx in transactions:
+                yield tx
+
+        async def collect():
+            return [chunk async for chunk in FileManager.stream_transactions_csv(source(), chunk_size=2)]
+
+        chunks = asyncio.run(collect())
+
+        self.assertEqual(len(chunks), 2)
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual(len([row for row in rows[1:] if not row[0].startswith("#")]), 3)
+        self.assertEqual(
+            rows[-3:],
+            [["# total_transactions", "3"], ["# total_expenses", "125.0"], ["# total_income", "50.0"]],
+        )
+
+    def test_export_transactions_async_writes_same_report(self):
+        manager = FileManager(base_dir=self.base_path / "nested")
+        transactions = [make_transaction_model(amount=10), make_transaction_model(amount=5, type="income")]
+
+        async def source():
+            for tx in transactions:
+                yield tx
+
+        report = asyncio.run(manager.export_transactions_async(source(), chunk_size=1))
+
+        rows = list(csv.reader(io.StringIO(Path(report.file_path).read_text(encoding="utf-8"))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual((report.total_expenses, report.total_income), (10, 5))
+
+    def test_evict_reports_drops_least_recently_used_entries(self):
+        manager = FileManager(base_dir=self.base_path)
+        for age, stem in enumerate(("report_newest", "report_middle", "report_oldest")):
+            for suffix in (".csv", ".json"):
+                path = self.base_path / f"{stem}{suffix}"
+                path.write_text("x" * 50, encoding="utf-8")
+                os.utime(path, (1_000_000 - age, 1_000_000 - age))
+
+        evicted = manager.evict_reports(250, keep={self.base_path / "report_oldest.csv"})
+
+        self.assertEqual({path.name for path in evicted}, {"report_middle.csv", "report_middle.json"})
+        remaining = sorted(path.stem for path in self.base_path.iterdir())
+        self.assertEqual(remaining, ["report_newest", "report_newest", "report_oldest", "report_oldest"])
+
+    def test_evict_reports_leaves_files_outside_the_cache_alone(self):
+        manager = FileManager(base_dir=self.base_path)
+        others = ("transactions_base.csv", "transactions_job.csv.gz", "statement_2024-05_1.csv")
+        for index, name in enumerate(("report_cached.csv", *others)):
+            path = self.base_path / name
+            path.write_text("x" * 100, encoding="utf-8")
+            os.utime(path, (1_000_000 + index, 1_000_000 + index))
+
+        evicted = manager.evict_reports(0)
+
+        self.assertEqual([path.name for path in evicted], ["report_cached.csv"])
+        self.assertEqual(sorted(path.name for path in self.base_path.iterdir()), sorted(others))
+
+    def test_export_transactions_gzip_reports_compression_ratio(self):
+        manager = FileManager(base_dir=self.base_path)
+        transactions = [make_transaction_model(amount=10) for _ in range(200)]
+
+        report = manager.export_transactions(transactions, export_format=ExportFormat.CSV_GZIP, chunk_size=64)
+
+        self.assertTrue(report.file_path.endswith(".csv.gz"))
+        self.assertEqual(report.bytes_written, Path(report.file_path).stat().st_size)
+        self.assertGreater(report.compression_ratio, 2)
+        with gzip.open(report.file_path, "rt", encoding="utf-8", newline="") as handle:
+            rows = list(csv.reader(handle))
+        self.assertEqual(len(rows), 201)
+
+    def test_export_transactions_async_writes_ndjson(self):
+        manager = FileManager(base_dir=self.base_path)
+        transactions = [make_transaction_model(amount=10), make_transaction_model(amount=5, type="income")]
+
+        async def source():
+            for tx in transactions:
+                yield tx
+
+        report = asyncio.run(
+            manager.export_transactions_async(source(), chunk_size=1, export_format=ExportFormat.NDJSON)
+        )
+
+        lines = Path(report.file_path).read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [tx.id for tx in transactions])
+        self.assertEqual((report.format, report.compression_ratio), (ExportFormat.NDJSON, 1.0))
+
+    def test_export_transactions_writes_parquet_row_groups(self):
+        import pyarrow.parquet as pq
+
+        manager = FileManager(base_dir=self.base_path)
+        transactions = [make_transaction_model(amount=idx) for idx in range(1, 11)]
+
+        report = manager.export_transactions(transactions, export_format=ExportFormat.PARQUET, chunk_size=4)
+
+        parquet_file = pq.ParquetFile(report.file_path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(parquet_file.read().column("amount").to_pylist(), list(range(1, 11)))
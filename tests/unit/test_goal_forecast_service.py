@@ -0,0 +1,166 @@
+"""Unit tests for GoalForecastService."""
+
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+from src.models import GoalStatus
+from src.services import GoalForecastService
+from src.services.forecasts import fit_contribution_trends
+from tests.fixtures.factories import make_goal_model, make_transaction_model
+from tests.fixtures.memory_repositories import (
+    MemoryDataVersionRepository,
+    MemoryGoalRepository,
+    MemoryTransactionRepository,
+)
+
+
+class TestFitContributionTrends(unittest.TestCase):
+    def test_fits_each_goal_independently(self):
+        codes = np.array([1, 0, 0, 1, 0])
+        days = np.array([-20.0, -30.0, -20.0, -10.0, -10.0])
+        amounts = np.array([50.0, 100.0, 100.0, 50.0, 100.0])
+
+        rates, counts = fit_contribution_trends(codes, days, amounts, 3)
+
+        np.testing.assert_allclose(rates, [10.0, 5.0, 0.0])
+        self.assertEqual(counts.tolist(), [3, 2, 0])
+
+    def test_single_contribution_spreads_total_since_first_day(self):
+        rates, counts = fit_contribution_trends(np.array([0]), np.array([-4.0]), np.array([80.0]), 1)
+
+        self.assertEqual(rates.tolist(), [20.0])
+        self.assertEqual(counts.tolist(), [1])
+
+
+class TestGoalForecastService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.goal_repository = MemoryGoalRepository()
+        self.transaction_repository = MemoryTransactionRepository()
+        self.version_repository = MemoryDataVersionRepository()
+        self.service = GoalForecastService(
+            repository=self.goal_repository,
+            transaction_repository=self.transaction_repository,
+            version_repository=self.version_repository,
+        )
+        self.today = date(2024, 6, 1)
+        self.user_id = "forecast-user"
+
+    def _store_goal(self, **overrides):
+        goal = make_goal_model(user_id=self.user_id, **overrides)
+        self.goal_repository.storage[goal.id] = goal.model_dump()
+        return goal
+
+    def _store_contribution(self, goal_id: str, days_ago: int, amount: float):
+        event_date = datetime.combine(self.today, datetime.min.time()) - timedelta(days=days_ago)
+        tx = make_transaction_model(user_id=self.user_id, goal_id=goal_id, amount=amount, event_date=event_date)
+        self.transaction_repository.storage[tx.id] = tx.model_dump()
+        return tx
+
+    async def test_forecast_projects_completion_date_from_pace(self):
+        goal = self._store_goal(target_amount=1000, current_amount=400, target_date=date(2024, 12, 31))
+        for days_ago in (30, 20, 10):
+            self._store_contribution(goal.id, days_ago, 100)
+
+        forecasts = await self.service.forecast_goals(self.user_id, today=self.today)
+
+        self.assertEqual(len(forecasts), 1)
+        forecast = forecasts[0]
+        self.assertEqual(forecast.contributions, 3)
+        self.assertEqual(forecast.daily_rate, 10.0)
+        self.assertEqual(forecast.projected_completion_date, self.today + timedelta(days=60))
+        self.assertTrue(forecast.on_track)
+
+    async def test_goal_without_contributions_has_no_projection(self):
+        self._store_goal(current_amount=0)
+
+        forecast = (await self.service.forecast_goals(self.user_id, today=self.today))[0]
+
+        self.assertIsNone(forecast.projected_completion_date)
+        self.assertIsNone(forecast.on_track)
+        self.assertEqual(forecast.daily_rate, 0.0)
+
+    async def test_completed_goal_is_on_track(self):
+        self._store_goal(target_amount=100, current_amount=100, status=GoalStatus.COMPLETED)
+
+        forecast = (await self.service.forecast_goals(self.user_id, today=self.today))[0]
+
+        self.assertEqual(forecast.remaining_amount, 0)
+        self.assertTrue(forecast.on_track)
+
+    async def test_rates_are_cached_until_the_data_version_changes(self):
+        goal = self._store_goal()
+        contribution = self._store_contribution(goal.id, 5, 50)
+        history = AsyncMock(wraps=self.transaction_repository.goal_contributions)
+
+        with patch.object(self.transaction_repository, "goal_contributions", history):
+            await self.service.forecast_goals(self.user_id, today=self.today)
+            await self.service.forecast_goals(self.user_id, today=self.today)
+            self.assertEqual(history.await_count, 1)
+
+            # Editing a contribution leaves the newest contribution id unchanged.
+            self.transaction_repository.storage[contribution.id]["amount"] = 100
+            await self.version_repository.bump(self.user_id)
+            edited = await self.service.forecast_goals(self.user_id, today=self.today)
+
+            del self.transaction_repository.storage[contribution.id]
+            await self.version_repository.bump(self.user_id)
+            deleted = await self.service.forecast_goals(self.user_id, today=self.today)
+
+        self.assertEqual(history.await_count, 3)
+        self.assertEqual((edited[0].daily_rate, deleted[0].contributions), (20.0, 0))
+
+    async def test_rates_are_not_cached_without_a_version_store(self):
+        service = GoalForecastService(
+            repository=self.goal_repository,
+            transaction_repository=self.transaction_repository,
+        )
+        goal = self._store_goal()
+        self._store_contribution(goal.id, 5, 50)
+        history = AsyncMock(wraps=self.transaction_repository.goal_contributions)
+
+        with patch.object(self.transaction_repository, "goal_contributions", history):
+            await service.forecast_goals(self.user_id, today=self.today)
+            await service.forecast_goals(self.user_id, today=self.today)
+
+        self.assertEqual(history.await_count, 2)
+
+    async def test_rates_are_refitted_on_a_new_day(self):
+        goal = self._store_goal()
+        self._store_contribution(goal.id, 5, 50)
+
+        today = (await self.service.forecast_goals(self.user_id, today=self.today))[0]
+        later = (await self.service.forecast_goals(self.user_id, today=self.today + timedelta(days=5)))[0]
+
+        self.assertEqual((today.daily_rate, later.daily_rate), (10.0, 5.0))
+
+    async def test_caches_belong_to_the_service_instance(self):
+        goal = self._store_goal()
+        self._store_contribution(goal.id, 5, 50)
+        await self.service.forecast_goals(self.user_id, today=self.today)
+        other = GoalForecastService(
+            repository=self.goal_repository,
+            transaction_repository=self.transaction_repository,
+            version_repository=self.version_repository,
+        )
+        history = AsyncMock(wraps=self.transaction_repository.goal_contributions)
+
+        with patch.object(self.transaction_repository, "goal_contributions", history):
+            await other.forecast_goals(self.user_id, today=self.today)
+
+        history.assert_awaited_once()
+
+    async def test_large_batches_run_in_process_pool(self):
+        goal = self._store_goal()
+        self._store_contribution(goal.id, 3, 30)
+        self.service.settings = self.service.settings.model_copy(update={"forecast_process_pool_threshold": 1})
+        pooled = AsyncMock(return_value=(np.array([10.0]), np.array([1])))
+
+        with patch("src.services.forecasts.run_in_process_pool", pooled):
+            forecast = (await self.service.forecast_goals(self.user_id, today=self.today))[0]
+
+        pooled.assert_awaited_once()
+        self.assertIs(pooled.await_args.args[0], fit_contribution_trends)
+        self.assertEqual(forecast.daily_rate, 10.0)
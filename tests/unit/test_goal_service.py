@@ -3,9 +3,13 @@
 import unittest
 
 from src.models import GoalUpdate
-from src.services import BusinessRuleError, GoalService, NotFoundError
+from src.services import BusinessRuleError, GoalService, Invalidator, NotFoundError
 from tests.fixtures.factories import make_account_model, make_goal_create, make_goal_model
-from tests.fixtures.memory_repositories import MemoryAccountRepository, MemoryGoalRepository
+from tests.fixtures.memory_repositories import (
+    MemoryAccountRepository,
+    MemoryDataVersionRepository,
+    MemoryGoalRepository,
+)
 
 
 class TestGoalService(unittest.IsolatedAsyncioTestCase):
@@ -130,3 +134,25 @@ class TestGoalService(unittest.IsolatedAsyncioTestCase):
 
         with self.assertRaises(NotFoundError):
             await self.service.apply_contribution(goal.id, 10)
+
+    async def test_get_goal_with_account_missing_raises(self):
+        with self.assertRaises(NotFoundError):
+            await self.service.get_goal_with_account("missing")
+
+    async def test_goal_writes_bump_user_data_version(self):
+        versions = MemoryDataVersionRepository()
+        service = GoalService(
+            repository=self.goal_repository,
+            account_repository=self.account_repository,
+            invalidator=Invalidator(versions),
+        )
+        account = make_account_model(balance=500)
+        self.account_repository.storage[account.id] = account.model_dump()
+
+        goal = await service.create_goal(make_goal_create(user_id=account.user_id, account_id=account.id))
+        await service.update_goal(goal.id, GoalUpdate(name="Updated"))
+        await service.apply_contribution(goal.id, 10)
+        await service.delete_goal(goal.id)
+
+        self.assertEqual(await versions.get_version(account.user_id), 4)
+        self.assertEqual(await service.data_version(account.user_id), 4)
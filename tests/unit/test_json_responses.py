@@ -0,0 +1,36 @@
+"""Tests for the JSON response classes used by the API."""
+
+import json
+import unittest
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.controllers import responses
+from src.models import TransactionModel
+from tests.fixtures.factories import make_transaction_model
+
+
+class ExpandedTransaction(TransactionModel):
+    internal_note: Optional[str] = None
+
+
+class TestJsonResponses(unittest.TestCase):
+    def test_prevalidated_response_matches_fastapi_encoding(self):
+        expanded = ExpandedTransaction(**make_transaction_model().model_dump(), internal_note="x")
+        models = [make_transaction_model(), expanded]
+
+        response = responses.PrevalidatedJSONResponse(models, list[TransactionModel])
+
+        expected = jsonable_encoder([TransactionModel.model_validate(model.model_dump()) for model in models])
+        self.assertEqual(json.loads(response.body), expected)
+        self.assertNotIn("internal_note", json.loads(response.body)[1])
+        self.assertEqual(response.media_type, "application/json")
+
+    def test_fast_json_response_matches_starlette_encoding(self):
+        content = {"total": 1.5, "items": ["a", "b"], "by_month": {1: 10}}
+
+        response = responses.FastJSONResponse(content)
+
+        self.assertEqual(json.loads(response.body), json.loads(JSONResponse(content).body))
@@ -0,0 +1,190 @@
+"""Unit tests for the report job queue service and worker."""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import AsyncMock, patch
+
+from config.settings import get_settings
+from src.models import ReportJobCreate, ReportJobKind, ReportJobStatus
+from src.services import (
+    BusinessRuleError,
+    NotFoundError,
+    ReportJobService,
+    ReportJobWorker,
+    ReportService,
+    StatementService,
+    ValidationError,
+)
+from src.utils import FileManager
+from tests.fixtures.factories import make_transaction_model
+from tests.fixtures.memory_repositories import MemoryReportJobRepository, MemoryTransactionRepository
+
+
+class TestReportJobService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.job_repository = MemoryReportJobRepository()
+        self.transaction_repository = MemoryTransactionRepository()
+        self.service = ReportJobService(repository=self.job_repository)
+        file_manager = FileManager(base_dir=Path(self.temp_dir.name))
+        self.worker = ReportJobWorker(
+            repository=self.job_repository,
+            report_service=ReportService(self.transaction_repository, file_manager),
+            statement_service=StatementService(self.transaction_repository, file_manager=file_manager),
+        )
+
+    def _store_transactions(self, user_id: str, count: int) -> None:
+        for amount in range(1, count + 1):
+            tx = make_transaction_model(user_id=user_id, amount=amount)
+            self.transaction_repository.storage[tx.id] = tx.model_dump()
+
+    async def test_enqueue_creates_queued_job(self):
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+
+        self.assertEqual(job.status, ReportJobStatus.QUEUED)
+        self.assertEqual((await self.service.get_job(job.id)).progress, 0)
+
+    async def test_enqueue_rejects_users_over_pending_limit(self):
+        settings = get_settings().model_copy(update={"report_jobs_max_pending_per_user": 1})
+        with patch("src.services.report_jobs.get_settings", return_value=settings):
+            await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+            with self.assertRaises(BusinessRuleError):
+                await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+
+    async def test_worker_completes_job_and_tracks_progress(self):
+        self._store_transactions("user-1", 3)
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+
+        processed = await self.worker.run_pending()
+
+        finished = await self.service.get_job(job.id)
+        self.assertEqual(processed, 1)
+        self.assertEqual(finished.status, ReportJobStatus.COMPLETED)
+        self.assertEqual((finished.progress, finished.total), (3, 3))
+        self.assertTrue((await self.service.get_download_path(job.id)).exists())
+
+    async def test_worker_skips_users_at_their_running_limit(self):
+        busy = await self.service.enqueue(ReportJobCreate(user_id="busy"))
+        await self.service.enqueue(ReportJobCreate(user_id="busy"))
+        other = await self.service.enqueue(ReportJobCreate(user_id="other"))
+        self.job_repository.storage[busy.id].update(
+            status=ReportJobStatus.RUNNING, lease_expires_at=datetime.utcnow() + timedelta(minutes=1)
+        )
+
+        claimed = await self.worker.claim_next()
+
+        self.assertEqual(claimed.id, other.id)
+
+    async def test_claims_racing_past_the_per_user_limit_are_given_back(self):
+        running = await self.service.enqueue(ReportJobCreate(user_id="busy"))
+        raced = await self.service.enqueue(ReportJobCreate(user_id="busy"))
+        other = await self.service.enqueue(ReportJobCreate(user_id="other"))
+        lease = {"status": ReportJobStatus.RUNNING, "lease_expires_at": datetime.utcnow() + timedelta(minutes=1)}
+        # Another worker claimed "busy" after this one read the running counts.
+        with patch.object(self.job_repository, "running_by_user", AsyncMock(return_value={})):
+            self.job_repository.storage[running.id].update(lease)
+            claimed = await self.worker.claim_next()
+
+        self.assertEqual(claimed.id, other.id)
+        given_back = await self.service.get_job(raced.id)
+        self.assertEqual((given_back.status, given_back.attempts), (ReportJobStatus.QUEUED, 0))
+        self.assertEqual(await self.job_repository.count_running("busy"), 1)
+
+    async def test_stopping_the_worker_requeues_its_running_job(self):
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+        started = asyncio.Event()
+
+        async def slow_export(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        with patch.object(self.worker.report_service, "export_transactions", side_effect=slow_export):
+            await self.worker.start()
+            await asyncio.wait_for(started.wait(), timeout=5)
+            await self.worker.stop()
+
+        requeued = await self.service.get_job(job.id)
+        self.assertEqual((requeued.status, requeued.lease_expires_at), (ReportJobStatus.QUEUED, None))
+        self.assertEqual((await self.worker.claim_next()).id, job.id)
+
+    async def test_jobs_with_an_expired_lease_are_claimed_again_then_abandoned(self):
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+        max_attempts = get_settings().report_job_max_attempts
+        for attempt in range(1, max_attempts + 1):
+            claimed = await self.worker.claim_next()
+            self.assertEqual((claimed.id, claimed.attempts), (job.id, attempt))
+            # The worker died without renewing the lease.
+            self.job_repository.storage[job.id]["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+        self.assertIsNone(await self.worker.claim_next())
+        abandoned = await self.service.get_job(job.id)
+        self.assertEqual(abandoned.status, ReportJobStatus.FAILED)
+        self.assertEqual(abandoned.error, f"Abandoned after {max_attempts} attempts")
+
+    async def test_outcome_of_a_job_taken_over_by_another_worker_is_ignored(self):
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+        stale = await self.worker.claim_next()
+        self.job_repository.storage[job.id]["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+        current = await self.worker.claim_next()
+
+        await self.job_repository.set_progress(stale.id, 5, total=9, claim_token=stale.claim_token)
+        await self.job_repository.fail(stale.id, "late failure", claim_token=stale.claim_token)
+
+        unchanged = await self.service.get_job(job.id)
+        self.assertEqual((unchanged.status, unchanged.progress, unchanged.total), (ReportJobStatus.RUNNING, 0, None))
+        self.assertFalse(await self.job_repository.renew_lease(job.id, stale.claim_token, 60))
+        self.assertTrue(await self.job_repository.renew_lease(job.id, current.claim_token, 60))
+
+    async def test_worker_renders_queued_monthly_statements(self):
+        for day, amount in ((3, 40), (20, 60)):
+            tx = make_transaction_model(user_id="user-1", amount=amount, event_date=datetime(2024, 5, day))
+            self.transaction_repository.storage[tx.id] = tx.model_dump()
+        job = await self.service.enqueue(
+            ReportJobCreate(user_id="user-1", kind=ReportJobKind.MONTHLY_STATEMENT, month="2024-05")
+        )
+
+        await self.worker.run_pending()
+
+        finished = await self.service.get_job(job.id)
+        self.assertEqual(finished.status, ReportJobStatus.COMPLETED)
+        self.assertEqual((finished.progress, finished.report.total_expenses), (2, 100))
+        self.assertTrue((await self.service.get_download_path(job.id)).name.startswith("statement_2024-05"))
+
+    async def test_monthly_statement_jobs_require_a_month(self):
+        with self.assertRaises(ValidationError):
+            await self.service.enqueue(ReportJobCreate(user_id="user-1", kind=ReportJobKind.MONTHLY_STATEMENT))
+
+    async def test_jobs_of_a_kind_without_a_runner_fail(self):
+        worker = ReportJobWorker(repository=self.job_repository, report_service=self.worker.report_service)
+        job = await self.service.enqueue(
+            ReportJobCreate(user_id="user-1", kind=ReportJobKind.MONTHLY_STATEMENT, month="2024-05")
+        )
+
+        await worker.run_pending()
+
+        failed = await self.service.get_job(job.id)
+        self.assertEqual(failed.status, ReportJobStatus.FAILED)
+        self.assertEqual(failed.error, "No worker handles monthly_statement reports")
+
+    async def test_failed_job_records_error(self):
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+        failing = AsyncMock(side_effect=RuntimeError("disk full"))
+
+        with patch.object(self.worker.report_service, "export_transactions", failing):
+            await self.worker.run_pending()
+
+        failed = await self.service.get_job(job.id)
+        self.assertEqual(failed.status, ReportJobStatus.FAILED)
+        self.assertEqual(failed.error, "disk full")
+
+    async def test_download_requires_completed_job(self):
+        job = await self.service.enqueue(ReportJobCreate(user_id="user-1"))
+
+        with self.assertRaises(BusinessRuleError):
+            await self.service.get_download_path(job.id)
+        with self.assertRaises(NotFoundError):
+            await self.service.get_job("missing")
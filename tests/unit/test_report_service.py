@@ -1,13 +1,22 @@
 """Unit tests for ReportService."""
 
 import unittest
+from datetime import datetime, timedelta
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
+from config.settings import get_settings
 from src.services import ReportService
+from src.services.reports import _WatermarkTracker
+from src.services.exceptions import ServiceError
 from src.utils import FileManager
 from tests.fixtures.factories import make_transaction_model
-from tests.fixtures.memory_repositories import MemoryTransactionRepository
+from tests.fixtures.memory_repositories import (
+    MemoryDataVersionRepository,
+    MemoryExportWatermarkRepository,
+    MemoryTransactionRepository,
+)
 
 
 class TestReportService(unittest.IsolatedAsyncioTestCase):
@@ -15,7 +24,12 @@ class TestReportService(unittest.IsolatedAsyncioTestCase):
         self.repository = MemoryTransactionRepository()
         self.temp_dir = TemporaryDirectory()
         self.addCleanup(self.temp_dir.cleanup)
-        self.service = ReportService(self.repository, FileManager(base_dir=Path(self.temp_dir.name)))
+        self.watermarks = MemoryExportWatermarkRepository()
+        self.service = ReportService(
+            self.repository,
+            FileManager(base_dir=Path(self.temp_dir.name)),
+            watermark_repository=self.watermarks,
+        )
 
     async def test_report_service_exports_transactions(self):
         user_id = "user-report"
@@ -30,3 +44,155 @@ class TestReportService(unittest.IsolatedAsyncioTestCase):
         for attr, expected in {"total_transactions": 2}.items():
             with self.subTest(attr=attr):
                 self.assertEqual(getattr(report, attr), expected)
+
+    async def test_stream_transactions_yields_only_user_rows(self):
+        user_id = "user-stream"
+        for amount in (10, 20):
+            tx = make_transaction_model(user_id=user_id, amount=amount)
+            self.repository.storage[tx.id] = tx.model_dump()
+        other = make_transaction_model(user_id="someone-else")
+        self.repository.storage[other.id] = other.model_dump()
+
+        content = "".join([chunk async for chunk in self.service.stream_transactions(user_id)])
+
+        self.assertIn("# total_transactions,2", content)
+        self.assertNotIn(other.id, content)
+
+    async def test_incremental_export_appends_only_changes(self):
+        user_id = "user-incremental"
+        first = make_transaction_model(user_id=user_id, created_at=datetime(2024, 1, 1))
+        second = make_transaction_model(user_id=user_id, created_at=datetime(2024, 1, 2))
+        for tx in (first, second):
+            self.repository.storage[tx.id] = tx.model_dump()
+
+        initial = await self.service.export_incremental(user_id)
+        added = make_transaction_model(user_id=user_id, created_at=datetime(2024, 1, 3))
+        self.repository.storage[added.id] = added.model_dump()
+        self.repository.storage[first.id]["updated_at"] = datetime(2024, 1, 4)
+        delta = await self.service.export_incremental(user_id)
+
+        self.assertEqual(initial.total_transactions, 2)
+        self.assertIsNone(initial.since)
+        self.assertEqual(delta.total_transactions, 2)
+        self.assertTrue(delta.appended)
+        self.assertEqual(delta.file_path, initial.file_path)
+        self.assertEqual(delta.since, datetime(2024, 1, 2))
+        lines = Path(delta.file_path).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(sum(line.startswith("id,") for line in lines), 1)
+        watermark = await self.watermarks.get_for_user(user_id)
+        self.assertEqual((watermark.changed_at, watermark.last_id), (datetime(2024, 1, 4), first.id))
+
+    async def test_incremental_export_without_changes_keeps_watermark(self):
+        user_id = "user-idle"
+        tx = make_transaction_model(user_id=user_id, created_at=datetime.utcnow() - timedelta(days=1))
+        self.repository.storage[tx.id] = tx.model_dump()
+        await self.service.export_incremental(user_id)
+        saved = await self.watermarks.get_for_user(user_id)
+
+        report = await self.service.export_incremental(user_id)
+
+        self.assertEqual(report.total_transactions, 0)
+        self.assertEqual(await self.watermarks.get_for_user(user_id), saved)
+
+    async def test_incremental_export_without_changes_writes_no_file(self):
+        user_id = "user-polled"
+        tx = make_transaction_model(user_id=user_id, created_at=datetime.utcnow() - timedelta(days=1))
+        self.repository.storage[tx.id] = tx.model_dump()
+        initial = await self.service.export_incremental(user_id, append=False)
+
+        first = await self.service.export_incremental(user_id, append=False)
+        second = await self.service.export_incremental(user_id, append=False)
+
+        self.assertEqual([path.name for path in Path(self.temp_dir.name).iterdir()], [Path(initial.file_path).name])
+        self.assertEqual((first.file_path, second.file_path), (initial.file_path, initial.file_path))
+        self.assertEqual((first.total_transactions, second.total_transactions), (0, 0))
+
+        empty = await self.service.export_incremental("user-without-transactions")
+
+        self.assertIsNone(empty.file_path)
+        self.assertEqual(len(list(Path(self.temp_dir.name).iterdir())), 1)
+
+    async def test_incremental_export_picks_up_late_commits_inside_the_overlap_window(self):
+        user_id = "user-late"
+        exported = make_transaction_model(user_id=user_id, created_at=datetime(2024, 1, 1, 12, 0, 0))
+        self.repository.storage[exported.id] = exported.model_dump()
+        await self.service.export_incremental(user_id)
+
+        late = make_transaction_model(user_id=user_id, created_at=datetime(2024, 1, 1, 11, 59, 58))
+        self.repository.storage[late.id] = late.model_dump()
+        delta = await self.service.export_incremental(user_id)
+        idle = await self.service.export_incremental(user_id)
+
+        self.assertEqual((delta.total_transactions, idle.total_transactions), (1, 0))
+        content = Path(delta.file_path).read_text(encoding="utf-8")
+        self.assertEqual((content.count(exported.id), content.count(late.id)), (1, 1))
+        watermark = await self.watermarks.get_for_user(user_id)
+        self.assertEqual((watermark.changed_at, watermark.last_id), (exported.created_at, exported.id))
+
+    async def test_incremental_export_without_overlap_breaks_updated_at_ties_by_id(self):
+        user_id = "user-ties"
+        changed_at = datetime(2024, 1, 2)
+        first, second = sorted(
+            (make_transaction_model(user_id=user_id, created_at=changed_at) for _ in range(2)), key=lambda tx: tx.id
+        )
+        self.repository.storage[first.id] = first.model_dump()
+        settings = get_settings().model_copy(update={"export_watermark_overlap_seconds": 0.0})
+        with patch("src.services.reports.get_settings", return_value=settings):
+            await self.service.export_incremental(user_id)
+            self.repository.storage[second.id] = {
+                **second.model_dump(), "created_at": datetime(2024, 1, 1), "updated_at": changed_at
+            }
+            delta = await self.service.export_incremental(user_id)
+
+        self.assertEqual(delta.total_transactions, 1)
+        watermark = await self.watermarks.get_for_user(user_id)
+        self.assertEqual(watermark.last_id, second.id)
+
+    async def test_incremental_export_only_remembers_rows_inside_the_overlap_window(self):
+        user_id = "user-window"
+        start = datetime(2024, 1, 1)
+        for minute in range(50):
+            tx = make_transaction_model(user_id=user_id, created_at=start + timedelta(minutes=minute))
+            self.repository.storage[tx.id] = tx.model_dump()
+
+        with patch.object(_WatermarkTracker, "PRUNE_AFTER", 8), patch.object(
+            _WatermarkTracker, "_within_overlap", autospec=True, side_effect=_WatermarkTracker._within_overlap
+        ) as pruned:
+            report = await self.service.export_incremental(user_id)
+
+        self.assertEqual(report.total_transactions, 50)
+        self.assertLessEqual(max(len(call.args[1]) for call in pruned.call_args_list), 8)
+        watermark = await self.watermarks.get_for_user(user_id)
+        self.assertEqual(list(watermark.overlap_ids.values()), [start + timedelta(minutes=49)])
+
+    async def test_incremental_export_requires_watermark_repository(self):
+        service = ReportService(self.repository, FileManager(base_dir=Path(self.temp_dir.name)))
+
+        with self.assertRaises(ServiceError):
+            await service.export_incremental("user-1")
+
+    async def test_versioned_export_reuses_file_until_data_changes(self):
+        user_id = "user-cached"
+        versions = MemoryDataVersionRepository()
+        service = ReportService(
+            self.repository,
+            FileManager(base_dir=Path(self.temp_dir.name)),
+            version_repository=versions,
+        )
+        tx = make_transaction_model(user_id=user_id)
+        self.repository.storage[tx.id] = tx.model_dump()
+
+        first = await service.export_transactions(user_id)
+        with patch.object(self.repository, "iterate", side_effect=AssertionError("cache miss")):
+            repeated = await service.export_transactions(user_id)
+        added = make_transaction_model(user_id=user_id)
+        self.repository.storage[added.id] = added.model_dump()
+        await versions.bump(user_id)
+        refreshed = await service.export_transactions(user_id)
+
+        self.assertEqual(repeated, first)
+        self.assertNotEqual(refreshed.file_path, first.file_path)
+        self.assertEqual(refreshed.total_transactions, 2)
+        suffixes = sorted(path.suffix for path in Path(self.temp_dir.name).iterdir())
+        self.assertEqual(suffixes, [".csv", ".csv", ".json", ".json"])
@@ -0,0 +1,64 @@
+"""Tests for the per-route request metrics middleware."""
+
+import unittest
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.middleware import metrics as request_metrics
+from src.middleware import RequestMetricsMiddleware
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        return {"id": item_id, "padding": "x" * 100}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestMetricsMiddleware)
+    return app
+
+
+class TestRequestMetricsMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        transport = ASGITransport(app=_build_app(), raise_app_exceptions=False)
+        self.client = AsyncClient(transport=transport, base_url="http://testserver")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_records_latency_and_size_per_route_template(self):
+        labels = dict(method="GET", route="/items/{item_id}", status="200")
+        before, _ = request_metrics.REQUEST_DURATION.snapshot(**labels)
+        size_before, bytes_before = request_metrics.RESPONSE_SIZE.snapshot(method="GET", route="/items/{item_id}")
+
+        for item_id in ("a", "b"):
+            response = await self.client.get(f"/items/{item_id}")
+            self.assertEqual(response.status_code, 200)
+
+        count, total = request_metrics.REQUEST_DURATION.snapshot(**labels)
+        self.assertEqual(count, before + 2)
+        self.assertGreater(total, 0)
+        size_count, size_total = request_metrics.RESPONSE_SIZE.snapshot(method="GET", route="/items/{item_id}")
+        self.assertEqual(size_count, size_before + 2)
+        self.assertGreater(size_total - bytes_before, 200)
+        self.assertEqual(request_metrics.REQUESTS_IN_FLIGHT.value(method="GET"), 0)
+
+    async def test_unmatched_paths_and_failures_share_bounded_series(self):
+        unmatched = dict(method="GET", route=request_metrics.UNMATCHED_ROUTE, status="404")
+        failed = dict(method="GET", route="/boom", status="500")
+        unmatched_before, _ = request_metrics.REQUEST_DURATION.snapshot(**unmatched)
+        failed_before, _ = request_metrics.REQUEST_DURATION.snapshot(**failed)
+
+        await self.client.get("/nope/1")
+        await self.client.get("/nope/2")
+        response = await self.client.get("/boom")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(request_metrics.REQUEST_DURATION.snapshot(**unmatched)[0], unmatched_before + 2)
+        self.assertEqual(request_metrics.REQUEST_DURATION.snapshot(**failed)[0], failed_before + 1)
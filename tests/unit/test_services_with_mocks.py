@@ -12,21 +12,23 @@ from tests.fixtures.factories import make_transaction_create
 class TestServicesWithMocks(unittest.IsolatedAsyncioTestCase):
     async def test_report_service_uses_file_manager(self):
         repo = MagicMock()
-        repo.list = AsyncMock(return_value=[])
         file_manager = MagicMock()
-        file_manager.export_transactions.return_value = ReportPayload(
-            generated_at=datetime.utcnow(),
-            file_path="/tmp/report.csv",
-            total_transactions=0,
-            total_expenses=0,
-            total_income=0,
+        file_manager.export_transactions_async = AsyncMock(
+            return_value=ReportPayload(
+                generated_at=datetime.utcnow(),
+                file_path="/tmp/report.csv",
+                total_transactions=0,
+                total_expenses=0,
+                total_income=0,
+            )
         )
 
         service = ReportService(repo, file_manager)
         result = await service.export_transactions("user-1")
 
-        repo.list.assert_awaited_once_with({"user_id": "user-1"})
-        file_manager.export_transactions.assert_called_once()
+        self.assertEqual(repo.iterate.call_args.args[0], {"user_id": "user-1"})
+        file_manager.export_transactions_async.assert_awaited_once()
+        self.assertIs(file_manager.export_transactions_async.await_args.args[0], repo.iterate.return_value)
         self.assertTrue(result.file_path.endswith("report.csv"))
 
     async def test_transaction_service_handles_repository_errors_with_mock(self):
@@ -75,13 +77,12 @@ class TestServicesWithMocks(unittest.IsolatedAsyncioTestCase):
 
     async def test_report_service_handles_file_manager_failure(self):
         repo = MagicMock()
-        repo.list = AsyncMock(return_value=[])
         file_manager = MagicMock()
-        file_manager.export_transactions.side_effect = RuntimeError("io error")
+        file_manager.export_transactions_async = AsyncMock(side_effect=RuntimeError("io error"))
         service = ReportService(repo, file_manager)
 
         with self.assertRaises(RuntimeError):
             await service.export_transactions("user-1")
 
-        repo.list.assert_awaited_once()
-        file_manager.export_transactions.assert_called_once()
+        repo.iterate.assert_called_once()
+        file_manager.export_transactions_async.assert_awaited_once()
@@ -0,0 +1,103 @@
+"""Unit tests for StatementService."""
+
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import AsyncMock, patch
+
+from src.models import BudgetStatus, TransactionType
+from src.services import StatementService, ValidationError
+from src.utils import FileManager
+from tests.fixtures.factories import make_account_model, make_budget_model, make_transaction_model
+from tests.fixtures.memory_repositories import (
+    MemoryAccountRepository,
+    MemoryBudgetRepository,
+    MemoryDataVersionRepository,
+    MemoryTransactionRepository,
+)
+
+
+class TestStatementService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.account_repository = MemoryAccountRepository()
+        self.budget_repository = MemoryBudgetRepository()
+        self.transaction_repository = MemoryTransactionRepository(self.account_repository, self.budget_repository)
+        self.version_repository = MemoryDataVersionRepository()
+        self.service = StatementService(
+            self.transaction_repository,
+            version_repository=self.version_repository,
+            file_manager=FileManager(base_dir=Path(self.temp_dir.name)),
+        )
+        self.user_id = "statement-user"
+        self.account = make_account_model(user_id=self.user_id, name="Main", balance=1000)
+        self.account_repository.storage[self.account.id] = self.account.model_dump()
+
+    def _store(self, day: date, amount: float, **overrides):
+        tx = make_transaction_model(
+            user_id=self.user_id,
+            account_id=self.account.id,
+            amount=amount,
+            event_date=datetime.combine(day, datetime.min.time()),
+            **overrides,
+        )
+        self.transaction_repository.storage[tx.id] = tx.model_dump()
+
+    async def test_statement_pivots_categories_and_rolls_balances_back(self):
+        self._store(date(2024, 4, 30), 999)
+        self._store(date(2024, 5, 3), 500, type=TransactionType.INCOME, category="salary")
+        self._store(date(2024, 5, 10), 40, category="food")
+        self._store(date(2024, 5, 20), 60, category="food")
+        self._store(date(2024, 6, 2), 100, category="rent")
+        budget = make_budget_model(
+            user_id=self.user_id,
+            category="food",
+            limit_amount=125,
+            amount_spent=100,
+            period_start=date(2024, 5, 1),
+            period_end=date(2024, 5, 31),
+        )
+        self.budget_repository.storage[budget.id] = budget.model_dump()
+
+        statement = await self.service.monthly_statement(self.user_id, "2024-05")
+
+        self.assertEqual(
+            [(line.category, line.type, line.total, line.count) for line in statement.categories],
+            [("food", TransactionType.EXPENSE, 100, 2), ("salary", TransactionType.INCOME, 500, 1)],
+        )
+        self.assertEqual((statement.total_income, statement.total_expenses), (500, 100))
+        account = statement.accounts[0]
+        self.assertEqual((account.closing_balance, account.opening_balance), (1100, 700))
+        self.assertEqual((account.inflow, account.outflow), (500, 100))
+        self.assertEqual(statement.budgets[0].usage_percent, 80.0)
+        self.assertEqual(statement.budgets[0].status, BudgetStatus.WARNING)
+
+    async def test_statement_is_cached_until_data_version_changes(self):
+        self._store(date(2024, 5, 10), 40)
+        aggregate = AsyncMock(wraps=self.transaction_repository.monthly_statement)
+
+        with patch.object(self.transaction_repository, "monthly_statement", aggregate):
+            first = await self.service.monthly_statement(self.user_id, "2024-05")
+            second = await self.service.monthly_statement(self.user_id, "2024-05")
+            self._store(date(2024, 5, 11), 10)
+            await self.version_repository.bump(self.user_id)
+            refreshed = await self.service.monthly_statement(self.user_id, "2024-05")
+
+        self.assertIs(second, first)
+        self.assertEqual(aggregate.await_count, 2)
+        self.assertEqual(refreshed.total_expenses, 50)
+
+    async def test_statement_renders_csv(self):
+        self._store(date(2024, 5, 10), 40)
+
+        statement = await self.service.monthly_statement(self.user_id, "2024-05", render_csv=True)
+
+        content = Path(statement.file_path).read_text(encoding="utf-8")
+        self.assertIn("# accounts", content)
+        self.assertIn("# total_expenses,40.0", content)
+
+    async def test_invalid_month_raises(self):
+        with self.assertRaises(ValidationError):
+            await self.service.monthly_statement(self.user_id, "2024-13")
@@ -7,6 +7,7 @@ from src.services import (
     BudgetService,
     BusinessRuleError,
     GoalService,
+    Invalidator,
     NotFoundError,
     TransactionService,
 )
@@ -19,6 +20,7 @@ from tests.fixtures.factories import (
 from tests.fixtures.memory_repositories import (
     MemoryAccountRepository,
     MemoryBudgetRepository,
+    MemoryDataVersionRepository,
     MemoryGoalRepository,
     MemoryTransactionRepository,
     MemoryUserRepository,
@@ -33,6 +35,7 @@ class TestTransactionService(unittest.IsolatedAsyncioTestCase):
         self.budget_repository = MemoryBudgetRepository()
         self.goal_repository = MemoryGoalRepository()
         self.budget_service = BudgetService(repository=self.budget_repository)
+        self.version_repository = MemoryDataVersionRepository()
         self.goal_service = GoalService(repository=self.goal_repository, account_repository=self.account_repository)
         self.service = TransactionService(
             repository=self.transaction_repository,
@@ -40,6 +43,7 @@ class TestTransactionService(unittest.IsolatedAsyncioTestCase):
             user_repository=self.user_repository,
             budget_service=self.budget_service,
             goal_service=self.goal_service,
+            invalidator=Invalidator(self.version_repository),
         )
 
     async def test_create_transaction_updates_balance_and_budget(self):
@@ -159,3 +163,15 @@ class TestTransactionService(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].id, tx.id)
+
+    async def test_writes_bump_user_data_version(self):
+        user = make_user_model()
+        account = make_account_model(user_id=user.id, balance=400)
+        self.user_repository.storage[user.id] = user.model_dump()
+        self.account_repository.storage[account.id] = account.model_dump()
+
+        tx = await self.service.create_transaction(make_transaction_create(user_id=user.id, account_id=account.id))
+        await self.service.update_transaction(tx.id, TransactionUpdate(description="Edited"))
+        await self.service.delete_transaction(tx.id)
+
+        self.assertEqual(await self.version_repository.get_version(user.id), 3)